@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 AUTH_USER_MODEL = 'core.Empleado'
+AUTHENTICATION_BACKENDS = ['core.backends.CachedModelBackend']
 LOGIN_URL = "login"
 LOGIN_REDIRECT_URL = "home"
 LOGOUT_REDIRECT_URL = "login"
@@ -76,6 +78,11 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'app.wsgi.application'
 
+# Vistas de lectura async (core/async_views.py). Pensadas para servir con ASGI:
+#   ASYNC_VIEWS=1 uvicorn app.asgi:application
+# Ver `manage.py benchmark_asgi`.
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS') == '1'
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -87,6 +94,65 @@ DATABASES = {
     }
 }
 
+# Perfil de producción (opt-in con DB_PROFILE=produccion): WAL + PRAGMAs,
+# conexiones persistentes, busy_timeout y BEGIN IMMEDIATE con reintentos.
+# Ver core/db/backends/sqlite3/base.py y `manage.py benchmark_sqlite`.
+if os.environ.get('DB_PROFILE') == 'produccion':
+    DATABASES['default'].update({
+        'ENGINE': 'core.db.backends.sqlite3',
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 20,  # busy_timeout en segundos
+            'immediate': True,
+            'begin_retries': 3,
+        },
+    })
+
+# Réplica de lectura (opt-in con DB_REPLICA=/ruta/replica.sqlite3): los GET de
+# listados, detalles y reportes leen de ella (core/db/router.py); tras un POST
+# se lee del primario durante REPLICA_STICKY_SECONDS. En local se mantiene con
+# `manage.py replicar --intervalo 5`.
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+if os.environ.get('DB_REPLICA'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['DB_REPLICA'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['core.db.router.ReplicaRouter']
+    MIDDLEWARE.append('core.middleware.ReplicaMiddleware')
+
+# Métricas por vista (latencia, consultas SQL, render) en /metrics; se desactivan con
+# METRICAS=0. Prometheus se autentica con `Authorization: Bearer $METRICS_TOKEN`.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+if os.environ.get('METRICAS', '1') == '1':
+    MIDDLEWARE.insert(0, 'core.middleware.MetricasMiddleware')
+
+# Estáticos compilados (opt-in con ESTATICOS_COMPILADOS=1; antes, `manage.py construir_estaticos`):
+# nombres con hash del contenido, copias .gz/.br y Django los sirve con caché inmutable.
+# Sin la variable, {% bundle %} usa los bundles de static/bundles si existen o, si no, los CDN.
+if os.environ.get('ESTATICOS_COMPILADOS') == '1':
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'core.estaticos.ManifestComprimido'},
+    }
+    MIDDLEWARE.insert(0, 'core.middleware.EstaticosMiddleware')
+
+
+# Cache
+# Permisos, listados y otros datos derivados se guardan aquí. Las invalidaciones no
+# dependen del backend: las versiones de las claves están en la base (core/cache.py),
+# así que LocMemCache (una copia por proceso) es correcto también con varios workers
+# y con `procesar_trabajos`; un backend compartido (Memcached, Redis...) ahorra memoria.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'gabostours',
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -129,6 +195,15 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Archivos de core/trabajos.py (exportaciones con datos de clientes, entradas de
+# importaciones): fuera de MEDIA_ROOT para que el servidor web nunca los sirva.
+TRABAJOS_ROOT = Path(os.environ.get('TRABAJOS_ROOT', BASE_DIR / 'privado' / 'trabajos'))
+
+# Variantes de Empleado.imagen/cover (core/imagenes.py): se generan en hilos de fondo
+# tras guardar; con IMAGENES_EN_SEGUNDO_PLANO=0 se generan en la misma petición.
+IMAGENES_EN_SEGUNDO_PLANO = os.environ.get('IMAGENES_EN_SEGUNDO_PLANO', '1') == '1'
+IMAGENES_HILOS = int(os.environ.get('IMAGENES_HILOS', 2))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -6,62 +6,85 @@ from django.contrib.auth import views as auth_views
 from django.urls import path, include
 
 from core.auth_forms import EmailAuthenticationForm
-from core import views
+from core import async_views, views
+
+# Listados y detalles de lectura: versión async con ASYNC_VIEWS (servir con ASGI)
+lectura = async_views if settings.ASYNC_VIEWS else views
 
 # ====== PATTERNS POR MODULO (TODO EN CORE) ======
 
 clientes_patterns = ([
-    path("", views.ClienteListView.as_view(), name="cliente_list"),
+    path("", lectura.ClienteListView.as_view(), name="cliente_list"),
+    path("datos/", views.ClienteDataView.as_view(), name="cliente_data"),
     path("nuevo/", views.ClienteCreateView.as_view(), name="cliente_create"),
     path("<int:pk>/editar/", views.ClienteUpdateView.as_view(), name="cliente_update"),
     path("<int:pk>/eliminar/", views.ClienteDeleteView.as_view(), name="cliente_delete"),
 ], "clientes")
 
 paquetes_patterns = ([
-    path("", views.PaqueteListView.as_view(), name="paquete_list"),
+    path("", lectura.PaqueteListView.as_view(), name="paquete_list"),
+    path("datos/", views.PaqueteDataView.as_view(), name="paquete_data"),
     path("nuevo/", views.PaqueteCreateView.as_view(), name="paquete_create"),
-    path("<int:pk>/", views.PaqueteDetailView.as_view(), name="paquete_detail"),
+    path("<int:pk>/", lectura.PaqueteDetailView.as_view(), name="paquete_detail"),
     path("<int:pk>/editar/", views.PaqueteUpdateView.as_view(), name="paquete_update"),
     path("<int:pk>/eliminar/", views.PaqueteDeleteView.as_view(), name="paquete_delete"),
 ], "paquetes")
 
 productos_patterns = ([
-    path("", views.ProductoListView.as_view(), name="producto_list"),
+    path("", lectura.ProductoListView.as_view(), name="producto_list"),
+    path("datos/", views.ProductoDataView.as_view(), name="producto_data"),
     path("nuevo/", views.ProductoCreateView.as_view(), name="producto_create"),
     path("<int:pk>/editar/", views.ProductoUpdateView.as_view(), name="producto_update"),
     path("<int:pk>/eliminar/", views.ProductoDeleteView.as_view(), name="producto_delete"),
 ], "productos")
 
 proveedores_patterns = ([
-    path("", views.ProveedorListView.as_view(), name="proveedor_list"),
+    path("", lectura.ProveedorListView.as_view(), name="proveedor_list"),
+    path("datos/", views.ProveedorDataView.as_view(), name="proveedor_data"),
     path("nuevo/", views.ProveedorCreateView.as_view(), name="proveedor_create"),
     path("<int:pk>/editar/", views.ProveedorUpdateView.as_view(), name="proveedor_update"),
     path("<int:pk>/eliminar/", views.ProveedorDeleteView.as_view(), name="proveedor_delete"),
 ], "proveedores")
 
 destinos_patterns = ([
-    path("", views.DestinoListView.as_view(), name="destino_list"),
+    path("", lectura.DestinoListView.as_view(), name="destino_list"),
+    path("datos/", views.DestinoDataView.as_view(), name="destino_data"),
     path("nuevo/", views.DestinoCreateView.as_view(), name="destino_create"),
     path("<int:pk>/editar/", views.DestinoUpdateView.as_view(), name="destino_update"),
     path("<int:pk>/eliminar/", views.DestinoDeleteView.as_view(), name="destino_delete"),
 ], "destinos")
 
 reservas_patterns = ([
-    path("", views.ReservaListView.as_view(), name="reserva_list"),
+    path("", lectura.ReservaListView.as_view(), name="reserva_list"),
+    path("datos/", views.ReservaDataView.as_view(), name="reserva_data"),
+    path("exportar/", views.ReservaExportView.as_view(), name="reserva_export"),
+    path("estado/", views.ReservaCambiarEstadoView.as_view(), name="reserva_estado"),
     path("nuevo/", views.ReservaCreateView.as_view(), name="reserva_create"),
     path("<int:pk>/editar/", views.ReservaUpdateView.as_view(), name="reserva_update"),
     path("<int:pk>/eliminar/", views.ReservaDeleteView.as_view(), name="reserva_delete"),
 ], "reservas")
 
+reportes_patterns = ([
+    path("ventas/", views.ReporteVentasView.as_view(), name="ventas"),
+    path("ventas/refrescar/", views.ReporteVentasRefrescarView.as_view(), name="ventas_refrescar"),
+], "reportes")
+
+trabajos_patterns = ([
+    path("<int:pk>/", views.TrabajoEstadoView.as_view(), name="trabajo_estado"),
+    path("<int:pk>/descargar/", views.TrabajoDescargaView.as_view(), name="trabajo_descarga"),
+], "trabajos")
+
 interacciones_patterns = ([
-    path("", views.InteraccionListView.as_view(), name="interaccion_list"),
+    path("", lectura.InteraccionListView.as_view(), name="interaccion_list"),
+    path("datos/", views.InteraccionDataView.as_view(), name="interaccion_data"),
     path("nuevo/", views.InteraccionCreateView.as_view(), name="interaccion_create"),
     path("<int:pk>/editar/", views.InteraccionUpdateView.as_view(), name="interaccion_update"),
     path("<int:pk>/eliminar/", views.InteraccionDeleteView.as_view(), name="interaccion_delete"),
 ], "interacciones")
 
 metodopago_patterns = ([
-    path("", views.MetodoPagoListView.as_view(), name="metodopago_list"),
+    path("", lectura.MetodoPagoListView.as_view(), name="metodopago_list"),
+    path("datos/", views.MetodoPagoDataView.as_view(), name="metodopago_data"),
     path("nuevo/", views.MetodoPagoCreateView.as_view(), name="metodopago_create"),
     path("<int:pk>/editar/", views.MetodoPagoUpdateView.as_view(), name="metodopago_update"),
     path("<int:pk>/eliminar/", views.MetodoPagoDeleteView.as_view(), name="metodopago_delete"),
@@ -104,6 +127,9 @@ urlpatterns = [
     # Error acceso
     path("403/", views.AccessDeniedView.as_view(), name="access_denied"),
 
+    # Métricas para Prometheus (staff o METRICS_TOKEN)
+    path("metrics", views.MetricasView.as_view(), name="metricas"),
+
     # Módulos
     path("clientes/", include(clientes_patterns, namespace="clientes")),
     path("paquetes/", include(paquetes_patterns, namespace="paquetes")),
@@ -111,6 +137,8 @@ urlpatterns = [
     path("proveedores/", include(proveedores_patterns, namespace="proveedores")),
     path("destinos/", include(destinos_patterns, namespace="destinos")),
     path("reservas/", include(reservas_patterns, namespace="reservas")),
+    path("reportes/", include(reportes_patterns, namespace="reportes")),
+    path("trabajos/", include(trabajos_patterns, namespace="trabajos")),
     path("interacciones/", include(interacciones_patterns, namespace="interacciones")),
     path("metodos-pago/", include(metodopago_patterns, namespace="metodopago")),
 
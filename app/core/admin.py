@@ -1,5 +1,12 @@
 from django.contrib import admin
-
+from django.core.exceptions import PermissionDenied
+from django.template.response import TemplateResponse
+from django.shortcuts import redirect
+from django.urls import path, reverse
+
+from . import trabajos
+from .forms import ImportarArchivoForm
+from .importacion import detectar_formato
 from .models import (
     Cargo,
     Cliente,
@@ -12,13 +19,59 @@ from .models import (
     Proveedor,
     Reserva,
     Comentario,
-
+    Trabajo,
 )
 
 
+class ImportarAdminMixin:
+    """Añade "Importar CSV/JSONL" al listado del admin (ver core/importacion.py)."""
+    importar_tipo = None
+    change_list_template = "admin/core/change_list_importar.html"
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path("importar/", self.admin_site.admin_view(self.importar_view), name="%s_%s_importar" % info),
+            *super().get_urls(),
+        ]
+
+    def importar_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        form = ImportarArchivoForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            # Lo importa el trabajador (procesar_trabajos); la página sondea el progreso
+            archivo = form.cleaned_data["archivo"]
+            trabajo = trabajos.encolar("importar", {
+                "tipo": self.importar_tipo,
+                "formato": detectar_formato(archivo.name),
+                "archivo": trabajos.guardar_entrada(archivo),
+            }, request.user)
+            return redirect(f"{request.path}?trabajo={trabajo.pk}")
+
+        trabajo = None
+        if request.GET.get("trabajo", "").isdigit():
+            trabajo = Trabajo.objects.filter(
+                pk=request.GET["trabajo"], tipo="importar", creado_por=request.user
+            ).first()
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": f"Importar {self.model._meta.verbose_name_plural}",
+            "form": form,
+            "trabajo": trabajo,
+            "estado_url": reverse("trabajos:trabajo_estado", args=[trabajo.pk]) if trabajo else "",
+            "descarga_url": (
+                reverse("trabajos:trabajo_descarga", args=[trabajo.pk])
+                if trabajo and trabajo.archivo else ""
+            ),
+        }
+        return TemplateResponse(request, "admin/core/importar.html", context)
+
 
 @admin.register(Cliente)
-class ClienteAdmin(admin.ModelAdmin):
+class ClienteAdmin(ImportarAdminMixin, admin.ModelAdmin):
+    importar_tipo = "clientes"
     list_display = ("nombre", "email", "telefono", "fecha_registro")
     search_fields = ("nombre", "email")
 
@@ -38,7 +91,8 @@ class DestinoAdmin(admin.ModelAdmin):
 
 
 @admin.register(Producto)
-class ProductoAdmin(admin.ModelAdmin):
+class ProductoAdmin(ImportarAdminMixin, admin.ModelAdmin):
+    importar_tipo = "productos"
     list_display = ("nombre", "tipo", "proveedor", "destino", "precio_base")
     list_filter = ("tipo", "proveedor", "destino")
     search_fields = ("nombre",)
@@ -57,7 +111,8 @@ class MetodoPagoAdmin(admin.ModelAdmin):
 
 
 @admin.register(Reserva)
-class ReservaAdmin(admin.ModelAdmin):
+class ReservaAdmin(ImportarAdminMixin, admin.ModelAdmin):
+    importar_tipo = "reservas"
     list_display = ("id", "cliente", "paquete", "empleado", "estado", "fecha_reserva")
     list_filter = ("estado", "fecha_reserva")
     search_fields = ("cliente__nombre", "paquete__nombre")
@@ -85,3 +140,14 @@ class ComentarioAdmin(admin.ModelAdmin):
     list_display = ("paquete", "autor", "calificacion", "creado_en")
     list_filter = ("calificacion", "creado_en")
     search_fields = ("paquete__nombre", "autor__email", "autor__nombre", "texto")
+
+
+@admin.register(Trabajo)
+class TrabajoAdmin(admin.ModelAdmin):
+    list_display = ("id", "tipo", "estado", "hechos", "total", "intentos", "creado_por", "creado_en", "terminado_en")
+    list_filter = ("estado", "tipo")
+    search_fields = ("mensaje", "error", "creado_por__email")
+    readonly_fields = [f.name for f in Trabajo._meta.fields]
+
+    def has_add_permission(self, request):
+        return False  # se crean con core/trabajos.encolar
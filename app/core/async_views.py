@@ -0,0 +1,200 @@
+# core/async_views.py
+"""
+Contrapartes async de las vistas de lectura (se activan con ASYNC_VIEWS, ver app/urls.py).
+Reutilizan las vistas síncronas: mismos querysets, filtros, permisos y plantillas;
+cambia cómo se leen los datos:
+- La página del listado, su total y el objeto del detalle se leen con el ORM async
+  (`acount`, `aget`, `async for`); un servidor ASGI (uvicorn) atiende otras peticiones
+  mientras esperan a la base.
+- Las lecturas independientes de una misma página (`get_parallel_context`) son
+  corrutinas y se esperan juntas.
+- Permisos, validadores del GET condicional y caché de listados siguen siendo código
+  síncrono compartido con las vistas WSGI (sync_to_async).
+En Django 4.2 el ORM async aún ejecuta cada consulta en un hilo (no hay drivers async):
+la concurrencia la da el event loop, no la base.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.paginator import InvalidPage
+from django.db.models import prefetch_related_objects
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.translation import gettext as _
+
+from . import views
+from .models import Destino, Paquete
+from .pagination import KeysetPaginationMixin
+
+
+async def listar(queryset):
+    """Evalúa `queryset` con `async for`; prefetch_related (sin soporte async en 4.2) va aparte."""
+    lookups = queryset._prefetch_related_lookups
+    objetos = [obj async for obj in queryset.prefetch_related(None)]
+    if lookups and objetos:
+        await sync_to_async(prefetch_related_objects)(objetos, *lookups)
+    return objetos
+
+
+async def en_paralelo(tareas):
+    """{clave: corrutina} -> {clave: resultado}, esperadas a la vez."""
+    valores = await asyncio.gather(*tareas.values())
+    return dict(zip(tareas, valores))
+
+
+class AsyncPermissionRedirectMixin:
+    """PermissionRedirectMixin para vistas cuyos handlers son `async def`."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        # request.user es perezoso: cargarlo (sesión + usuario) consulta la base
+        denegado = await sync_to_async(self.check_access)(request)
+        if denegado:
+            return denegado
+        validadores = None
+        if hasattr(self, "get_validators"):
+            # ConditionalGetMixin: el 304 se decide antes de cualquier otra consulta
+            validadores = await sync_to_async(self.get_validators)(request)
+            if validadores and (response := get_conditional_response(request, *validadores)):
+                return self.set_validators(response, validadores)
+        method = request.method.lower()
+        handler = getattr(self, method, None) if method in self.http_method_names else None
+        if handler is None:
+            return await self.http_method_not_allowed(request, *args, **kwargs)
+        response = await handler(request, *args, **kwargs)
+        return self.set_validators(response, validadores) if validadores else response
+
+
+class AsyncListMixin(AsyncPermissionRedirectMixin):
+    """ListView async: página y total con el ORM async; `get_parallel_context` a la vez."""
+
+    def get_parallel_context(self):
+        """{clave de contexto: corrutina que devuelve el valor ya evaluado}."""
+        return {}
+
+    async def apaginate_queryset(self, queryset, page_size):
+        """paginate_queryset() con el ORM async: mismo resultado (paginator, page, objetos, paginado)."""
+        if isinstance(self, KeysetPaginationMixin):
+            if self.page_kwarg not in self.request.GET:
+                return await self.akeyset_paginate(queryset, page_size)
+            queryset = queryset.order_by(*self.keyset_fields)
+        paginator = self.get_paginator(
+            queryset, page_size, orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        paginator.count = await queryset.acount()
+        page = self.kwargs.get(self.page_kwarg) or self.request.GET.get(self.page_kwarg) or 1
+        try:
+            page_number = paginator.num_pages if page == "last" else int(page)
+            page = paginator.page(page_number)
+        except (ValueError, InvalidPage):
+            raise Http404(_("Invalid page (%(page_number)s)") % {"page_number": page})
+        page.object_list = await listar(page.object_list)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def paginate_queryset(self, queryset, page_size):
+        # get_context_data() recibe la página ya leída en get()
+        return self._pagina
+
+    async def get(self, request, *args, **kwargs):
+        if hasattr(self, "cached_list_response"):
+            # Listados con CachedListMixin: si el HTML está en caché no hay más consultas
+            response = await sync_to_async(self.cached_list_response)()
+            if response is not None:
+                return response
+        self.object_list = self.get_queryset()
+        page_size = self.get_paginate_by(self.object_list)
+        if page_size:
+            self._pagina, extra = await asyncio.gather(
+                self.apaginate_queryset(self.object_list, page_size), en_paralelo(self.get_parallel_context())
+            )
+        else:
+            self.object_list, extra = await asyncio.gather(
+                listar(self.object_list), en_paralelo(self.get_parallel_context())
+            )
+        ctx = await sync_to_async(self.get_context_data)()
+        ctx.update(extra)
+        return self.render_to_response(ctx)
+
+
+class AsyncDetailMixin(AsyncPermissionRedirectMixin):
+    """DetailView async: el objeto con `aget`; después sus lecturas relacionadas a la vez."""
+
+    def get_parallel_context(self):
+        return {}
+
+    async def aget_object(self):
+        """get_object() con el ORM async (las URLs de detalle van por pk)."""
+        queryset = self.get_queryset().filter(pk=self.kwargs.get(self.pk_url_kwarg))
+        try:
+            return await queryset.aget()
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                _("No %(verbose_name)s found matching the query") % {"verbose_name": queryset.model._meta.verbose_name}
+            )
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        extra = await en_paralelo(self.get_parallel_context())
+        ctx = await sync_to_async(self.get_context_data)(object=self.object)
+        ctx.update(extra)
+        return self.render_to_response(ctx)
+
+
+# ===== Listados =====
+
+class ClienteListView(AsyncListMixin, views.ClienteListView):
+    pass
+
+
+class PaqueteListView(AsyncListMixin, views.PaqueteListView):
+    pass
+
+
+class ProductoListView(AsyncListMixin, views.ProductoListView):
+    pass
+
+
+class ProveedorListView(AsyncListMixin, views.ProveedorListView):
+    pass
+
+
+class DestinoListView(AsyncListMixin, views.DestinoListView):
+    pass
+
+
+class MetodoPagoListView(AsyncListMixin, views.MetodoPagoListView):
+    pass
+
+
+class InteraccionListView(AsyncListMixin, views.InteraccionListView):
+    pass
+
+
+class ReservaListView(AsyncListMixin, views.ReservaListView):
+
+    def get_parallel_context(self):
+        tareas = {"destinos": listar(Destino.objects.order_by("pais", "nombre"))}
+        if views.is_admin_user(self.request.user):
+            User = get_user_model()
+            tareas["colaboradores"] = listar(User.objects.order_by("nombre", "email"))
+        return tareas
+
+
+# ===== Detalle =====
+
+class PaqueteDetailView(AsyncDetailMixin, views.PaqueteDetailView):
+
+    def get_queryset(self):
+        # Sin prefetch_related: productos y comentarios se piden a la vez
+        return Paquete.objects.all()
+
+    def get_parallel_context(self):
+        paquete = self.object
+        return {
+            "productos": listar(paquete.productos.select_related("proveedor", "destino")),
+            "comentarios": listar(paquete.comentarios.select_related("autor")),
+        }
+
+    async def post(self, request, *args, **kwargs):
+        return await sync_to_async(super().post)(request, *args, **kwargs)
@@ -0,0 +1,32 @@
+# core/backends.py
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .cache import PERMISSIONS, get_version
+
+# La versión de roles (core/cache.py) invalida al momento; el TTL solo acota la memoria
+PERMISSIONS_TIMEOUT = 60 * 10
+
+
+def permissions_cache_key(user_obj):
+    return f"perms:{user_obj.pk}:{int(user_obj.is_superuser)}:{get_version(PERMISSIONS)}"
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend que guarda el set de permisos de cada usuario en la caché, con la
+    versión de roles en la clave. Los cambios de grupos y permisos suben la versión
+    en la base (core/signals.py): todos los procesos dejan de usar la entrada vieja.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, "_perm_cache"):
+            key = permissions_cache_key(user_obj)
+            perms = cache.get(key)
+            if perms is None:
+                perms = super().get_all_permissions(user_obj)
+                cache.set(key, perms, PERMISSIONS_TIMEOUT)
+            user_obj._perm_cache = perms
+        return user_obj._perm_cache
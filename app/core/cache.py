@@ -0,0 +1,52 @@
+# core/cache.py
+"""
+Versiones de los grupos de claves de caché (permisos, etiquetas de paquetes, listados).
+Las claves incluyen la versión: subirla invalida el grupo entero sin borrar nada.
+La versión vive en la base (VersionCache) y no en la caché, que puede ser por proceso
+(LocMemCache): así un cambio hecho en un worker web o en `procesar_trabajos` llega a
+todos. Cada proceso relee las versiones como mucho cada VERSIONES_TTL segundos.
+"""
+import time
+
+from django.apps import apps
+from django.db.models import F
+
+PERMISSIONS = "permisos"
+PAQUETES = "paquetes"
+
+VERSIONES_TTL = 1.0  # segundos que otro proceso puede tardar en ver una versión nueva
+
+_leidas = {"versiones": {}, "cuando": float("-inf")}
+
+
+def _version_model():
+    return apps.get_model("core", "VersionCache")
+
+
+def _versiones():
+    ahora = time.monotonic()
+    if ahora - _leidas["cuando"] >= VERSIONES_TTL:
+        # Todas en una consulta: son pocas filas y una página pide varias
+        _leidas["versiones"] = dict(_version_model().objects.values_list("nombre", "version"))
+        _leidas["cuando"] = ahora
+    return _leidas["versiones"]
+
+
+def olvidar_versiones():
+    """Fuerza a releer las versiones en la próxima consulta."""
+    _leidas["cuando"] = float("-inf")
+
+
+def get_version(name):
+    """Versión actual de un grupo de claves; las claves la incluyen para invalidarse en bloque."""
+    return _versiones().get(name, 1)
+
+
+def bump_version(name):
+    """Sube la versión del grupo; los llamadores lo hacen al confirmar la transacción."""
+    VersionCache = _version_model()
+    if not VersionCache.objects.filter(nombre=name).update(version=F("version") + 1):
+        _, creada = VersionCache.objects.get_or_create(nombre=name, defaults={"version": 2})
+        if not creada:  # otro proceso la creó entre medias
+            VersionCache.objects.filter(nombre=name).update(version=F("version") + 1)
+    olvidar_versiones()  # este proceso la ve en la siguiente petición
@@ -0,0 +1,83 @@
+# core/cambios.py
+"""
+Seguimiento de modificaciones para GET condicionales (ETag / Last-Modified).
+- Cada fila lleva `actualizado_en`.
+- CambioTabla guarda por tabla la última modificación (marca de agua). Se mueve al
+  guardar y borrar (señales) y en update/bulk_update/bulk_create, que no envían señales.
+Saber si algo cambió es una lectura por clave primaria de CambioTabla.
+Los campos de `campos_sin_marca` no se muestran en otras páginas: escribir solo esos
+actualiza la fila pero no la marca de la tabla.
+"""
+from django.apps import apps
+from django.db import models
+from django.db.models import Max
+from django.utils import timezone
+
+CAMPO = "actualizado_en"
+
+
+def _cambio_model():
+    return apps.get_model("core", "CambioTabla")
+
+
+def tocar(*model_classes, cuando=None):
+    """Mueve a `cuando` (por defecto, ahora) la marca de las tablas de `model_classes`."""
+    CambioTabla = _cambio_model()
+    cuando = cuando or timezone.now()
+    for tabla in {m._meta.label_lower for m in model_classes}:
+        if not CambioTabla.objects.filter(tabla=tabla).update(actualizado=cuando):
+            CambioTabla.objects.get_or_create(tabla=tabla, defaults={"actualizado": cuando})
+
+
+def mueve_marca(model, campos):
+    """False si `campos` (los escritos; None = todos) son solo campos sin marca."""
+    if campos is None:
+        return True
+    return bool(set(campos) - {CAMPO} - set(getattr(model, "campos_sin_marca", ())))
+
+
+def ultima_modificacion(*model_classes):
+    """Última modificación de cualquiera de las tablas, o None si no hay marcas."""
+    return (
+        _cambio_model().objects
+        .filter(tabla__in=[m._meta.label_lower for m in model_classes])
+        .aggregate(ultima=Max("actualizado"))["ultima"]
+    )
+
+
+class SeguimientoQuerySet(models.QuerySet):
+    """Actualiza `actualizado_en` y la marca de la tabla en las operaciones masivas."""
+
+    def _seguido(self):
+        return any(f.name == CAMPO for f in self.model._meta.concrete_fields)
+
+    def update(self, **kwargs):
+        if not self._seguido():
+            return super().update(**kwargs)
+        kwargs.setdefault(CAMPO, timezone.now())
+        rows = super().update(**kwargs)
+        if rows and mueve_marca(self.model, kwargs):
+            tocar(self.model)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        if created and self._seguido():
+            tocar(self.model)
+        return created
+
+
+class SeguimientoModel(models.Model):
+    """Modelo con `actualizado_en`, también al guardar con update_fields."""
+
+    actualizado_en = models.DateTimeField(auto_now=True, editable=False)
+    campos_sin_marca = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields:
+            kwargs["update_fields"] = {*update_fields, CAMPO}
+        super().save(*args, **kwargs)
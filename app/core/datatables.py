@@ -0,0 +1,96 @@
+# core/datatables.py
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.http import JsonResponse
+from django.utils import timezone
+
+from .pagination import estimate_count
+
+
+def _int(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def format_cell(value):
+    """Mismo formato que las plantillas de listado."""
+    if value is None or value == "":
+        return "—"
+    if isinstance(value, bool):
+        return "Sí" if value else "No"
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime("%d/%m/%Y %H:%M")
+    if isinstance(value, date):
+        return value.strftime("%d/%m/%Y")
+    if isinstance(value, Decimal):
+        return f"${value}"
+    return value
+
+
+class DataTableMixin:
+    """
+    Endpoint JSON de DataTables (modo servidor) sobre un ListView existente.
+    - Reutiliza get_queryset() de la lista: permisos por rol, ?q= y filtros.
+    - `columns`: [(ruta para values_list o None si la calcula decorate_rows,
+      campos de orden indexados o None)], en el orden de la tabla sin "Acciones".
+    - Cada fila es una lista compacta [pk, celda1, celda2, ...].
+    """
+    columns = ()
+    max_length = 100
+    count_cap = 10000
+
+    def get_ordering_fields(self, params):
+        index = _int(params.get("order[0][column]"), -1)
+        descending = params.get("order[0][dir]") == "desc"
+        fields = None
+        if 0 <= index < len(self.columns):
+            fields = self.columns[index][1]
+        if not fields:
+            default = getattr(self, "keyset_fields", None) or self.model._meta.ordering or ("-pk",)
+            return [*default, "-pk" if default[0].startswith("-") else "pk"]
+        if isinstance(fields, str):
+            fields = (fields,)
+        prefix = "-" if descending else ""
+        return [*(prefix + f for f in fields), prefix + "pk"]
+
+    def decorate_rows(self, rows):
+        """Rellena las columnas calculadas (ruta None) de la ventana actual."""
+
+    def get(self, request, *args, **kwargs):
+        params = request.GET
+        start = max(_int(params.get("start"), 0), 0)
+        length = min(max(_int(params.get("length"), 10), 1), self.max_length)
+
+        qs = self.get_queryset().prefetch_related(None)
+        total, total_is_estimate = estimate_count(qs, self.count_cap)
+
+        paths = [path for path, _order in self.columns if path]
+        window = qs.order_by(*self.get_ordering_fields(params)).values_list("pk", *paths)
+        rows = []
+        for values in window[start:start + length]:
+            values = iter(values)
+            row = [next(values)]
+            row.extend(next(values) if path else None for path, _order in self.columns)
+            rows.append(row)
+        self.decorate_rows(rows)
+
+        meta = self.model._meta
+        user = request.user
+        data = {
+            "recordsTotal": total,
+            "recordsFiltered": total,
+            "estimado": total_is_estimate,
+            "acciones": {
+                "editar": user.has_perm(f"{meta.app_label}.change_{meta.model_name}"),
+                "eliminar": user.has_perm(f"{meta.app_label}.delete_{meta.model_name}"),
+            },
+            "data": [[row[0], *map(format_cell, row[1:])] for row in rows],
+        }
+        if "draw" in params:
+            data["draw"] = _int(params.get("draw"), 0)
+        return JsonResponse(data)
@@ -0,0 +1,77 @@
+# core/db/backends/sqlite3/base.py
+"""
+Backend SQLite para producción (ver el perfil DB_PROFILE=produccion en settings).
+- Aplica PRAGMAs al abrir cada conexión (WAL, synchronous, cache, mmap...).
+- Las transacciones de atomic() empiezan con BEGIN IMMEDIATE: el bloqueo de
+  escritura se pide al principio, así dos escritores no quedan atascados al
+  intentar subir de lectura a escritura (el "database is locked" inmediato).
+- Si el bloqueo no llega dentro de busy_timeout se reintenta unas pocas veces.
+
+OPTIONS propias (el resto va a sqlite3.connect, p. ej. "timeout"):
+    "pragmas": {nombre: valor}, se mezclan con PRAGMAS
+    "immediate": bool, BEGIN IMMEDIATE (por defecto True)
+    "begin_retries": int, reintentos tras agotar busy_timeout
+"""
+import random
+import time
+
+from django.db import OperationalError
+from django.db.backends.sqlite3 import base
+
+PRAGMAS = {
+    "journal_mode": "WAL",      # lectores y un escritor a la vez
+    "synchronous": "NORMAL",    # en WAL no pierde consistencia, solo el último commit ante un corte de luz
+    "cache_size": -64000,       # en KiB (negativo): 64 MB por conexión
+    "mmap_size": 268435456,     # 256 MB
+    "temp_store": "MEMORY",
+}
+BEGIN_RETRIES = 3
+BACKOFF = 0.05  # segundos, se duplica en cada intento
+
+_OPCIONES = ("pragmas", "immediate", "begin_retries")
+
+
+def aplicar_pragmas(conn, pragmas):
+    for nombre, valor in pragmas.items():
+        conn.execute(f"PRAGMA {nombre} = {valor}")
+
+
+def es_bloqueo(exc):
+    return "locked" in str(exc) or "busy" in str(exc)
+
+
+def begin_immediate(execute, retries=BEGIN_RETRIES, backoff=BACKOFF):
+    """
+    Ejecuta BEGIN IMMEDIATE reintentando con espera exponencial si la base está bloqueada.
+    `execute` puede ser de un cursor de Django o de una conexión sqlite3 directa.
+    """
+    for intento in range(retries + 1):
+        try:
+            return execute("BEGIN IMMEDIATE")
+        except (OperationalError, base.Database.OperationalError) as exc:
+            if intento == retries or not es_bloqueo(exc):
+                raise
+            time.sleep(backoff * 2 ** intento * (1 + random.random()))
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        opciones = self.settings_dict["OPTIONS"]
+        self.pragmas = {**PRAGMAS, **opciones.get("pragmas", {})}
+        self.immediate = opciones.get("immediate", True)
+        self.begin_retries = opciones.get("begin_retries", BEGIN_RETRIES)
+        for nombre in _OPCIONES:
+            params.pop(nombre, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        aplicar_pragmas(conn, self.pragmas)
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if not self.immediate:
+            return super()._start_transaction_under_autocommit()
+        begin_immediate(self.cursor().execute, self.begin_retries)
@@ -0,0 +1,61 @@
+# core/db/router.py
+"""
+Lecturas a la réplica, escrituras al primario.
+Solo se lee de la réplica dentro de `usar_replica()` (lo activa ReplicaMiddleware
+para las vistas de lectura); fuera de él todo va al primario, así comandos,
+señales y POSTs siempre ven datos frescos.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARIO = "default"
+REPLICA = "replica"
+# Apps que nunca se leen de la réplica: la sesión recién creada tiene que verse ya
+SOLO_PRIMARIO = {"sessions"}
+
+_leer_de_replica = ContextVar("leer_de_replica", default=False)
+
+
+def replica_configurada():
+    return REPLICA in settings.DATABASES
+
+
+def activar_replica(activar=True):
+    """Activa la lectura desde la réplica; devuelve el token para restaurar_replica()."""
+    return _leer_de_replica.set(activar and replica_configurada())
+
+
+def restaurar_replica(token):
+    _leer_de_replica.reset(token)
+
+
+@contextmanager
+def usar_replica(activar=True):
+    token = activar_replica(activar)
+    try:
+        yield
+    finally:
+        restaurar_replica(token)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        if _leer_de_replica.get() and model._meta.app_label not in SOLO_PRIMARIO:
+            return REPLICA
+        return PRIMARIO
+
+    def db_for_write(self, model, **hints):
+        return PRIMARIO
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return {obj1._state.db, obj2._state.db} <= {PRIMARIO, REPLICA, None}
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplica recibe el esquema por replicación (`manage.py replicar`)
+        return db == PRIMARIO
@@ -0,0 +1,281 @@
+# core/estaticos.py
+"""
+Estáticos sin CDN: librerías copiadas en static/vendor, un bundle por layout y copias
+precomprimidas.
+- VENDOR: ruta en static/ -> URL de origen. `manage.py construir_estaticos` descarga las
+  que falten (se versionan con el repo), arma static/bundles/<layout>.css|js y ejecuta
+  collectstatic.
+- {% bundle "base" "css" %} enlaza el bundle si está armado; si no, los archivos sueltos
+  (los de vendor/ desde su CDN), así que sin compilar todo sigue funcionando.
+- Con ESTATICOS_COMPILADOS=1: ManifestComprimido pone el hash del contenido en cada nombre
+  y deja hermanos .gz/.br, y EstaticosMiddleware los sirve con caché inmutable de un año.
+"""
+import gzip
+import mimetypes
+import os
+import posixpath
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.templatetags.static import static
+from django.utils._os import safe_join
+from django.utils.html import format_html_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:  # sin el paquete brotli solo se generan .gz
+    brotli = None
+
+CDNJS_FA = "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/5.15.4"
+DATATABLES = "https://cdn.datatables.net"
+JSDELIVR = "https://cdn.jsdelivr.net/npm"
+
+# Ruta en static/ -> URL de origen (las mismas versiones que se usaban desde el CDN)
+VENDOR = {
+    "vendor/bootstrap-4.6.2/bootstrap.min.css": f"{JSDELIVR}/bootstrap@4.6.2/dist/css/bootstrap.min.css",
+    "vendor/bootstrap-4.6.2/bootstrap.bundle.min.js": f"{JSDELIVR}/bootstrap@4.6.2/dist/js/bootstrap.bundle.min.js",
+    "vendor/bootstrap-5.3.3/bootstrap.min.css": f"{JSDELIVR}/bootstrap@5.3.3/dist/css/bootstrap.min.css",
+    "vendor/admin-lte-3.2/adminlte.min.css": f"{JSDELIVR}/admin-lte@3.2/dist/css/adminlte.min.css",
+    "vendor/admin-lte-3.2/adminlte.min.js": f"{JSDELIVR}/admin-lte@3.2/dist/js/adminlte.min.js",
+    "vendor/fontawesome-5.15.4/css/all.min.css": f"{CDNJS_FA}/css/all.min.css",
+    **{
+        f"vendor/fontawesome-5.15.4/webfonts/{fuente}.{ext}": f"{CDNJS_FA}/webfonts/{fuente}.{ext}"
+        for fuente in ("fa-brands-400", "fa-regular-400", "fa-solid-900")
+        for ext in ("eot", "svg", "ttf", "woff", "woff2")
+    },
+    "vendor/datatables-1.13.6/dataTables.bootstrap4.min.css": f"{DATATABLES}/1.13.6/css/dataTables.bootstrap4.min.css",
+    "vendor/datatables-1.13.6/jquery.dataTables.min.js": f"{DATATABLES}/1.13.6/js/jquery.dataTables.min.js",
+    "vendor/datatables-1.13.6/dataTables.bootstrap4.min.js": f"{DATATABLES}/1.13.6/js/dataTables.bootstrap4.min.js",
+    "vendor/datatables-responsive-2.5.0/responsive.bootstrap4.min.css":
+        f"{DATATABLES}/responsive/2.5.0/css/responsive.bootstrap4.min.css",
+    "vendor/datatables-responsive-2.5.0/dataTables.responsive.min.js":
+        f"{DATATABLES}/responsive/2.5.0/js/dataTables.responsive.min.js",
+    "vendor/datatables-responsive-2.5.0/responsive.bootstrap4.min.js":
+        f"{DATATABLES}/responsive/2.5.0/js/responsive.bootstrap4.min.js",
+    "vendor/sweetalert2-11/sweetalert2.min.css": f"{JSDELIVR}/sweetalert2@11/dist/sweetalert2.min.css",
+    "vendor/sweetalert2-11/sweetalert2.all.min.js": f"{JSDELIVR}/sweetalert2@11",
+    "vendor/jquery-3.6.0/jquery.min.js": "https://code.jquery.com/jquery-3.6.0.min.js",
+    "vendor/jquery-ui-1.13.2/jquery-ui.min.js": "https://code.jquery.com/ui/1.13.2/jquery-ui.min.js",
+    **{
+        f"vendor/manrope/manrope-latin-{peso}-normal.woff2":
+            f"{JSDELIVR}/@fontsource/manrope@5/files/manrope-latin-{peso}-normal.woff2"
+        for peso in (400, 600, 700)
+    },
+}
+# Archivos propios sin equivalente suelto en un CDN: sin compilar se usa esto
+SUSTITUTOS_CDN = {
+    "css/fuentes.css": "https://fonts.googleapis.com/css2?family=Manrope:wght@400;600;700&display=swap",
+}
+
+# layout -> tipo -> archivos en orden; base.html (AdminLTE) y las páginas sueltas (auth, errores)
+BUNDLES = {
+    "base": {
+        "css": [
+            "vendor/bootstrap-4.6.2/bootstrap.min.css",
+            "vendor/admin-lte-3.2/adminlte.min.css",
+            "vendor/fontawesome-5.15.4/css/all.min.css",
+            "vendor/datatables-1.13.6/dataTables.bootstrap4.min.css",
+            "vendor/datatables-responsive-2.5.0/responsive.bootstrap4.min.css",
+            "vendor/sweetalert2-11/sweetalert2.min.css",
+            "css/fuentes.css",
+            "css/app.css",
+        ],
+        "js": [
+            "vendor/jquery-3.6.0/jquery.min.js",
+            "vendor/bootstrap-4.6.2/bootstrap.bundle.min.js",
+            "vendor/admin-lte-3.2/adminlte.min.js",
+            "vendor/jquery-ui-1.13.2/jquery-ui.min.js",
+            "vendor/datatables-1.13.6/jquery.dataTables.min.js",
+            "vendor/datatables-1.13.6/dataTables.bootstrap4.min.js",
+            "vendor/datatables-responsive-2.5.0/dataTables.responsive.min.js",
+            "vendor/datatables-responsive-2.5.0/responsive.bootstrap4.min.js",
+            "vendor/sweetalert2-11/sweetalert2.all.min.js",
+            "js/app.js",
+        ],
+    },
+    "auth": {
+        "css": [
+            "vendor/bootstrap-5.3.3/bootstrap.min.css",
+            "css/fuentes.css",
+            "css/app.css",
+        ],
+    },
+}
+CARPETA_BUNDLES = "bundles"
+
+COMPRIMIBLES = {".css", ".js", ".svg", ".json", ".txt", ".map", ".eot", ".ttf", ".html", ".xml"}
+MINIMO_COMPRIMIR = 256  # bytes
+CACHE_INMUTABLE = "public, max-age=31536000, immutable"
+CACHE_SIN_HASH = "public, max-age=60"
+
+URL_CSS = re.compile(r"""url\(\s*(['"]?)(?!data:|[a-z]+://|//|#)([^'")?#]+)([^'")]*)\1\s*\)""")
+SOURCE_MAP = re.compile(r"^\s*(/[*/])# sourceMappingURL=\S+(\s*\*/)?\s*$", re.M)
+CHARSET = re.compile(r'@charset\s+"[^"]*";\s*', re.I)
+
+
+def origen():
+    """Carpeta de static/ del proyecto (la primera de STATICFILES_DIRS)."""
+    return Path(settings.STATICFILES_DIRS[0])
+
+
+def ruta_bundle(layout, tipo):
+    return f"{CARPETA_BUNDLES}/{layout}.{tipo}"
+
+
+def sin_source_map(texto):
+    """Quita los sourceMappingURL: los .map no se copian y collectstatic fallaría al buscarlos."""
+    return SOURCE_MAP.sub("", texto)
+
+
+# ===== Armado =====
+
+def _reubicar_urls(texto, fuente, destino, faltan):
+    """Reescribe los url() relativos de `fuente` para que sigan valiendo desde `destino`."""
+    base = posixpath.dirname(fuente)
+    salida = posixpath.dirname(destino)
+
+    def reemplazar(m):
+        comilla, ruta, resto = m.groups()
+        real = posixpath.normpath(posixpath.join(base, ruta))
+        if not (origen() / real).is_file():
+            faltan.append(f"{fuente}: {ruta}")
+        return f"url({comilla}{posixpath.relpath(real, salida)}{resto}{comilla})"
+
+    return URL_CSS.sub(reemplazar, texto)
+
+
+def minificar_css(texto):
+    """Conservador: comentarios (salvo /*! licencias */) y espacios sobrantes."""
+    texto = re.sub(r"/\*(?!!).*?\*/", "", texto, flags=re.S)
+    texto = re.sub(r"\s+", " ", texto)
+    return re.sub(r"\s*([{};,>])\s*", r"\1", texto).replace(";}", "}").strip()
+
+
+def minificar_js(texto):
+    """Solo sangría y líneas vacías: sin un parser no es seguro tocar más."""
+    return "\n".join(linea.strip() for linea in texto.splitlines() if linea.strip())
+
+
+def armar(layout, tipo):
+    """Texto del bundle; ValueError si faltan archivos o algún url() apunta a uno inexistente."""
+    destino = ruta_bundle(layout, tipo)
+    partes, faltan = [], []
+    for fuente in BUNDLES[layout][tipo]:
+        archivo = origen() / fuente
+        if not archivo.is_file():
+            faltan.append(fuente)
+            continue
+        texto = sin_source_map(archivo.read_text(encoding="utf-8"))
+        if tipo == "css":
+            texto = _reubicar_urls(CHARSET.sub("", texto), fuente, destino, faltan)
+            if ".min." not in fuente:
+                texto = minificar_css(texto)
+        elif ".min." not in fuente:
+            texto = minificar_js(texto)
+        partes.append(f"/* {fuente} */\n{texto.strip()}\n")
+    if faltan:
+        raise ValueError(f"{destino}: faltan {', '.join(faltan)}")
+    # ";" entre scripts por si alguno no cierra su última sentencia
+    separador = "\n" if tipo == "css" else ";\n"
+    cabecera = '@charset "UTF-8";\n' if tipo == "css" else ""
+    return cabecera + separador.join(partes)
+
+
+# ===== Plantillas =====
+
+@lru_cache(maxsize=None)
+def etiquetas(layout, tipo):
+    """<link>/<script> del layout; se decide una vez por proceso si el bundle está armado."""
+    if finders.find(ruta_bundle(layout, tipo)):
+        urls = [static(ruta_bundle(layout, tipo))]
+    else:
+        urls = [VENDOR.get(f) or SUSTITUTOS_CDN.get(f) or static(f) for f in BUNDLES[layout][tipo]]
+    plantilla = '<link rel="stylesheet" href="{}">' if tipo == "css" else '<script src="{}"></script>'
+    return format_html_join("\n", plantilla, ((url,) for url in urls))
+
+
+# ===== collectstatic =====
+
+def comprimir(ruta):
+    """Deja ruta.gz (y ruta.br con brotli) si comprimen lo suficiente; devuelve los creados."""
+    datos = ruta.read_bytes()
+    creados = []
+    if len(datos) < MINIMO_COMPRIMIR:
+        return creados
+    variantes = [(".gz", lambda d: gzip.compress(d, 9, mtime=0))]
+    if brotli is not None:
+        variantes.append((".br", lambda d: brotli.compress(d, quality=11)))
+    for extension, compresor in variantes:
+        comprimido = compresor(datos)
+        if len(comprimido) < len(datos) * 0.95:
+            destino = ruta.with_name(ruta.name + extension)
+            destino.write_bytes(comprimido)
+            creados.append(destino)
+    return creados
+
+
+class ManifestComprimido(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage que además deja .gz/.br de los archivos de texto."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        nombres = {*self.hashed_files, *self.hashed_files.values()}
+        for nombre in nombres:
+            if posixpath.splitext(nombre)[1] in COMPRIMIBLES and self.exists(nombre):
+                comprimir(Path(self.path(nombre)))
+
+
+# ===== Servir =====
+
+@lru_cache(maxsize=1)
+def _con_hash():
+    """Nombres con hash del manifiesto: su contenido no cambia nunca."""
+    return frozenset(getattr(staticfiles_storage, "hashed_files", {}).values())
+
+
+def _codificaciones(request):
+    aceptadas = {
+        parte.split(";")[0].strip().lower()
+        for parte in request.headers.get("Accept-Encoding", "").split(",")
+    }
+    return [(ext, cod) for ext, cod in ((".br", "br"), (".gz", "gzip")) if cod in aceptadas]
+
+
+def servir(request, ruta):
+    """Respuesta para `ruta` dentro de STATIC_ROOT, o None si no existe."""
+    try:
+        archivo = safe_join(settings.STATIC_ROOT, ruta)
+    except SuspiciousFileOperation:  # fuera de STATIC_ROOT
+        return None
+    if not ruta or not os.path.isfile(archivo):
+        return None
+    estado = os.stat(archivo)
+    if not was_modified_since(request.headers.get("If-Modified-Since"), estado.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        content_type, _ = mimetypes.guess_type(archivo)
+        servido, codificacion = archivo, None
+        for extension, cod in _codificaciones(request):
+            if os.path.isfile(archivo + extension):
+                servido, codificacion = archivo + extension, cod
+                break
+        response = FileResponse(
+            open(servido, "rb"), filename=os.path.basename(archivo),
+            content_type=content_type or "application/octet-stream",
+        )
+        if codificacion:
+            response.headers["Content-Encoding"] = codificacion
+        response.headers["Last-Modified"] = http_date(estado.st_mtime)
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = CACHE_INMUTABLE if ruta in _con_hash() else CACHE_SIN_HASH
+    return response
@@ -0,0 +1,63 @@
+# core/exportacion.py
+import csv
+import io
+import json
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+# (columna del archivo, ruta para values_list); destinos_texto ya viene
+# desnormalizado en el paquete, así que el JOIN sale en la misma consulta
+RESERVA_COLUMNAS = (
+    ("id", "id"),
+    ("cliente", "cliente__nombre"),
+    ("cliente_email", "cliente__email"),
+    ("paquete", "paquete__nombre"),
+    ("destinos", "paquete__destinos_texto"),
+    ("empleado", "empleado__nombre"),
+    ("empleado_email", "empleado__email"),
+    ("metodo_pago", "metodo_pago__nombre"),
+    ("precio_venta", "precio_venta"),
+    ("estado", "estado"),
+    ("fecha_viaje", "fecha_viaje"),
+    ("fecha_reserva", "fecha_reserva"),
+)
+CHUNK_SIZE = 2000
+LINEAS_POR_ESCRITURA = 500
+
+
+def filas_reservas(queryset, chunk_size=CHUNK_SIZE):
+    """Tuplas de RESERVA_COLUMNAS leídas por bloques con un cursor (memoria constante)."""
+    return (
+        queryset
+        .order_by("-fecha_reserva", "-id")
+        .values_list(*(ruta for _nombre, ruta in RESERVA_COLUMNAS))
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def csv_lines(encabezados, filas):
+    """Genera el CSV en trozos de varias líneas (el encabezado sale de inmediato)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(encabezados)
+    yield buffer.getvalue()
+    filas = iter(filas)
+    while True:
+        bloque = list(islice(filas, LINEAS_POR_ESCRITURA))
+        if not bloque:
+            return
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(bloque)
+        yield buffer.getvalue()
+
+
+def jsonl_lines(encabezados, filas):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    filas = iter(filas)
+    while True:
+        bloque = list(islice(filas, LINEAS_POR_ESCRITURA))
+        if not bloque:
+            return
+        yield "".join(encoder.encode(dict(zip(encabezados, fila))) + "\n" for fila in bloque)
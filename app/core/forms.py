@@ -10,6 +10,7 @@ from django.forms import (
     EmailInput,
     Textarea,
 )
+from django.forms.models import ModelChoiceIterator, ModelChoiceIteratorValue
 
 from .models import (
     Cliente,
@@ -27,10 +28,15 @@ from .models import (
 from django.contrib.auth.models import Group, Permission
 from django.contrib.auth import get_user_model
 
+from .paquete_destinos import paquete_destinos_texto, paquete_labels
+from .roles import perm_tab_ids
+
 
 class RolForm(forms.ModelForm):
+    # Solo los permisos que muestran las pestañas de roles; la validación
+    # filtra por ids ya conocidos en vez de volver a cargar todo el catálogo.
     permissions = forms.ModelMultipleChoiceField(
-        queryset=Permission.objects.select_related("content_type").all(),
+        queryset=Permission.objects.none(),
         required=False,
     )
 
@@ -42,6 +48,10 @@ class RolForm(forms.ModelForm):
             "name": forms.TextInput(attrs={"class": "form-control"}),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["permissions"].queryset = Permission.objects.filter(pk__in=perm_tab_ids())
+
 
 class ClienteForm(forms.ModelForm):
     class Meta:
@@ -172,6 +182,17 @@ class MetodoPagoForm(forms.ModelForm):
         }
 
 
+class PaqueteChoiceIterator(ModelChoiceIterator):
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for pk, label, _destinos in paquete_labels():
+            yield (ModelChoiceIteratorValue(pk, None), label)
+
+    def __len__(self):
+        return len(paquete_labels()) + (self.field.empty_label is not None)
+
+
 class ReservaForm(forms.ModelForm):
     destinos = forms.CharField(
         label="Destino(s)",
@@ -203,37 +224,28 @@ class ReservaForm(forms.ModelForm):
             "estado": Select(attrs={"class": "form-control"}),
         }
 
+    # Las importaciones masivas (core/importacion.py) no renderizan el formulario
+    mostrar_destinos = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        if not self.mostrar_destinos:
+            return
 
-        # Mostrar destinos en las opciones del paquete
-        paquetes = Paquete.objects.prefetch_related("productos__destino").order_by("nombre")
+        # Opciones "Nombre — destinos" desde el índice cacheado (sin consultas al renderizar)
         paquete_field = self.fields["paquete"]
-        paquete_field.queryset = paquetes
-
-        def label_from_instance(p):
-            destinos = p.productos.all().values_list("destino__nombre", flat=True)
-            destinos_txt = ", ".join(sorted(set(filter(None, destinos))))
-            return f"{p.nombre} — {destinos_txt}" if destinos_txt else p.nombre
-
-        paquete_field.label_from_instance = label_from_instance
+        paquete_field.iterator = PaqueteChoiceIterator
+        paquete_field.widget.choices = paquete_field.choices
 
         # Campo de solo lectura mostrando los destinos del paquete seleccionado
-        destinos_value = ""
-        paquete_obj = None
-
         if self.is_bound:
             paquete_id = self.data.get("paquete") or self.initial.get("paquete")
-            paquete_obj = paquetes.filter(pk=paquete_id).first()
         else:
-            paquete_obj = getattr(self.instance, "paquete", None) or self.initial.get("paquete")
-            if isinstance(paquete_obj, int):
-                paquete_obj = paquetes.filter(pk=paquete_obj).first()
-
-        if paquete_obj:
-            destinos = paquete_obj.productos.all().values_list("destino__nombre", flat=True)
-            destinos_value = ", ".join(sorted(set(filter(None, destinos))))
+            paquete_id = self.instance.paquete_id or self.initial.get("paquete")
+            if isinstance(paquete_id, Paquete):
+                paquete_id = paquete_id.pk
 
+        destinos_value = paquete_destinos_texto(paquete_id) if paquete_id else ""
         self.fields["destinos"].initial = destinos_value or "—"
 
     def clean_precio_venta(self):
@@ -300,8 +312,8 @@ class EmpleadoUpdateForm(forms.ModelForm):
 
     class Meta:
         model = User
-        fields = ["email", "is_active", "is_staff", "groups"]
-        labels = {"email": "Correo", "groups": "Roles"}
+        fields = ["email", "is_active", "is_staff", "groups", "imagen", "cover"]
+        labels = {"email": "Correo", "groups": "Roles", "imagen": "Foto", "cover": "Portada"}
         widgets = {"groups": forms.CheckboxSelectMultiple}
 
     def clean(self):
@@ -338,3 +350,13 @@ class ComentarioForm(forms.ModelForm):
             "texto": Textarea(attrs={"class": "form-control", "rows": 3, "placeholder": "Escribe tu comentario..."}),
         }
     
+
+
+class ImportarArchivoForm(forms.Form):
+    archivo = forms.FileField(
+        label="Archivo",
+        help_text=(
+            "CSV con encabezados o JSONL (un objeto JSON por línea). Columnas opcionales: "
+            "fecha_registro (clientes) y fecha_reserva (reservas) conservan la fecha de origen."
+        ),
+    )
@@ -0,0 +1,630 @@
+# core/generador.py
+"""
+Datos sintéticos con volúmenes de producción (`manage.py generar_datos`, `benchmark_carga`).
+- Nombres, correos, teléfonos y fechas verosímiles; respeta las restricciones
+  únicas (email, contacto, destino + país) y el validador de teléfono.
+- Las filas se arman por bloques de ids explícitos, opcionalmente en un pool de
+  procesos. Paquete.productos y PaqueteDestino se escriben con bulk_create; las
+  tablas de modelos y sus términos de búsqueda, con executemany: bulk_create pasa
+  por pre_save y auto_now_add pisaría las fechas históricas (fecha_reserva,
+  fecha_registro, creado_en). En ningún caso hay señales.
+- Cada bloque tiene su propia semilla: con la misma semilla y la misma base de
+  partida salen los mismos datos, con o sin procesos.
+- Solo crea lo que falta hasta cada volumen; al final recalcula los derivados
+  (calificaciones, indicadores, rollups) y marca las tablas como cambiadas.
+"""
+import random
+from bisect import bisect_right
+from contextlib import contextmanager, nullcontext
+from datetime import timedelta, timezone as dt_timezone
+from functools import lru_cache
+from math import log
+from multiprocessing import Pool
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, Permission
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cambios import SeguimientoModel, tocar
+from .indicadores import recalcular_indicadores
+from .listas import invalidar_listas
+from .models import (
+    Cliente, Comentario, Destino, Empleado, Interaccion, MetodoPago, Paquete, PaqueteDestino,
+    Producto, Proveedor, Reserva, TerminoBusqueda, TipoInteraccion,
+)
+from .ratings import rebuild_ratings
+from .roles import perm_tab_ids
+from .rollups import reconstruir
+from .search import MAX_TERM_LENGTH, normalize
+
+BLOQUE = 20000  # filas por tarea del pool y por transacción (por defecto de sembrar)
+# Volúmenes por defecto: pequeños para que una ejecución local tarde segundos
+VOLUMENES = {
+    "destinos": 100,
+    "proveedores": 100,
+    "productos": 1000,
+    "paquetes": 500,
+    "colaboradores": 20,
+    "clientes": 10000,
+    "reservas": 50000,
+    "interacciones": 20000,
+    "comentarios": 5000,
+}
+DOMINIO = "gabostours.test"
+ADMIN_EMAIL = f"admin@{DOMINIO}"
+COLABORADOR_EMAIL = f"colaborador1@{DOMINIO}"
+PASSWORD = "gabostours"
+GRUPO_COLABORADOR = "Colaborador (datos sintéticos)"
+DIAS_HISTORIA = 730
+FUTURO = 400  # días hacia adelante del calendario precalculado (fechas de viaje)
+
+NOMBRES = (
+    "María", "José", "Juan", "Ana", "Luis", "Carmen", "Carlos", "Laura", "Jorge", "Sofía",
+    "Miguel", "Lucía", "Pedro", "Valentina", "Fernando", "Daniela", "Ricardo", "Gabriela", "Alejandro", "Fernanda",
+    "Javier", "Paola", "Diego", "Andrea", "Raúl", "Mariana", "Sergio", "Isabel", "Andrés", "Verónica",
+    "Héctor", "Patricia", "Óscar", "Rosa", "Eduardo", "Elena", "Manuel", "Adriana", "Roberto", "Claudia",
+    "Francisco", "Natalia", "Antonio", "Ximena", "Arturo", "Regina", "Iván", "Camila", "Emilio", "Renata",
+)
+APELLIDOS = (
+    "García", "Hernández", "Martínez", "López", "González", "Pérez", "Rodríguez", "Sánchez", "Ramírez", "Cruz",
+    "Flores", "Gómez", "Morales", "Vázquez", "Reyes", "Jiménez", "Torres", "Díaz", "Gutiérrez", "Ruiz",
+    "Mendoza", "Aguilar", "Ortiz", "Moreno", "Castillo", "Romero", "Álvarez", "Méndez", "Chávez", "Rivera",
+    "Juárez", "Ramos", "Domínguez", "Herrera", "Medina", "Castro", "Vargas", "Guzmán", "Velázquez", "Muñoz",
+    "Rojas", "Salazar", "Navarro", "Núñez", "Ibarra", "Peña", "Cortés", "Luna", "Ríos", "Soto",
+)
+CORREOS = ("example.com", "example.net", "example.org")
+LADAS = ("55", "33", "81", "222", "998", "999", "442", "477", "664", "614")  # + dígitos hasta 10
+CALLES = ("Av. Insurgentes", "Calle Hidalgo", "Av. Reforma", "Calle Juárez", "Calle Morelos", "Av. Universidad")
+COLONIAS = ("Centro", "Del Valle", "Roma Norte", "Polanco", "Condesa", "Narvarte", "Coyoacán")
+PREFERENCIAS = (
+    "Playa", "Montaña", "Cultura", "Gastronomía", "Aventura", "Cruceros", "Viajes en familia",
+    "Luna de miel", "Ecoturismo", "Playa y gastronomía", "Ciudades europeas",
+)
+CIUDADES = (
+    ("Cancún", "México"), ("Ciudad de México", "México"), ("Oaxaca", "México"), ("Guadalajara", "México"),
+    ("Puerto Vallarta", "México"), ("Los Cabos", "México"), ("Mérida", "México"), ("Tulum", "México"),
+    ("San Miguel de Allende", "México"), ("Madrid", "España"), ("Barcelona", "España"), ("Sevilla", "España"),
+    ("París", "Francia"), ("Niza", "Francia"), ("Roma", "Italia"), ("Florencia", "Italia"), ("Venecia", "Italia"),
+    ("Lisboa", "Portugal"), ("Londres", "Reino Unido"), ("Ámsterdam", "Países Bajos"), ("Berlín", "Alemania"),
+    ("Praga", "República Checa"), ("Atenas", "Grecia"), ("Estambul", "Turquía"), ("Cusco", "Perú"),
+    ("Lima", "Perú"), ("Bogotá", "Colombia"), ("Cartagena", "Colombia"), ("Buenos Aires", "Argentina"),
+    ("Bariloche", "Argentina"), ("Santiago", "Chile"), ("Río de Janeiro", "Brasil"), ("La Habana", "Cuba"),
+    ("Punta Cana", "República Dominicana"), ("San José", "Costa Rica"), ("Nueva York", "Estados Unidos"),
+    ("Las Vegas", "Estados Unidos"), ("Orlando", "Estados Unidos"), ("Tokio", "Japón"), ("Kioto", "Japón"),
+    ("Dubái", "Emiratos Árabes Unidos"), ("El Cairo", "Egipto"), ("Bangkok", "Tailandia"), ("Bali", "Indonesia"),
+)
+ZONAS = ("Centro", "Norte", "Sur", "Zona Hotelera", "Casco Antiguo", "Puerto", "Aeropuerto")
+PROVEEDORES = {
+    "Aerolínea": ("Aerolíneas", "Vuelos", "Air"),
+    "Hotel": ("Hoteles", "Resorts", "Posadas", "Suites"),
+    "Transporte": ("Transportes", "Traslados", "Autobuses", "Renta de Autos"),
+    "Otro": ("Seguros", "Asistencia", "Excursiones"),
+}
+MARCAS = ("del Sol", "Pacífico", "Azteca", "Atlántico", "Andina", "Caribe", "Maya", "Mediterráneo", "Austral", "Boreal")
+# tipo de producto -> (tipos de proveedor, plantillas de nombre, rango de precio)
+PRODUCTOS = {
+    "Vuelo": (("Aerolínea",), ("Vuelo redondo a {}", "Vuelo sencillo a {}"), (1500, 18000)),
+    "Hotel": (("Hotel",), ("Hotel en {}, 3 noches", "Resort todo incluido en {}", "Hostal boutique en {}"), (1200, 25000)),
+    "Tour": (("Transporte", "Otro"), ("Tour gastronómico en {}", "Recorrido histórico por {}", "Excursión de un día en {}"), (300, 3500)),
+    "Otro": (("Otro", "Transporte"), ("Traslado aeropuerto-hotel en {}", "Seguro de viaje a {}"), (200, 1500)),
+}
+TEMAS = ("Escapada a {}", "Aventura en {}", "Luna de miel en {}", "Fin de semana en {}", "Lo mejor de {}", "Vacaciones en familia en {}")
+NOTAS = {
+    TipoInteraccion.LLAMADA: (
+        "Llamó para pedir informes de paquetes", "Confirmó datos de los pasajeros", "Solicita cambio de fecha",
+        "Llamada de seguimiento después del viaje", "Pregunta por formas de pago",
+    ),
+    TipoInteraccion.EMAIL: (
+        "Se envió cotización", "Envió documentos para la reserva", "Se enviaron los boletos",
+        "Solicita factura", "Queja por retraso del vuelo",
+    ),
+    TipoInteraccion.REUNION: (
+        "Reunión en sucursal para planear el viaje", "Revisión de itinerario", "Firma de contrato de viaje de grupo",
+    ),
+}
+TIPOS_INTERACCION = ((TipoInteraccion.LLAMADA, 50), (TipoInteraccion.EMAIL, 40), (TipoInteraccion.REUNION, 10))
+COMENTARIOS = {
+    1: ("Muy mala experiencia, no lo recomiendo.", "Nada de lo prometido se cumplió."),
+    2: ("El hotel no era como en las fotos.", "Hubo varios retrasos y poca atención."),
+    3: ("Cumplió, aunque el itinerario fue cansado.", "Bien en general, el precio algo alto."),
+    4: ("Muy buen viaje, todo organizado.", "Buena relación calidad-precio."),
+    5: ("¡Excelente! Volvería a viajar con ellos.", "Todo perfecto, el guía fue increíble."),
+}
+CALIFICACIONES = ((1, 5), (2, 5), (3, 15), (4, 35), (5, 40))
+METODOS_PAGO = ("Efectivo", "Tarjeta de crédito", "Tarjeta de débito", "Transferencia")
+# Estado según si el viaje ya pasó
+ESTADOS_PASADO = (("Completada", 85), ("Cancelada", 15))
+ESTADOS_FUTURO = (("Confirmada", 60), ("Pendiente", 28), ("Cancelada", 12))
+
+# Solo para textos de un vocabulario cerrado (nombres, plantillas): nunca para valores únicos
+_norm = lru_cache(maxsize=None)(normalize)
+
+
+def _acumulados(pesos):
+    valores, acumulado, total = [], [], 0
+    for valor, peso in pesos:
+        total += peso
+        valores.append(valor)
+        acumulado.append(total)
+    return valores, acumulado
+
+
+def _terminos(label, pk, busqueda):
+    # Mismos términos que tokenize(), en orden estable
+    return [(label, pk, t[:MAX_TERM_LENGTH]) for t in dict.fromkeys(busqueda.split())]
+
+
+class Azar(random.Random):
+    """random.Random con elecciones más baratas: se llaman millones de veces por carga."""
+
+    def uno(self, valores):
+        return valores[int(self.random() * len(valores))]
+
+    def ponderado(self, valores, acumulado):
+        return valores[bisect_right(acumulado, self.random() * acumulado[-1])]
+
+
+class Ids:
+    """Ids existentes como rangos contiguos: elegir uno al azar no requiere la lista entera."""
+    __slots__ = ("inicios", "acumulado", "total")
+
+    def __init__(self):
+        self.inicios, self.acumulado, self.total = [], [], 0
+
+    @classmethod
+    def de(cls, model):
+        ids = cls()
+        siguiente = None
+        for pk in model._default_manager.order_by("pk").values_list("pk", flat=True).iterator(chunk_size=BLOQUE):
+            if pk != siguiente:
+                ids.inicios.append(pk)
+                ids.acumulado.append(ids.total)
+            ids.total += 1
+            siguiente = pk + 1
+        return ids
+
+    def __len__(self):
+        return self.total
+
+    def elegir(self, azar):
+        k = int(azar.random() * self.total)
+        i = bisect_right(self.acumulado, k) - 1
+        return self.inicios[i] + k - self.acumulado[i]
+
+
+# ===== Filas por bloque (corren en el pool: solo usan el contexto, nunca la base) =====
+
+_contexto = {}
+
+
+def _iniciar(contexto):
+    import django
+    django.setup()  # con "spawn" el proceso arranca sin Django
+    _contexto.clear()
+    _contexto.update(contexto)
+
+
+def _fecha(azar, ctx, dias):
+    """
+    (días atrás, "AAAA-MM-DD HH:MM:SS" en UTC) en horario de oficina, más
+    frecuente cuanto más reciente (el negocio crece).
+    """
+    d = int(dias * (1 - azar.random() ** 0.5))
+    s = int(8 * 3600 + azar.random() * 13 * 3600)
+    if d == 0 and s > ctx["segundos_hoy"]:
+        d = 1
+    return d, f"{ctx['fechas'][d + FUTURO]} {s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}"
+
+
+def _clientes(azar, ids, ctx):
+    filas, terminos, marca, uno = [], [], ctx["marca"], azar.uno
+    for pk in ids:
+        nombre, paterno, materno, dominio = uno(NOMBRES), uno(APELLIDOS), uno(APELLIDOS), uno(CORREOS)
+        lada = uno(LADAS)
+        telefono = lada + str(int(azar.random() * 10 ** (10 - len(lada)))).zfill(10 - len(lada))
+        direccion = f"{uno(CALLES)} {int(azar.random() * 999) + 1}, {uno(COLONIAS)}" if azar.random() < 0.7 else None
+        preferencias = uno(PREFERENCIAS) if azar.random() < 0.6 else None
+        # normalize() del email armado por partes: "maria garcia123 example com"
+        busqueda = " ".join(filter(None, (
+            f"{_norm(nombre)} {_norm(paterno)} {_norm(materno)}",
+            f"{_norm(nombre)} {_norm(paterno)}{pk} {_norm(dominio)}",
+            _norm(preferencias),
+        )))
+        filas.append((
+            pk, f"{nombre} {paterno} {materno}", f"{_norm(nombre)}.{_norm(paterno)}{pk}@{dominio}", telefono,
+            direccion, _fecha(azar, ctx, DIAS_HISTORIA * 1.5)[1], preferencias, busqueda, marca,
+        ))
+        terminos += _terminos("core.cliente", pk, busqueda)
+    return {Cliente: filas, TerminoBusqueda: terminos}
+
+
+def _productos(azar, ids, ctx):
+    filas, terminos, marca, uno = [], [], ctx["marca"], azar.uno
+    tipos = list(PRODUCTOS)
+    candidatos = {
+        tipo: [pk for t in PRODUCTOS[tipo][0] for pk in ctx["proveedores"].get(t, ())] or ctx["todos_proveedores"]
+        for tipo in tipos
+    }
+    for pk in ids:
+        tipo = uno(tipos)
+        _, plantillas, (minimo, maximo) = PRODUCTOS[tipo]
+        destino_id, ciudad = uno(ctx["destinos"])
+        nombre = uno(plantillas).format(ciudad)
+        busqueda = f"{_norm(nombre)} {_norm(tipo)}"
+        filas.append((
+            pk, nombre, tipo, f"{azar.randint(minimo, maximo)}.00", destino_id,
+            uno(candidatos[tipo]) if candidatos[tipo] else None, busqueda, marca,
+        ))
+        terminos += _terminos("core.producto", pk, busqueda)
+    return {Producto: filas, TerminoBusqueda: terminos}
+
+
+def _paquetes(azar, ids, ctx):
+    filas, terminos, productos, destinos, marca = [], [], [], [], ctx["marca"]
+    por_destino, todos, nombres = ctx["productos_por_destino"], ctx["productos"], ctx["nombres_destino"]
+    for pk in ids:
+        destino_id = azar.uno(ctx["destinos_con_productos"])
+        opciones = por_destino[destino_id]
+        elegidos = {p[0]: p for p in azar.sample(opciones, min(len(opciones), azar.randint(2, 4)))}
+        if azar.random() < 0.3:
+            # A veces un producto de otro destino (el vuelo de conexión, otra ciudad)
+            extra = azar.uno(todos)
+            elegidos[extra[0]] = extra
+        paquete_destinos = sorted({p[2] for p in elegidos.values() if p[2] is not None})
+        precio = sum(p[1] for p in elegidos.values()) * (0.85 + azar.random() * 0.2)
+        nombre = azar.uno(TEMAS).format(nombres[destino_id])
+        busqueda = _norm(nombre)
+        filas.append((
+            pk, nombre, f"{precio:.2f}", azar.random() < 0.9, busqueda,
+            ", ".join(sorted(nombres[d] for d in paquete_destinos)), 0, 0, 0, 0, 0, None, 0, marca,
+        ))
+        productos += [(pk, producto_id) for producto_id in elegidos]
+        destinos += [(pk, d) for d in paquete_destinos]
+        terminos += _terminos("core.paquete", pk, busqueda)
+    return {Paquete: filas, Paquete.productos.through: productos, PaqueteDestino: destinos, TerminoBusqueda: terminos}
+
+
+def _reservas(azar, ids, ctx):
+    filas, terminos, marca, fechas = [], [], ctx["marca"], ctx["fechas"]
+    clientes, paquetes, empleados, metodos = ctx["clientes"], ctx["paquetes"], ctx["empleados"], ctx["metodos"]
+    pasado, futuro = _acumulados(ESTADOS_PASADO), _acumulados(ESTADOS_FUTURO)
+    terminos_estado = {estado: _norm(estado) for estado, _ in (*ESTADOS_PASADO, *ESTADOS_FUTURO)}
+    uno, random = azar.uno, azar.random
+    for pk in ids:
+        paquete_id, precio = uno(paquetes)
+        dias, fecha = _fecha(azar, ctx, DIAS_HISTORIA)
+        # Anticipación de la compra: exponencial, media de ~40 días
+        viaje = dias - 3 - min(int(-40 * log(1.0 - random())), FUTURO - 3)
+        estado = azar.ponderado(*(pasado if viaje > 0 else futuro))
+        filas.append((
+            pk, fecha, f"{precio * (0.95 + random() * 0.1):.2f}", estado, clientes.elegir(azar),
+            uno(empleados), uno(metodos), paquete_id, fechas[viaje + FUTURO], terminos_estado[estado], marca,
+        ))
+        terminos.append(("core.reserva", pk, terminos_estado[estado]))
+    return {Reserva: filas, TerminoBusqueda: terminos}
+
+
+def _interacciones(azar, ids, ctx):
+    filas, terminos, marca = [], [], ctx["marca"]
+    tipos = _acumulados(TIPOS_INTERACCION)
+    for pk in ids:
+        tipo = azar.ponderado(*tipos)
+        notas = azar.uno(NOTAS[tipo])
+        busqueda = f"{_norm(tipo.value)} {_norm(notas)}"
+        filas.append((
+            pk, tipo.value, _fecha(azar, ctx, DIAS_HISTORIA)[1], notas, ctx["clientes"].elegir(azar),
+            azar.uno(ctx["empleados"]), busqueda, marca,
+        ))
+        terminos += _terminos("core.interaccion", pk, busqueda)
+    return {Interaccion: filas, TerminoBusqueda: terminos}
+
+
+def _comentarios(azar, ids, ctx):
+    filas, marca = [], ctx["marca"]
+    estrellas = _acumulados(CALIFICACIONES)
+    for pk in ids:
+        calificacion = azar.ponderado(*estrellas)
+        filas.append((
+            pk, azar.uno(COMENTARIOS[calificacion]), calificacion, _fecha(azar, ctx, DIAS_HISTORIA)[1],
+            azar.uno(ctx["empleados"]), azar.uno(ctx["paquetes"])[0], marca,
+        ))
+    return {Comentario: filas}
+
+
+# Columnas en el orden de las tuplas de cada generador
+COLUMNAS = {
+    Cliente: ("id", "nombre", "email", "telefono", "direccion", "fecha_registro", "preferencias", "busqueda", "actualizado_en"),
+    Producto: ("id", "nombre", "tipo", "precio_base", "destino_id", "proveedor_id", "busqueda", "actualizado_en"),
+    Paquete: (
+        "id", "nombre", "precio_final", "activo", "busqueda", "destinos_texto",
+        "rating_1", "rating_2", "rating_3", "rating_4", "rating_5", "rating_avg", "rating_count", "actualizado_en",
+    ),
+    Paquete.productos.through: ("paquete_id", "producto_id"),
+    PaqueteDestino: ("paquete_id", "destino_id"),
+    Reserva: (
+        "id", "fecha_reserva", "precio_venta", "estado", "cliente_id", "empleado_id", "metodo_pago_id",
+        "paquete_id", "fecha_viaje", "busqueda", "actualizado_en",
+    ),
+    Interaccion: ("id", "tipo", "fecha", "notas", "cliente_id", "empleado_id", "busqueda", "actualizado_en"),
+    Comentario: ("id", "texto", "calificacion", "creado_en", "autor_id", "paquete_id", "actualizado_en"),
+    TerminoBusqueda: ("modelo", "objeto_id", "termino"),
+}
+# Tablas que escribe cada generador
+TABLAS = {
+    "clientes": (Cliente, TerminoBusqueda),
+    "productos": (Producto, TerminoBusqueda),
+    "paquetes": (Paquete, Paquete.productos.through, PaqueteDestino, TerminoBusqueda),
+    "reservas": (Reserva, TerminoBusqueda),
+    "interacciones": (Interaccion, TerminoBusqueda),
+    "comentarios": (Comentario,),
+}
+# Tablas de relación sin fechas propias: van por bulk_create
+POR_BULK_CREATE = (Paquete.productos.through, PaqueteDestino)
+GENERADORES = {
+    "clientes": _clientes, "productos": _productos, "paquetes": _paquetes,
+    "reservas": _reservas, "interacciones": _interacciones, "comentarios": _comentarios,
+}
+
+
+def _bloque(tarea):
+    nombre, semilla, inicio, fin = tarea
+    azar = Azar(f"{semilla}:{nombre}:{inicio}")
+    return GENERADORES[nombre](azar, range(inicio, fin), _contexto)
+
+
+# ===== Escritura =====
+
+def _sql(model):
+    q = connection.ops.quote_name
+    columnas = COLUMNAS[model]
+    return (
+        f"INSERT INTO {q(model._meta.db_table)} ({', '.join(map(q, columnas))}) "
+        f"VALUES ({', '.join(['%s'] * len(columnas))})"
+    )
+
+
+@contextmanager
+def _carga_rapida():
+    """
+    SQLite: sin fsync por transacción ni comprobación de FKs (los ids salen de la
+    propia base) mientras dura la carga.
+    """
+    if connection.vendor != "sqlite":
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        previo = cursor.fetchone()[0]
+        cursor.execute("PRAGMA synchronous = OFF")
+    try:
+        with connection.constraint_checks_disabled():
+            yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA synchronous = {int(previo)}")
+
+
+@contextmanager
+def _indices_diferidos(models):
+    """
+    SQLite: quita los índices secundarios de las tablas de `models` y los vuelve a
+    crear al terminar; crear un índice de una vez (ordenando) es varias veces más
+    rápido que mantenerlo fila a fila. Va dentro de una transacción: si la carga
+    falla, los índices vuelven con el rollback.
+    """
+    if connection.vendor != "sqlite":
+        yield
+        return
+    tablas = [model._meta.db_table for model in models]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+            f"AND tbl_name IN ({', '.join(['%s'] * len(tablas))})",
+            tablas,
+        )
+        indices = cursor.fetchall()
+        for nombre, _ in indices:
+            cursor.execute(f"DROP INDEX {connection.ops.quote_name(nombre)}")
+        yield
+        for _, sql in indices:
+            cursor.execute(sql)
+
+
+def _generar(nombre, volumen, model, contexto, semilla, procesos, bloque, log, creadas):
+    """Crea las filas de `model` que faltan hasta `volumen`; suma a `creadas` lo escrito por tabla."""
+    existentes = model._default_manager.count()
+    faltan = max(volumen - existentes, 0)
+    if not faltan:
+        return
+    inicio = (model._default_manager.order_by("-pk").values_list("pk", flat=True).first() or 0) + 1
+    fin = inicio + faltan
+    tareas = [(nombre, semilla, a, min(a + bloque, fin)) for a in range(inicio, fin, bloque)]
+    pool = None
+    if procesos > 1 and len(tareas) > 1:
+        pool = Pool(min(procesos, len(tareas)), initializer=_iniciar, initargs=(contexto,))
+        bloques = pool.imap(_bloque, tareas)  # en orden: mismos ids con o sin pool
+    else:
+        _contexto.clear()
+        _contexto.update(contexto)
+        bloques = map(_bloque, tareas)
+    # Solo compensa reconstruir los índices si la carga es al menos tan grande como lo que ya hay
+    indices = _indices_diferidos(TABLAS[nombre]) if faltan >= existentes else nullcontext()
+    try:
+        with indices:
+            _escribir(nombre, model, bloques, faltan, log, creadas)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+
+def _escribir(nombre, model, bloques, faltan, log, creadas):
+    hechas = 0
+    with connection.cursor() as cursor:
+        for filas in bloques:
+            with transaction.atomic():
+                for destino, valores in filas.items():
+                    if destino in POR_BULK_CREATE:
+                        columnas = COLUMNAS[destino]
+                        destino.objects.bulk_create([destino(**dict(zip(columnas, fila))) for fila in valores])
+                    else:
+                        cursor.executemany(_sql(destino), valores)
+                    creadas[destino] = creadas.get(destino, 0) + len(valores)
+            hechas += len(filas[model])
+            if log:
+                log(f"{nombre}: {hechas}/{faltan}")
+
+
+def _usuarios(volumen, semilla, log, creadas):
+    if not Empleado.objects.filter(email=ADMIN_EMAIL).exists():
+        Empleado.objects.create_superuser(ADMIN_EMAIL, "Administrador", PASSWORD)
+    faltan = max(volumen - Empleado.objects.filter(is_superuser=False).count(), 0)
+    if faltan:
+        inicio = Empleado.objects.filter(is_superuser=False, email__endswith=f"@{DOMINIO}").count() + 1
+        rnd = random.Random(f"{semilla}:colaboradores:{inicio}")
+        clave = make_password(PASSWORD)  # un solo hash para todos: el hasher es lento a propósito
+        Empleado.objects.bulk_create([
+            Empleado(
+                email=f"colaborador{i}@{DOMINIO}", nombre=f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)}",
+                phone=f"55{rnd.randrange(10 ** 8):08d}", password=clave,
+            )
+            for i in range(inicio, inicio + faltan)
+        ])
+        creadas[Empleado] = faltan
+        if log:
+            log(f"colaboradores: {faltan}")
+    # Rol de colaborador (de los que se pueden armar en Roles): ver, crear y editar, sin colaboradores
+    grupo, _ = Group.objects.get_or_create(name=GRUPO_COLABORADOR)
+    grupo.permissions.set(
+        Permission.objects.filter(pk__in=perm_tab_ids(), codename__regex=r"^(view|add|change)_")
+        .exclude(codename__endswith="_empleado")
+    )
+    Empleado.groups.through.objects.bulk_create([
+        Empleado.groups.through(empleado_id=pk, group_id=grupo.pk)
+        for pk in Empleado.objects.filter(is_superuser=False, email__endswith=f"@{DOMINIO}").values_list("pk", flat=True)
+    ], ignore_conflicts=True)
+
+
+def _catalogos(volumenes, semilla, bloque, log, creadas):
+    """Destinos y proveedores: pocos y con claves únicas que dependen de lo que ya existe."""
+    if not MetodoPago.objects.exists():
+        MetodoPago.objects.bulk_create([MetodoPago(nombre=n) for n in METODOS_PAGO])
+        creadas[MetodoPago] = len(METODOS_PAGO)
+
+    faltan = max(volumenes["destinos"] - Destino.objects.count(), 0)
+    existentes = set(Destino.objects.values_list("nombre", "pais"))
+    destinos, i = [], 0
+    while len(destinos) < faltan:
+        ciudad, pais = CIUDADES[i % len(CIUDADES)]
+        vuelta = i // len(CIUDADES)
+        if vuelta:
+            # "Cancún Zona Hotelera", ... y con número cuando se acaban las zonas
+            ciudad = f"{ciudad} {ZONAS[(vuelta - 1) % len(ZONAS)]}" + (f" {vuelta}" if vuelta > len(ZONAS) else "")
+        i += 1
+        if (ciudad, pais) not in existentes:
+            existentes.add((ciudad, pais))
+            destinos.append(Destino(nombre=ciudad, pais=pais, descripcion=f"Viajes a {ciudad}, {pais}."))
+    Destino.objects.bulk_create(destinos, batch_size=bloque)
+    creadas[Destino] = len(destinos)
+
+    faltan = max(volumenes["proveedores"] - Proveedor.objects.count(), 0)
+    inicio = (Proveedor.objects.order_by("-pk").values_list("pk", flat=True).first() or 0) + 1
+    rnd = random.Random(f"{semilla}:proveedores:{inicio}")
+    proveedores = []
+    for n in range(inicio, inicio + faltan):
+        tipo = rnd.choice(list(PROVEEDORES))
+        nombre = f"{rnd.choice(PROVEEDORES[tipo])} {rnd.choice(MARCAS)}"
+        proveedores.append(Proveedor(
+            nombre=nombre, tipo=tipo, contacto=f"ventas{n}@{normalize(nombre).replace(' ', '')}.{DOMINIO}",
+        ))
+    Proveedor.objects.bulk_create(proveedores, batch_size=bloque)
+    creadas[Proveedor] = len(proveedores)
+    if log and (destinos or proveedores):
+        log(f"destinos: {len(destinos)}, proveedores: {len(proveedores)}")
+
+
+def sembrar(volumenes=None, semilla=0, procesos=1, bloque=BLOQUE, log=None):
+    """
+    Completa la base hasta `volumenes` (ver VOLUMENES). Devuelve {modelo: filas creadas}.
+    `bloque`: filas por tarea del pool y por transacción.
+    """
+    volumenes = {**VOLUMENES, **(volumenes or {})}
+    creadas = {}
+    ahora = timezone.now().astimezone(dt_timezone.utc).replace(tzinfo=None)  # como lo guarda la base
+    hoy = ahora.date()
+    ctx = {
+        "marca": str(ahora),
+        "segundos_hoy": ahora.hour * 3600 + ahora.minute * 60 + ahora.second,
+        # fechas[d + FUTURO]: ISO de hace d días (d < 0: futuro)
+        "fechas": [(hoy - timedelta(days=d)).isoformat() for d in range(-FUTURO, int(DIAS_HISTORIA * 1.5) + 2)],
+    }
+    with _carga_rapida():
+        _usuarios(volumenes["colaboradores"], semilla, log, creadas)
+        _catalogos(volumenes, semilla, bloque, log, creadas)
+
+        destinos = list(Destino.objects.order_by("pk").values_list("pk", "nombre"))
+        proveedores = {}
+        for pk, tipo in Proveedor.objects.order_by("pk").values_list("pk", "tipo"):
+            proveedores.setdefault(tipo, []).append(pk)
+        ctx.update(
+            destinos=destinos, proveedores=proveedores,
+            todos_proveedores=[pk for pks in proveedores.values() for pk in pks],
+        )
+        if destinos:
+            _generar("productos", volumenes["productos"], Producto, ctx, semilla, procesos, bloque, log, creadas)
+
+        productos = [
+            (pk, float(precio), destino)
+            for pk, precio, destino in Producto.objects.order_by("pk").values_list("pk", "precio_base", "destino_id")
+        ]
+        por_destino = {}
+        for producto in productos:
+            if producto[2] is not None:
+                por_destino.setdefault(producto[2], []).append(producto)
+        ctx.update(
+            productos=productos, productos_por_destino=por_destino, nombres_destino=dict(destinos),
+            destinos_con_productos=list(por_destino),
+        )
+        if por_destino:
+            _generar("paquetes", volumenes["paquetes"], Paquete, ctx, semilla, procesos, bloque, log, creadas)
+
+        ctx.update(
+            paquetes=[(pk, float(precio)) for pk, precio in Paquete.objects.order_by("pk").values_list("pk", "precio_final")],
+            empleados=list(Empleado.objects.order_by("pk").values_list("pk", flat=True)),
+            metodos=list(MetodoPago.objects.order_by("pk").values_list("pk", flat=True)),
+        )
+        _generar("clientes", volumenes["clientes"], Cliente, ctx, semilla, procesos, bloque, log, creadas)
+        ctx["clientes"] = Ids.de(Cliente)
+        if ctx["paquetes"] and len(ctx["clientes"]):
+            _generar("reservas", volumenes["reservas"], Reserva, ctx, semilla, procesos, bloque, log, creadas)
+        if len(ctx["clientes"]):
+            _generar("interacciones", volumenes["interacciones"], Interaccion, ctx, semilla, procesos, bloque, log, creadas)
+        if ctx["paquetes"]:
+            _generar("comentarios", volumenes["comentarios"], Comentario, ctx, semilla, procesos, bloque, log, creadas)
+
+    creadas = {model: n for model, n in creadas.items() if n}
+    if creadas:
+        _derivados(creadas, log)
+    return creadas
+
+
+def _derivados(creadas, log):
+    """Lo que las señales harían fila a fila: secuencias, marcas de cambio, cachés y agregados."""
+    if connection.vendor != "sqlite":
+        # Se insertaron ids explícitos: la secuencia debe seguir después del último
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), list(COLUMNAS)):
+                cursor.execute(sql)
+    modelos = [model for model in creadas if issubclass(model, SeguimientoModel)]
+    tocar(*modelos)
+    for model in modelos:
+        invalidar_listas(model)
+    if log:
+        log("recalculando calificaciones, indicadores y rollups")
+    if Comentario in creadas or Paquete in creadas:
+        rebuild_ratings()
+    recalcular_indicadores()
+    if Reserva in creadas:
+        reconstruir()
@@ -0,0 +1,178 @@
+# core/imagenes.py
+"""
+Variantes redimensionadas de Empleado.imagen y Empleado.cover.
+- Al guardar un empleado con una imagen nueva se encola (tras el commit) la generación
+  de sus variantes en un hilo de fondo; IMAGENES_EN_SEGUNDO_PLANO=False lo hace en línea.
+- Cada variante se guarda en WebP y JPEG con el hash del contenido en el nombre:
+  un archivo nunca cambia y se puede servir con caché inmutable.
+- Empleado.imagenes guarda por campo el original del que salieron y sus variantes;
+  si el original cambia y aún no hay variantes, las plantillas no las usan.
+- Para imágenes subidas antes: `manage.py generar_variantes`.
+"""
+import hashlib
+import io
+import logging
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# campo -> {variante: (ancho, alto)}; con alto se recorta al centro, sin alto se respeta la proporción
+VARIANTES = {
+    "imagen": {
+        "miniatura": (48, 48),
+        "avatar": (160, 160),
+    },
+    "cover": {
+        "cover_sm": (640, None),
+        "cover_md": (1280, None),
+        "cover_lg": (1920, None),
+    },
+}
+# (extensión, formato de Pillow, opciones de guardado); el primero es el preferido
+FORMATOS = (
+    ("webp", "WEBP", {"quality": 80, "method": 4}),
+    ("jpeg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+)
+CARPETA = "variantes"
+LARGO_HASH = 12
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _abrir(nombre):
+    with default_storage.open(nombre, "rb") as f:
+        imagen = Image.open(f)
+        imagen.load()
+    imagen = ImageOps.exif_transpose(imagen)  # las fotos de móvil vienen giradas por EXIF
+    if imagen.mode != "RGB":
+        fondo = Image.new("RGB", imagen.size, "white")
+        rgba = imagen.convert("RGBA")
+        fondo.paste(rgba, mask=rgba.getchannel("A"))
+        imagen = fondo
+    return imagen
+
+
+def _redimensionar(imagen, ancho, alto):
+    if alto:
+        return ImageOps.fit(imagen, (ancho, alto), Image.LANCZOS)
+    if imagen.width <= ancho:
+        return imagen  # nunca se amplía
+    return imagen.resize((ancho, round(imagen.height * ancho / imagen.width)), Image.LANCZOS)
+
+
+def _guardar(contenido, base, variante, extension):
+    """Guarda `contenido` con nombre por hash; si ya existe (mismo contenido) no lo repite."""
+    digest = hashlib.sha256(contenido).hexdigest()[:LARGO_HASH]
+    nombre = f"{base}.{variante}.{digest}.{extension}"
+    if not default_storage.exists(nombre):
+        nombre = default_storage.save(nombre, ContentFile(contenido))
+    return nombre
+
+
+def generar(campo, nombre):
+    """Genera las variantes de `nombre` (archivo del campo `campo`) y devuelve su descripción."""
+    original = _abrir(nombre)
+    carpeta, archivo = posixpath.split(nombre)
+    base = posixpath.join(carpeta, CARPETA, posixpath.splitext(archivo)[0])
+    variantes = {}
+    for variante, (ancho, alto) in VARIANTES[campo].items():
+        imagen = _redimensionar(original, ancho, alto)
+        datos = {"ancho": imagen.width, "alto": imagen.height}
+        for extension, formato, opciones in FORMATOS:
+            salida = io.BytesIO()
+            imagen.save(salida, formato, **opciones)
+            datos[extension] = _guardar(salida.getvalue(), base, variante, extension)
+        variantes[variante] = datos
+        if not alto and imagen is original:
+            break  # las variantes más anchas saldrían iguales
+    return {"origen": nombre, "variantes": variantes}
+
+
+def archivos(descripcion):
+    return [
+        datos[extension]
+        for datos in (descripcion or {}).get("variantes", {}).values()
+        for extension, _, _ in FORMATOS if extension in datos
+    ]
+
+
+def borrar(nombres):
+    for nombre in nombres:
+        try:
+            default_storage.delete(nombre)
+        except OSError:
+            logger.warning("No se pudo borrar la variante %s", nombre)
+
+
+def procesar(empleado_id, campo):
+    """Genera las variantes del archivo actual de `campo` y las guarda en Empleado.imagenes."""
+    from .models import Empleado
+
+    nombre = Empleado.objects.filter(pk=empleado_id).values_list(campo, flat=True).first() or None
+    descripcion = generar(campo, nombre) if nombre else None
+    with transaction.atomic():
+        empleado = Empleado.objects.select_for_update().filter(pk=empleado_id).first()
+        if empleado is None or (getattr(empleado, campo).name or None) != nombre:
+            # Lo borraron o cambió la imagen mientras tanto: la nueva ya está encolada
+            sobrantes = archivos(descripcion)
+        else:
+            imagenes = dict(empleado.imagenes or {})
+            anterior = imagenes.pop(campo, None)
+            if descripcion:
+                imagenes[campo] = descripcion
+            vigentes = set(archivos(descripcion))
+            sobrantes = [n for n in archivos(anterior) if n not in vigentes]
+            Empleado.objects.filter(pk=empleado_id).update(imagenes=imagenes)
+    transaction.on_commit(lambda: borrar(sobrantes))
+
+
+def _tarea(empleado_id, campo):
+    try:
+        procesar(empleado_id, campo)
+    except Exception:
+        logger.exception("Variantes de %s del empleado %s", campo, empleado_id)
+    finally:
+        connection.close()  # cada hilo abre su propia conexión
+
+
+def _ejecutor():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=getattr(settings, "IMAGENES_HILOS", 2), thread_name_prefix="imagenes"
+            )
+        return _pool
+
+
+def encolar(empleado_id, campo):
+    if getattr(settings, "IMAGENES_EN_SEGUNDO_PLANO", True):
+        _ejecutor().submit(_tarea, empleado_id, campo)
+    else:
+        procesar(empleado_id, campo)
+
+
+def pendientes(empleado):
+    """Campos cuya imagen actual aún no tiene variantes (o que ya no tienen imagen)."""
+    imagenes = empleado.imagenes or {}
+    return [
+        campo for campo in VARIANTES
+        if (getattr(empleado, campo).name or None) != imagenes.get(campo, {}).get("origen")
+    ]
+
+
+def variantes(empleado, campo):
+    """{variante: datos} de la imagen actual de `campo`, o {} si aún no se generaron."""
+    descripcion = (getattr(empleado, "imagenes", None) or {}).get(campo) or {}  # también AnonymousUser
+    if not descripcion or descripcion.get("origen") != getattr(empleado, campo).name:
+        return {}
+    return descripcion.get("variantes", {})
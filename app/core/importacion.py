@@ -0,0 +1,265 @@
+# core/importacion.py
+import csv
+import io
+import json
+from itertools import islice
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+
+from .forms import ClienteForm, ProductoForm, ReservaForm
+from .indicadores import recalcular_indicadores
+from .listas import invalidar_listas
+from .models import Cliente, Destino, Empleado, MetodoPago, Paquete, Producto, Proveedor, Reserva
+
+CHUNK_SIZE = 1000
+FORMATOS = ("csv", "jsonl")
+MAX_RECHAZOS_EN_MEMORIA = 100
+
+# Marca en los mapas de referencias: el valor coincide con varios objetos
+AMBIGUO = object()
+
+
+def detectar_formato(nombre):
+    return "jsonl" if nombre.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def leer_filas(archivo, formato):
+    """
+    Genera (número de línea, fila) sin cargar el archivo en memoria.
+    `fila` es un dict, o None si la línea no se puede leer.
+    """
+    if isinstance(archivo.read(0), bytes):
+        archivo = io.TextIOWrapper(archivo, encoding="utf-8-sig", newline="")
+    if formato == "jsonl":
+        for numero, linea in enumerate(archivo, start=1):
+            if not linea.strip():
+                continue
+            try:
+                fila = json.loads(linea)
+            except ValueError:
+                fila = None
+            yield numero, fila if isinstance(fila, dict) else None
+    else:
+        reader = csv.DictReader(archivo)
+        for fila in reader:
+            yield reader.line_num, fila
+
+
+class ReferenciaField(forms.Field):
+    """Resuelve una FK con el mapa del bloque en vez de una consulta por fila."""
+
+    def __init__(self, mapa, **kwargs):
+        self.mapa = mapa
+        super().__init__(**kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        obj = self.mapa.get(str(value).strip())
+        if obj is None:
+            raise ValidationError("No existe.", code="invalid_choice")
+        if obj is AMBIGUO:
+            raise ValidationError("Coincide con varios registros; usa el id.", code="invalid_choice")
+        return obj
+
+
+class Resultado:
+    def __init__(self, on_rechazo=None):
+        self.leidas = 0
+        self.creadas = 0
+        self.actualizadas = 0
+        self.rechazadas = 0
+        self.rechazos = []  # los primeros, para mostrarlos en el admin
+        self.on_rechazo = on_rechazo
+
+    def rechazar(self, numero, fila, errores):
+        self.rechazadas += 1
+        if len(self.rechazos) < MAX_RECHAZOS_EN_MEMORIA:
+            self.rechazos.append((numero, errores))
+        if self.on_rechazo:
+            self.on_rechazo(numero, fila, errores)
+
+
+class Importador:
+    """
+    Importa filas por bloques validando con el formulario de la UI.
+    - `referencias`: campo FK -> (modelo, campo natural). El archivo puede traer
+      el id o el valor natural (p. ej. el email del cliente); se resuelven con
+      una consulta por bloque.
+    - validate_unique() se omite: la unicidad se resuelve al guardar el bloque.
+    - `fechas_originales`: campos auto_now_add que el archivo puede traer como columna
+      opcional (la fecha de alta en el sistema de origen); si falta, queda la de hoy.
+    """
+    form_class = None
+    model = None
+    referencias = {}
+    fechas_originales = ()
+    afecta_indicadores = False
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        referencias = set(self.referencias)
+        fechas = self.fechas_originales
+
+        class ImportarForm(self.form_class):
+            mostrar_destinos = False
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                for campo in fechas:
+                    self.fields[campo] = forms.DateTimeField(required=False)
+
+            def validate_unique(self):
+                pass
+
+            def _get_validation_exclusions(self):
+                # Las FKs ya vienen resueltas de los mapas: sin SELECT de existencia por fila
+                return {*super()._get_validation_exclusions(), *referencias}
+
+        self.form = ImportarForm
+
+    def importar(self, filas, on_rechazo=None, on_bloque=None):
+        resultado = Resultado(on_rechazo)
+        filas = iter(filas)
+        while True:
+            bloque = list(islice(filas, self.chunk_size))
+            if not bloque:
+                return resultado
+            resultado.leidas += len(bloque)
+            self.procesar(bloque, resultado)
+            if on_bloque:
+                on_bloque(resultado)
+
+    def mapas(self, filas):
+        mapas = {}
+        for campo, (modelo, natural) in self.referencias.items():
+            valores = {str(f[campo]).strip() for f in filas if f.get(campo) not in (None, "")}
+            ids = [v for v in valores if v.isdigit()]
+            mapa, naturales = {}, {}
+            for obj in modelo.objects.filter(Q(pk__in=ids) | Q(**{f"{natural}__in": valores})):
+                mapa[str(obj.pk)] = obj
+                clave = str(getattr(obj, natural))
+                naturales[clave] = AMBIGUO if clave in naturales else obj
+            # El valor natural tiene prioridad sobre un id con el mismo texto
+            mapa.update((k, v) for k, v in naturales.items() if k in valores)
+            mapas[campo] = mapa
+        return mapas
+
+    def procesar(self, bloque, resultado):
+        mapas = self.mapas([fila for _numero, fila in bloque if fila])
+        validos = []
+        for numero, fila in bloque:
+            if fila is None:
+                resultado.rechazar(numero, fila, {"__all__": ["Fila ilegible."]})
+                continue
+            form = self.form(data=fila)
+            for campo, mapa in mapas.items():
+                original = form.fields[campo]
+                form.fields[campo] = ReferenciaField(mapa, required=original.required, label=original.label)
+            if form.is_valid():
+                obj = form.save(commit=False)
+                # auto_now_add no es editable: el form no la copia y bulk_create la pisa
+                obj._fechas = {c: form.cleaned_data[c] for c in self.fechas_originales if form.cleaned_data[c]}
+                validos.append((numero, fila, obj))
+            else:
+                resultado.rechazar(numero, fila, form.errors.get_json_data())
+        if not validos:
+            return
+        try:
+            with transaction.atomic():
+                guardados = self.guardar([obj for _numero, _fila, obj in validos], resultado)
+                self.fijar_fechas(guardados)
+        except DatabaseError as exc:
+            for numero, fila, _obj in validos:
+                resultado.rechazar(numero, fila, {"__all__": [str(exc)]})
+
+    def guardar(self, objs, resultado):
+        """Guarda el bloque y devuelve las instancias guardadas (con pk)."""
+        self.model.objects.bulk_create(objs, batch_size=self.chunk_size)
+        resultado.creadas += len(objs)
+        return objs
+
+    def fijar_fechas(self, objs):
+        """Escribe las fechas de `fechas_originales` que trae el archivo."""
+        for campo in self.fechas_originales:
+            con_fecha = [obj for obj in objs if campo in obj._fechas]
+            for obj in con_fecha:
+                setattr(obj, campo, obj._fechas[campo])
+            if con_fecha:
+                self.model.objects.bulk_update(con_fecha, [campo], batch_size=self.chunk_size)
+
+
+class ClienteImportador(Importador):
+    """Upsert por email: actualiza los clientes existentes y crea el resto."""
+    form_class = ClienteForm
+    model = Cliente
+    fechas_originales = ("fecha_registro",)
+    afecta_indicadores = True
+
+    def guardar(self, objs, resultado):
+        campos = list(self.form_class._meta.fields)
+        por_email = {obj.email: obj for obj in objs}  # la última fila con un email gana
+        existentes = Cliente.objects.in_bulk(list(por_email), field_name="email")
+        nuevos, cambiados = [], []
+        for email, obj in por_email.items():
+            actual = existentes.get(email)
+            if actual is None:
+                nuevos.append(obj)
+                continue
+            for campo in campos:
+                setattr(actual, campo, getattr(obj, campo))
+            actual._fechas = obj._fechas
+            cambiados.append(actual)
+        Cliente.objects.bulk_create(nuevos, batch_size=self.chunk_size)
+        if cambiados:
+            Cliente.objects.bulk_update(cambiados, campos, batch_size=self.chunk_size)
+        resultado.creadas += len(nuevos)
+        resultado.actualizadas += len(cambiados)
+        return nuevos + cambiados
+
+
+class ProductoImportador(Importador):
+    form_class = ProductoForm
+    model = Producto
+    referencias = {
+        "proveedor": (Proveedor, "nombre"),
+        "destino": (Destino, "nombre"),
+    }
+
+
+class ReservaImportador(Importador):
+    form_class = ReservaForm
+    model = Reserva
+    fechas_originales = ("fecha_reserva",)
+    afecta_indicadores = True
+    referencias = {
+        "cliente": (Cliente, "email"),
+        "paquete": (Paquete, "nombre"),
+        "empleado": (Empleado, "email"),
+        "metodo_pago": (MetodoPago, "nombre"),
+    }
+
+
+IMPORTADORES = {
+    "clientes": ClienteImportador,
+    "productos": ProductoImportador,
+    "reservas": ReservaImportador,
+}
+
+
+def importar(tipo, archivo, formato, chunk_size=CHUNK_SIZE, on_rechazo=None, on_bloque=None):
+    """
+    Importa `archivo` (CSV/JSONL, texto o binario) y devuelve un Resultado.
+    `on_bloque(resultado)` se llama tras cada bloque guardado (progreso).
+    """
+    importador = IMPORTADORES[tipo](chunk_size)
+    resultado = importador.importar(leer_filas(archivo, formato), on_rechazo, on_bloque)
+    # bulk_create/bulk_update no envían señales: los KPIs se reconcilian al final
+    if importador.afecta_indicadores and (resultado.creadas or resultado.actualizadas):
+        recalcular_indicadores()
+    if resultado.creadas or resultado.actualizadas:
+        invalidar_listas(importador.model)
+    return resultado
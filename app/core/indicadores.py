@@ -0,0 +1,98 @@
+# core/indicadores.py
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Cliente, Destino, Indicador, Paquete, Proveedor, Reserva
+
+# Contadores de filas: clave -> modelo
+CONTADOS = {
+    "clientes": Cliente,
+    "proveedores": Proveedor,
+    "destinos": Destino,
+    "paquetes": Paquete,
+}
+ESTADOS = [estado for estado, _label in Reserva.ESTADO_CHOICES]
+ESTADO_SIN_INGRESO = "Cancelada"
+
+
+def clave_ingresos(fecha):
+    return f"ingresos:{timezone.localtime(fecha):%Y-%m}"
+
+
+def adjust(clave, delta):
+    """Suma `delta` al indicador con un UPDATE atómico (crea la fila si falta)."""
+    if not delta:
+        return
+    if not Indicador.objects.filter(clave=clave).update(valor=F("valor") + delta):
+        Indicador.objects.get_or_create(clave=clave)
+        Indicador.objects.filter(clave=clave).update(valor=F("valor") + delta)
+
+
+def reserva_aportes(estado, precio_venta, fecha_reserva):
+    """Lo que suma una reserva a los indicadores: {clave: valor}."""
+    aportes = {f"reservas:{estado}": 1}
+    if estado != ESTADO_SIN_INGRESO and precio_venta and fecha_reserva:
+        aportes[clave_ingresos(fecha_reserva)] = Decimal(precio_venta)
+    return aportes
+
+
+def apply_reserva_change(old, new):
+    """`old` / `new`: (estado, precio_venta, fecha_reserva) o None si no existía / ya no existe."""
+    apply_reserva_changes([(old, new)])
+
+
+def apply_reserva_changes(cambios):
+    """Varios pares (old, new) con un UPDATE por indicador afectado (ediciones masivas)."""
+    deltas = {}
+    for old, new in cambios:
+        for valores, signo in ((old, -1), (new, 1)):
+            if valores:
+                for clave, valor in reserva_aportes(*valores).items():
+                    deltas[clave] = deltas.get(clave, 0) + signo * valor
+    with transaction.atomic():
+        for clave, delta in deltas.items():
+            adjust(clave, delta)
+
+
+def recalcular_indicadores():
+    """Reconstruye todos los indicadores desde las tablas (corrige updates/deletes masivos)."""
+    valores = {clave: model.objects.count() for clave, model in CONTADOS.items()}
+    valores.update({f"reservas:{estado}": 0 for estado in ESTADOS})
+    for row in Reserva.objects.values("estado").annotate(n=Count("id")).order_by():
+        valores[f"reservas:{row['estado']}"] = row["n"]
+    ingresos = (
+        Reserva.objects
+        .exclude(estado=ESTADO_SIN_INGRESO)
+        .annotate(mes=TruncMonth("fecha_reserva"))
+        .values("mes")
+        .annotate(total=Sum("precio_venta"))
+        .order_by()
+    )
+    for row in ingresos:
+        valores[f"ingresos:{row['mes']:%Y-%m}"] = row["total"] or 0
+
+    with transaction.atomic():
+        Indicador.objects.all().delete()
+        Indicador.objects.bulk_create([Indicador(clave=c, valor=v) for c, v in valores.items()])
+    return valores
+
+
+def snapshot(ventas=True):
+    """
+    Indicadores del dashboard con una sola lectura. Sin `ventas`, solo los contadores
+    del catálogo: reservas e ingresos son de toda la empresa.
+    """
+    claves = list(CONTADOS)
+    if ventas:
+        mes = clave_ingresos(timezone.now())
+        claves += [*(f"reservas:{estado}" for estado in ESTADOS), mes]
+    valores = dict(Indicador.objects.filter(clave__in=claves).values_list("clave", "valor"))
+    datos = {clave: int(valores.get(clave, 0)) for clave in CONTADOS}
+    if ventas:
+        datos["reservas"] = {estado: int(valores.get(f"reservas:{estado}", 0)) for estado in ESTADOS}
+        datos["ingresos_mes"] = valores.get(mes, Decimal("0"))
+    return datos
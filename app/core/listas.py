@@ -0,0 +1,50 @@
+# core/listas.py
+"""
+Caché del HTML de los listados de catálogo (bloque {% lista_cacheada %} de sus plantillas).
+La clave lleva la versión del listado, la huella de permisos del usuario y la query
+string (búsqueda y página): una visita repetida no consulta la base ni renderiza la tabla.
+Crear, editar o borrar algo que el listado muestra sube su versión (vistas y señales).
+"""
+import hashlib
+
+from django.db import transaction
+
+from .cache import bump_version, get_version
+
+TIMEOUT = 60 * 10
+# listado -> modelos cuyos datos muestra
+DEPENDENCIAS = {
+    "destino": ("destino",),
+    "proveedor": ("proveedor",),
+    "producto": ("producto", "proveedor", "destino"),
+    "metodopago": ("metodopago",),
+    "paquete": ("paquete", "producto", "comentario"),
+}
+
+
+def _version(lista):
+    return f"lista:{lista}"
+
+
+def listas_de(model):
+    """Listados que muestran datos de `model`."""
+    nombre = model._meta.model_name
+    return [lista for lista, modelos in DEPENDENCIAS.items() if nombre in modelos]
+
+
+def invalidar_listas(model):
+    """Sube la versión de los listados que dependen de `model` al confirmar la transacción."""
+    listas = listas_de(model)
+    if listas:
+        transaction.on_commit(lambda: [bump_version(_version(lista)) for lista in listas])
+
+
+def huella_permisos(user, perms):
+    """Qué permisos de `perms` tiene el usuario, p. ej. "101" (son los que cambian la tabla)."""
+    return "".join("1" if user.has_perm(p) else "0" for p in perms)
+
+
+def clave(lista, request, perms):
+    consulta = sorted((k, v) for k, valores in request.GET.lists() for v in valores)
+    resumen = hashlib.sha1(repr(consulta).encode()).hexdigest()[:16]
+    return f"lista:{lista}:{get_version(_version(lista))}:{huella_permisos(request.user, perms)}:{resumen}"
@@ -0,0 +1,111 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+
+from core import views
+from core.models import Empleado
+
+# Línea del plan de SQLite: "SCAN core_reserva" sin índice = recorrido completo de la tabla
+FULL_SCAN = re.compile(r"\bSCAN (\w+)(?! USING (?:COVERING )?INDEX)(?: |$)")
+TEMP_BTREE = re.compile(r"USE TEMP B-TREE FOR (.+)$")
+
+# (vista, parámetros GET, rol): combinaciones de filtros que usan los listados
+ESCENARIOS = [
+    (views.ReservaListView, {}, "admin"),
+    (views.ReservaListView, {}, "colaborador"),
+    (views.ReservaListView, {"fecha_tipo": "creada", "fecha_desde": "2024-01-01", "fecha_hasta": "2024-01-31"}, "admin"),
+    (views.ReservaListView, {"fecha_tipo": "creada", "fecha_desde": "2024-01-01"}, "colaborador"),
+    (views.ReservaListView, {"fecha_tipo": "viaje", "fecha_desde": "2024-01-01", "fecha_hasta": "2024-01-31"}, "admin"),
+    (views.ReservaListView, {"empleado": "1"}, "admin"),
+    (views.ReservaListView, {"destino": "1"}, "admin"),
+    (views.ReservaListView, {"q": "ana"}, "admin"),
+    (views.InteraccionListView, {}, "admin"),
+    (views.InteraccionListView, {"q": "llamada"}, "admin"),
+    (views.ClienteListView, {}, "admin"),
+    (views.ClienteListView, {"q": "ana"}, "admin"),
+    (views.PaqueteListView, {}, "admin"),
+    (views.PaqueteListView, {"q": "playa"}, "admin"),
+    (views.ProductoListView, {}, "admin"),
+    (views.ProveedorListView, {}, "admin"),
+    (views.DestinoListView, {}, "admin"),
+    (views.MetodoPagoListView, {}, "admin"),
+]
+
+
+def _usuario(rol):
+    # Sin guardar: solo se usa para el alcance por rol de get_queryset()
+    return Empleado(pk=1, email="analisis@local", is_superuser=(rol == "admin"))
+
+
+def _primera_pagina(view_class, params, rol):
+    """Queryset de la primera página tal como lo pagina la vista."""
+    request = RequestFactory().get("/", params)
+    request.user = _usuario(rol)
+    view = view_class()
+    view.setup(request)
+    qs = view.get_queryset()
+    ordering = getattr(view, "keyset_fields", None) or view.get_ordering()
+    if ordering:
+        qs = qs.order_by(*ordering)
+    return qs[: (view.get_paginate_by(qs) or 10) + 1]
+
+
+def analizar(plan, filtrada=True):
+    """
+    (problemas, avisos) de un EXPLAIN QUERY PLAN.
+    - Problema: recorrido completo de una tabla filtrada (sin WHERE, el LIMIT lo corta).
+    - Aviso: ordenación en B-tree temporal; barata si el filtro ya dejó pocas filas.
+    """
+    problemas, avisos = [], []
+    for linea in plan.splitlines():
+        if (m := FULL_SCAN.search(linea)) and filtrada:
+            problemas.append(f"SCAN {m.group(1)}")
+        if m := TEMP_BTREE.search(linea):
+            avisos.append(f"TEMP B-TREE {m.group(1)}")
+    return problemas, avisos
+
+
+class Command(BaseCommand):
+    help = (
+        "Ejecuta EXPLAIN QUERY PLAN sobre las consultas de los listados con sus combinaciones "
+        "de filtros y señala recorridos completos de tabla y ordenaciones en B-tree temporal"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--plan", action="store_true", help="Muestra el plan completo de cada consulta.")
+        parser.add_argument(
+            "--estricto", action="store_true", help="Termina con error si alguna consulta recorre una tabla completa."
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("El análisis solo interpreta planes de SQLite.")
+
+        con_problemas = con_avisos = 0
+        for view_class, params, rol in ESCENARIOS:
+            qs = _primera_pagina(view_class, params, rol)
+            plan = qs.explain()
+            problemas, avisos = analizar(plan, filtrada=bool(qs.query.where))
+            filtros = "&".join(f"{k}={v}" for k, v in params.items()) or "sin filtros"
+            titulo = f"{view_class.__name__} [{rol}] {filtros}"
+            if problemas:
+                con_problemas += 1
+                self.stdout.write(self.style.ERROR(f"!! {titulo}: {', '.join(problemas + avisos)}"))
+            elif avisos:
+                con_avisos += 1
+                self.stdout.write(self.style.WARNING(f"~~ {titulo}: {', '.join(avisos)}"))
+            else:
+                self.stdout.write(f"ok {titulo}")
+            if options["plan"] or (problemas or avisos) and options["verbosity"] > 1:
+                self.stdout.write(f"   {qs.query}")
+                for linea in plan.splitlines():
+                    self.stdout.write(f"   {linea}")
+
+        if con_problemas and options["estricto"]:
+            raise CommandError(f"{con_problemas} de {len(ESCENARIOS)} consultas con problemas.")
+        self.stdout.write(self.style.SUCCESS(
+            f"OK -> {len(ESCENARIOS)} consultas analizadas: {con_problemas} con recorridos completos, "
+            f"{con_avisos} con ordenación temporal."
+        ))
@@ -0,0 +1,198 @@
+import http.client
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from core.models import Paquete
+
+ESPERA_ARRANQUE = 30  # segundos para que el servidor acepte conexiones
+
+
+def _urls_por_defecto():
+    urls = [reverse("reservas:reserva_list"), reverse("clientes:cliente_list"), reverse("paquetes:paquete_list")]
+    paquete = Paquete.objects.order_by("pk").values_list("pk", flat=True).first()
+    if paquete:
+        urls.append(reverse("paquetes:paquete_detail", args=[paquete]))
+    return urls
+
+
+def _percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))] if valores else 0
+
+
+def _resumen(latencias, errores, segundos):
+    return {
+        "peticiones": len(latencias),
+        "errores": errores,
+        "rps": len(latencias) / segundos if segundos else 0,
+        "p50": _percentil(latencias, 0.50) * 1000,
+        "p99": _percentil(latencias, 0.99) * 1000,
+    }
+
+
+def _puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _pedir(puerto, url, cookie):
+    """GET con una conexión nueva (el worker síncrono de gunicorn no mantiene keep-alive)."""
+    conexion = http.client.HTTPConnection("127.0.0.1", puerto, timeout=60)
+    try:
+        conexion.request("GET", url, headers={"Cookie": cookie})
+        respuesta = conexion.getresponse()
+        respuesta.read()
+        return respuesta.status
+    finally:
+        conexion.close()
+
+
+def servidor(modo, puerto, workers):
+    """Línea de comandos del servidor real: gunicorn (worker síncrono) o uvicorn."""
+    if modo == "wsgi":
+        return [
+            sys.executable, "-m", "gunicorn", "core.servidor_benchmark:wsgi()",
+            "--bind", f"127.0.0.1:{puerto}", "--workers", str(workers), "--chdir", str(settings.BASE_DIR),
+            "--log-level", "warning",
+        ]
+    return [
+        sys.executable, "-m", "uvicorn", "core.servidor_benchmark:asgi", "--factory",
+        "--host", "127.0.0.1", "--port", str(puerto), "--workers", str(workers),
+        "--app-dir", str(settings.BASE_DIR), "--log-level", "warning", "--no-access-log",
+    ]
+
+
+def medir(puerto, cookie, urls, peticiones, concurrencia):
+    """`concurrencia` clientes, cada uno pide de nuevo al recibir su respuesta."""
+    latencias, errores = [], 0
+    cerrojo = threading.Lock()
+    siguiente = iter(range(peticiones))
+
+    def cliente():
+        nonlocal errores
+        while True:
+            with cerrojo:
+                i = next(siguiente, None)
+            if i is None:
+                return
+            t = time.perf_counter()
+            try:
+                ok = _pedir(puerto, urls[i % len(urls)], cookie) == 200
+            except OSError:
+                ok = False
+            with cerrojo:
+                latencias.append(time.perf_counter() - t)
+                errores += not ok
+
+    hilos = [threading.Thread(target=cliente) for _ in range(concurrencia)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return _resumen(latencias, errores, time.perf_counter() - inicio)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara peticiones/s y p99 de los listados y el detalle de paquete servidos por servidores "
+        "reales: gunicorn (worker síncrono, vistas síncronas) contra uvicorn (vistas async con "
+        "ASYNC_VIEWS=1). Ambos usan la base de estos settings; con --latencia-db se simula una "
+        "base remota dentro del servidor."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--peticiones", type=int, default=200)
+        parser.add_argument("--concurrencia", type=int, default=16, help="Clientes simultáneos.")
+        parser.add_argument("--workers", type=int, default=1, help="Procesos de cada servidor.")
+        parser.add_argument("--usuario", help="Email del usuario (por defecto, el primer superusuario).")
+        parser.add_argument("--url", action="append", dest="urls", help="Ruta a medir (repetible).")
+        parser.add_argument(
+            "--latencia-db", type=float, default=0,
+            help="Milisegundos añadidos a cada consulta (simula una base remota; SQLite local es ~0).",
+        )
+
+    def handle(self, *args, **options):
+        if options["peticiones"] < 1 or options["concurrencia"] < 1 or options["workers"] < 1:
+            raise CommandError("--peticiones, --concurrencia y --workers deben ser >= 1.")
+        for modulo in ("gunicorn", "uvicorn"):
+            if importlib.util.find_spec(modulo) is None:
+                raise CommandError(f"Falta {modulo}: pip install -r requirements.txt")
+
+        User = get_user_model()
+        if options["usuario"]:
+            usuario = User.objects.filter(email=options["usuario"]).first()
+        else:
+            usuario = User.objects.filter(is_superuser=True).order_by("pk").first()
+        if usuario is None:
+            raise CommandError("No hay usuario con el que iniciar sesión (usa --usuario).")
+        # Sesión guardada en la base: la aceptan los dos servidores
+        client = Client()
+        client.force_login(usuario)
+        cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+        urls = options["urls"] or _urls_por_defecto()
+
+        resultados = {}
+        for modo, async_views in (("wsgi", "0"), ("asgi", "1")):
+            entorno = {
+                **os.environ,
+                "ASYNC_VIEWS": async_views,
+                "BENCHMARK_LATENCIA_DB": str(options["latencia_db"]),
+                "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+                "PYTHONPATH": os.pathsep.join(filter(None, [str(settings.BASE_DIR), os.environ.get("PYTHONPATH")])),
+            }
+            r = resultados[modo] = self.medir_servidor(modo, entorno, cookie, urls, options)
+            self.stdout.write(
+                f"{modo:<5} {r['peticiones']:>5} peticiones  {r['errores']:>3} errores  "
+                f"{r['rps']:>7.1f} req/s  p50 {r['p50']:.1f} ms  p99 {r['p99']:.1f} ms"
+            )
+        if resultados["wsgi"]["rps"]:
+            self.stdout.write(self.style.SUCCESS(
+                f"OK -> ASGI x{resultados['asgi']['rps'] / resultados['wsgi']['rps']:.2f} req/s, "
+                f"p99 {resultados['wsgi']['p99']:.1f} -> {resultados['asgi']['p99']:.1f} ms."
+            ))
+
+    def medir_servidor(self, modo, entorno, cookie, urls, options):
+        puerto = _puerto_libre()
+        with tempfile.TemporaryFile() as errores:
+            proceso = subprocess.Popen(
+                servidor(modo, puerto, options["workers"]), env=entorno,
+                stdout=subprocess.DEVNULL, stderr=errores,
+            )
+            try:
+                self.esperar(proceso, puerto, modo, errores)
+                for url in urls:  # calentamiento: imports, plantillas y cachés de cada worker
+                    _pedir(puerto, url, cookie)
+                return medir(puerto, cookie, urls, options["peticiones"], options["concurrencia"])
+            finally:
+                proceso.terminate()
+                try:
+                    proceso.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    proceso.kill()
+
+    def esperar(self, proceso, puerto, modo, errores):
+        limite = time.monotonic() + ESPERA_ARRANQUE
+        while time.monotonic() < limite:
+            if proceso.poll() is not None:
+                errores.seek(0)
+                raise CommandError(f"El servidor {modo} terminó al arrancar:\n{errores.read().decode()}")
+            try:
+                socket.create_connection(("127.0.0.1", puerto), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"El servidor {modo} no aceptó conexiones en {ESPERA_ARRANQUE} s.")
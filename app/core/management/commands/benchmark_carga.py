@@ -0,0 +1,317 @@
+import json
+import resource
+import subprocess
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client, RequestFactory
+from django.test.utils import setup_test_environment
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+from django.views.generic.edit import DeleteView, ModelFormMixin
+
+from core import generador
+from core.models import Destino, Empleado
+
+# Rutas que no se miden: borran datos, cierran la sesión o solo encolan trabajos por POST
+EXCLUIDAS = ("delete", "logout", "ventas_refrescar")
+
+# Variantes de parámetros GET por ruta (por defecto, solo sin parámetros).
+# {destino}, {empleado}, {hace7}, {hace30} y {hoy} se rellenan con datos de la base.
+FILTROS_RESERVA = [
+    {},
+    {"q": "cliente 12"},
+    {"fecha_tipo": "creada", "fecha_desde": "{hace30}"},
+    {"fecha_tipo": "viaje", "fecha_desde": "{hace30}", "fecha_hasta": "{hoy}"},
+    {"destino": "{destino}"},
+    {"empleado": "{empleado}"},
+]
+VARIANTES = {
+    "clientes:cliente_list": [{}, {"q": "cliente 12"}, {"page": "2"}],
+    "paquetes:paquete_list": [{}, {"q": "paquete 1"}, {"page": "2"}],
+    "productos:producto_list": [{}, {"q": "producto 1"}, {"page": "2"}],
+    "proveedores:proveedor_list": [{}, {"page": "2"}],
+    "destinos:destino_list": [{}, {"page": "2"}],
+    "reservas:reserva_list": FILTROS_RESERVA,
+    "reservas:reserva_data": FILTROS_RESERVA,
+    "interacciones:interaccion_list": [{}, {"q": "seguimiento 1"}],
+    # Sin filtro descargaría la tabla completa en cada petición
+    "reservas:reserva_export": [{"fecha_tipo": "creada", "fecha_desde": "{hace7}"}],
+    "reportes:ventas": [{}, {"filas": "destino", "columnas": "periodo"}, {"grano": "dia", "estado": "Completada"}],
+}
+# Endpoints de DataTables: primera página y una más profunda ordenada por otra columna
+DATATABLES = [
+    {"start": "0", "length": "10"},
+    {"start": "100", "length": "50", "order[0][column]": "1", "order[0][dir]": "desc"},
+]
+# Rutas que además se miden con un colaborador (alcance por rol)
+COMO_COLABORADOR = ("reservas:reserva_list", "reservas:reserva_data", "reportes:ventas")
+
+
+def rutas(resolver=None, ns=None):
+    """[(nombre con namespace, patrón)] de todas las rutas con nombre dentro de un namespace."""
+    resultado = []
+    for patron in (resolver or get_resolver()).url_patterns:
+        if isinstance(patron, URLResolver):
+            if patron.namespace != "admin":
+                resultado += rutas(patron, patron.namespace or ns)
+        elif isinstance(patron, URLPattern) and patron.name and ns:
+            resultado.append((f"{ns}:{patron.name}", patron))
+    return resultado
+
+
+def _pk_intermedio(model):
+    """pk cercano a la mitad de la tabla, sin OFFSET."""
+    qs = model._default_manager.order_by("pk").values_list("pk", flat=True)
+    primero, ultimo = qs.first(), qs.last()
+    if primero is None:
+        return None
+    return qs.filter(pk__gte=(primero + ultimo) // 2).first()
+
+
+def _datos_formulario(view_class, obj, usuario):
+    """POST que reenvía los valores actuales del formulario de edición."""
+    request = RequestFactory().get("/")
+    request.user = usuario
+    view = view_class()
+    view.setup(request, pk=obj.pk)
+    view.object = obj
+    datos = {}
+    for campo in view.get_form():
+        valor = campo.value()
+        if valor is None or getattr(campo.field.widget, "input_type", "") == "file":
+            continue
+        if isinstance(valor, (list, tuple)):
+            datos[campo.html_name] = [str(v) for v in valor]
+        elif isinstance(valor, bool):
+            if valor:
+                datos[campo.html_name] = "on"
+        else:
+            datos[campo.html_name] = str(valor)
+    return datos
+
+
+def _percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))] if valores else 0
+
+
+def _rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KB
+
+
+def _commit():
+    try:
+        salida = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR, capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    return salida.stdout.strip() or None
+
+
+class Escenario:
+    __slots__ = ("nombre", "url", "metodo", "datos", "cliente", "esperado")
+
+    def __init__(self, nombre, url, cliente, metodo="GET", datos=None):
+        self.nombre, self.url, self.cliente, self.metodo, self.datos = nombre, url, cliente, metodo, datos
+        self.esperado = 302 if metodo == "POST" else 200
+
+    def medir(self, peticiones):
+        consultas = []
+
+        def contar(execute, sql, params, many, context):
+            consultas[-1] += 1
+            return execute(sql, params, many, context)
+
+        pedir = self.cliente.post if self.metodo == "POST" else self.cliente.get
+        latencias, errores = [], 0
+        with connection.execute_wrapper(contar):
+            for i in range(peticiones + 1):
+                consultas.append(0)
+                t = time.perf_counter()
+                response = pedir(self.url, self.datos)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+                segundos = time.perf_counter() - t
+                if i == 0:
+                    consultas.pop()  # calentamiento: no cuenta
+                    continue
+                latencias.append(segundos)
+                errores += response.status_code != self.esperado
+        return {
+            "nombre": self.nombre,
+            "url": self.url,
+            "metodo": self.metodo,
+            "peticiones": peticiones,
+            "errores": errores,
+            "p50_ms": round(_percentil(latencias, 0.50) * 1000, 2),
+            "p95_ms": round(_percentil(latencias, 0.95) * 1000, 2),
+            "p99_ms": round(_percentil(latencias, 0.99) * 1000, 2),
+            "consultas_media": round(sum(consultas) / len(consultas), 1),
+            "consultas_max": max(consultas),
+            "rss_pico_mb": round(_rss_mb(), 1),
+        }
+
+
+class Command(BaseCommand):
+    help = (
+        "Siembra una base aparte con volúmenes configurables y mide p50/p95/p99, consultas por "
+        "petición y memoria pico de cada listado, detalle, alta y edición; guarda el resultado en JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--db", default=str(Path(settings.BASE_DIR) / "benchmark.sqlite3"),
+            help="Base SQLite del benchmark (se reutiliza entre ejecuciones; nunca la del proyecto).",
+        )
+        for nombre, volumen in generador.VOLUMENES.items():
+            parser.add_argument(f"--{nombre}", type=int, default=volumen, help=f"Filas (por defecto {volumen}).")
+        parser.add_argument("--semilla", type=int, default=0)
+        parser.add_argument("--peticiones", type=int, default=20, help="Peticiones medidas por escenario.")
+        parser.add_argument("--filtro", help="Solo escenarios cuyo nombre contenga este texto.")
+        parser.add_argument("--salida", default="benchmark_carga.json", help="Archivo JSON de resultados.")
+        parser.add_argument("--comparar", help="JSON de una ejecución anterior con el que comparar.")
+        parser.add_argument(
+            "--umbral", type=float, default=20, help="%% de aumento del p95 que cuenta como regresión."
+        )
+        parser.add_argument("--estricto", action="store_true", help="Termina con error si hay regresiones.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("El benchmark crea su propia base SQLite.")
+        if options["peticiones"] < 1:
+            raise CommandError("--peticiones debe ser >= 1.")
+        db = Path(options["db"]).resolve()
+        if db == Path(settings.DATABASES["default"]["NAME"]).resolve():
+            raise CommandError("--db no puede ser la base del proyecto.")
+        previo = None
+        if options["comparar"]:
+            try:
+                previo = json.loads(Path(options["comparar"]).read_text())
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"No se pudo leer {options['comparar']}: {exc}")
+
+        self.preparar_base(db)
+        volumenes = {nombre: options[nombre] for nombre in generador.VOLUMENES}
+        inicio = time.perf_counter()
+        log = self.stdout.write if options["verbosity"] > 1 else None
+        creadas = generador.sembrar(volumenes, semilla=options["semilla"], log=log)
+        self.stdout.write(f"Base {db.name}: {sum(creadas.values())} filas nuevas en {time.perf_counter() - inicio:.1f} s")
+
+        escenarios = self.escenarios()
+        if options["filtro"]:
+            escenarios = [e for e in escenarios if options["filtro"] in e.nombre]
+        resultados = []
+        for escenario in escenarios:
+            r = escenario.medir(options["peticiones"])
+            resultados.append(r)
+            estilo = self.style.ERROR if r["errores"] else (lambda texto: texto)
+            self.stdout.write(estilo(
+                f"{r['nombre']:<55} p50 {r['p50_ms']:>8.1f}  p95 {r['p95_ms']:>8.1f}  p99 {r['p99_ms']:>8.1f} ms  "
+                f"{r['consultas_media']:>5} consultas  {r['rss_pico_mb']:>6.0f} MB"
+                + (f"  {r['errores']} errores" if r["errores"] else "")
+            ))
+
+        salida = {
+            "commit": _commit(),
+            "fecha": timezone.now().isoformat(timespec="seconds"),
+            "volumenes": volumenes,
+            "peticiones": options["peticiones"],
+            "rss_pico_mb": round(_rss_mb(), 1),
+            "escenarios": resultados,
+        }
+        Path(options["salida"]).write_text(json.dumps(salida, indent=2, ensure_ascii=False))
+
+        regresiones = self.comparar(previo, resultados, options["umbral"]) if previo else 0
+        if regresiones and options["estricto"]:
+            raise CommandError(f"{regresiones} escenarios con el p95 más de {options['umbral']:.0f}% peor.")
+        errores = sum(r["errores"] for r in resultados)
+        self.stdout.write(self.style.SUCCESS(
+            f"OK -> {len(resultados)} escenarios ({errores} respuestas inesperadas) en {options['salida']}."
+        ))
+
+    def preparar_base(self, db):
+        """Apunta `default` (y sus espejos) a `db` y la migra, como hace el runner de pruebas."""
+        setup_test_environment()  # host "testserver" y response.context del cliente de pruebas
+        connection.settings_dict.setdefault("TEST", {})["NAME"] = str(db)
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=True, serialize=False)
+        for alias in connections:
+            if connections[alias].settings_dict.get("TEST", {}).get("MIRROR") == "default":
+                connections[alias].creation.set_as_test_mirror(connection.settings_dict)
+
+    def escenarios(self):
+        admin = Empleado.objects.get(email=generador.ADMIN_EMAIL)
+        colaborador = Empleado.objects.get(email=generador.COLABORADOR_EMAIL)
+        clientes = {"admin": Client(), "colaborador": Client()}
+        clientes["admin"].force_login(admin)
+        clientes["colaborador"].force_login(colaborador)
+        hoy = timezone.localdate()
+        valores = {
+            "destino": Destino.objects.order_by("pk").values_list("pk", flat=True).first(),
+            "empleado": colaborador.pk,
+            "hoy": hoy.isoformat(),
+            "hace7": (hoy - timedelta(days=7)).isoformat(),
+            "hace30": (hoy - timedelta(days=30)).isoformat(),
+        }
+
+        escenarios = [Escenario("home", reverse("home"), clientes["admin"])]
+        for nombre, patron in rutas():
+            view_class = getattr(patron.callback, "view_class", None)
+            if view_class is None or any(excluida in nombre for excluida in EXCLUIDAS) or issubclass(view_class, DeleteView):
+                continue
+            obj = None
+            if "pk" in patron.pattern.converters:
+                model = getattr(view_class, "model", None)
+                pk = _pk_intermedio(model) if model else None
+                if pk is None:
+                    continue
+                obj = model._default_manager.get(pk=pk)
+                url = reverse(nombre, kwargs={"pk": pk})
+            else:
+                url = reverse(nombre)
+
+            if nombre.endswith("_data"):
+                variantes = DATATABLES + [{**DATATABLES[0], **f} for f in VARIANTES.get(nombre, []) if f]
+            else:
+                variantes = VARIANTES.get(nombre, [{}])
+            roles = ("admin", "colaborador") if nombre in COMO_COLABORADOR else ("admin",)
+            for rol in roles:
+                for params in variantes:
+                    params = {k: v.format(**valores) for k, v in params.items()}
+                    etiqueta = "&".join(f"{k}={v}" for k, v in params.items())
+                    titulo = nombre + (f" [{rol}]" if rol != "admin" else "") + (f" ?{etiqueta}" if etiqueta else "")
+                    escenarios.append(Escenario(titulo, url, clientes[rol], datos=params))
+
+            if obj is not None and issubclass(view_class, ModelFormMixin):
+                escenarios.append(Escenario(
+                    f"{nombre} POST", url, clientes["admin"], "POST", _datos_formulario(view_class, obj, admin)
+                ))
+        return escenarios
+
+    def comparar(self, previo, resultados, umbral):
+        """Imprime la variación del p95 frente a `previo`; devuelve cuántos escenarios empeoraron."""
+        anteriores = {r["nombre"]: r for r in previo.get("escenarios", [])}
+        self.stdout.write(f"Comparación con {previo.get('commit') or 'la ejecución anterior'}:")
+        regresiones = 0
+        for r in resultados:
+            antes = anteriores.get(r["nombre"])
+            if not antes or not antes["p95_ms"]:
+                continue
+            cambio = (r["p95_ms"] - antes["p95_ms"]) / antes["p95_ms"] * 100
+            linea = (
+                f"{r['nombre']:<55} p95 {antes['p95_ms']:>8.1f} -> {r['p95_ms']:>8.1f} ms ({cambio:+.0f}%)  "
+                f"consultas {antes['consultas_media']} -> {r['consultas_media']}"
+            )
+            if cambio > umbral:
+                regresiones += 1
+                self.stdout.write(self.style.ERROR(linea))
+            elif cambio < -umbral:
+                self.stdout.write(self.style.SUCCESS(linea))
+            else:
+                self.stdout.write(linea)
+        return regresiones
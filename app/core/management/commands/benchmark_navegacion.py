@@ -0,0 +1,69 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from core.templatetags.navegacion import nav_cache_key, seccion
+
+# Solo el layout: lo que base.html añade a cualquier página
+LAYOUT = '{% extends "base.html" %}'
+
+
+def _medir(plantilla, request, iteraciones, antes=None):
+    tiempos = []
+    for _ in range(iteraciones):
+        if antes:
+            antes()
+        inicio = time.perf_counter()
+        plantilla.render({}, request)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+
+class Command(BaseCommand):
+    help = "Mide el render de base.html con el menú de navegación en caché y sin él, por página"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iteraciones", type=int, default=300)
+        parser.add_argument("--usuario", help="Email del usuario (por defecto, el primer superusuario).")
+        parser.add_argument("--url", action="append", dest="urls", help="Ruta a medir (repetible).")
+
+    def handle(self, *args, **options):
+        if options["iteraciones"] < 1:
+            raise CommandError("--iteraciones debe ser >= 1.")
+        User = get_user_model()
+        if options["usuario"]:
+            usuario = User.objects.filter(email=options["usuario"]).first()
+        else:
+            usuario = User.objects.filter(is_superuser=True).order_by("pk").first()
+        if usuario is None:
+            raise CommandError("No hay usuario con el que renderizar (usa --usuario).")
+        urls = options["urls"] or [
+            reverse("home"), reverse("reservas:reserva_list"), reverse("paquetes:paquete_list"),
+            reverse("clientes:cliente_list"),
+        ]
+
+        plantilla = engines["django"].from_string(LAYOUT)
+        ahorro = []
+        for url in urls:
+            request = RequestFactory().get(url)
+            request.resolver_match = resolve(url)
+            request.user = usuario
+            key = nav_cache_key(usuario, *seccion(request))
+            plantilla.render({}, request)  # calienta plantillas y permisos
+
+            sin_cache = _medir(plantilla, request, options["iteraciones"], antes=lambda: cache.delete(key))
+            con_cache = _medir(plantilla, request, options["iteraciones"])
+            ahorro.append(sin_cache - con_cache)
+            self.stdout.write(
+                f"{url:<28} sin caché {sin_cache:6.3f} ms  con caché {con_cache:6.3f} ms  "
+                f"ahorro {sin_cache - con_cache:6.3f} ms (x{sin_cache / con_cache:.1f})"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"OK -> {statistics.mean(ahorro):.3f} ms ahorrados por página (mediana de {options['iteraciones']} renders)."
+        ))
@@ -0,0 +1,125 @@
+import multiprocessing
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.db.backends.sqlite3.base import BEGIN_RETRIES, PRAGMAS, aplicar_pragmas, begin_immediate, es_bloqueo
+
+# Configuración de cada perfil: lo que hace Django por defecto frente al backend de producción
+PERFILES = {
+    "base": {"timeout": 5, "pragmas": {}, "immediate": False},
+    "produccion": {"timeout": 20, "pragmas": PRAGMAS, "immediate": True},
+}
+
+ESQUEMA = """
+CREATE TABLE venta (id INTEGER PRIMARY KEY, empleado_id INTEGER, precio_venta REAL, estado TEXT, creada TEXT);
+CREATE INDEX venta_empleado ON venta (empleado_id);
+CREATE TABLE indicador (clave TEXT PRIMARY KEY, valor REAL NOT NULL DEFAULT 0);
+INSERT INTO indicador (clave, valor) VALUES ('reservas', 0), ('ingresos', 0);
+"""
+
+
+def _trabajador(ruta, perfil, empleado_id, transacciones, barrera, cola):
+    """Un agente de ventas: lee, inserta la reserva y actualiza los contadores, como ReservaCreateView."""
+    config = PERFILES[perfil]
+    conn = sqlite3.connect(ruta, timeout=config["timeout"], isolation_level=None)
+    aplicar_pragmas(conn, config["pragmas"])
+    ok, errores, latencias = 0, 0, []
+    barrera.wait()  # todos empiezan a la vez: la contención es la que se mide
+    comienzo = time.time()
+    for i in range(transacciones):
+        inicio = time.perf_counter()
+        try:
+            if config["immediate"]:
+                begin_immediate(conn.execute, BEGIN_RETRIES)
+            else:
+                conn.execute("BEGIN")
+            conn.execute("SELECT COUNT(*) FROM venta WHERE empleado_id = ?", [empleado_id]).fetchone()
+            conn.execute(
+                "INSERT INTO venta (empleado_id, precio_venta, estado, creada) VALUES (?, ?, 'Pendiente', datetime('now'))",
+                [empleado_id, 100 + i],
+            )
+            conn.execute("UPDATE indicador SET valor = valor + 1 WHERE clave = 'reservas'")
+            conn.execute("UPDATE indicador SET valor = valor + ? WHERE clave = 'ingresos'", [100 + i])
+            conn.execute("COMMIT")
+            ok += 1
+            latencias.append(time.perf_counter() - inicio)
+        except sqlite3.OperationalError as exc:
+            if not es_bloqueo(exc):
+                raise
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            errores += 1
+    conn.close()
+    cola.put((ok, errores, latencias, comienzo, time.time()))
+
+
+def medir(perfil, directorio, procesos, transacciones):
+    ruta = str(Path(directorio) / f"benchmark-{perfil}.sqlite3")
+    conn = sqlite3.connect(ruta)
+    aplicar_pragmas(conn, PERFILES[perfil]["pragmas"])  # journal_mode=WAL persiste en el archivo
+    conn.executescript(ESQUEMA)
+    conn.close()
+
+    contexto = multiprocessing.get_context("spawn")
+    barrera, cola = contexto.Barrier(procesos), contexto.Queue()
+    trabajadores = [
+        contexto.Process(target=_trabajador, args=(ruta, perfil, n, transacciones, barrera, cola))
+        for n in range(procesos)
+    ]
+    for proceso in trabajadores:
+        proceso.start()
+    resultados = [cola.get() for _proceso in trabajadores]
+    for proceso in trabajadores:
+        proceso.join()
+    segundos = max(r[4] for r in resultados) - min(r[3] for r in resultados)
+
+    ok = sum(r[0] for r in resultados)
+    errores = sum(r[1] for r in resultados)
+    latencias = sorted(l for r in resultados for l in r[2]) or [0]
+    return {
+        "ok": ok,
+        "errores": errores,
+        "tps": ok / segundos if segundos else 0,
+        "p50": statistics.median(latencias) * 1000,
+        "p95": latencias[int(len(latencias) * 0.95) - 1 if len(latencias) > 1 else 0] * 1000,
+        "segundos": segundos,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el rendimiento de escritura concurrente en SQLite con la configuración por defecto "
+        "y con el perfil de producción (varios procesos guardando reservas a la vez)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--procesos", type=int, default=8, help="Escritores concurrentes.")
+        parser.add_argument("--transacciones", type=int, default=200, help="Transacciones por proceso.")
+        parser.add_argument("--perfil", choices=[*PERFILES, "ambos"], default="ambos")
+        parser.add_argument("--dir", help="Directorio para las bases de prueba (por defecto, uno temporal).")
+
+    def handle(self, *args, **options):
+        if options["procesos"] < 1 or options["transacciones"] < 1:
+            raise CommandError("--procesos y --transacciones deben ser >= 1.")
+        perfiles = list(PERFILES) if options["perfil"] == "ambos" else [options["perfil"]]
+
+        with tempfile.TemporaryDirectory(dir=options["dir"]) as directorio:
+            resultados = {}
+            for perfil in perfiles:
+                r = medir(perfil, directorio, options["procesos"], options["transacciones"])
+                resultados[perfil] = r
+                self.stdout.write(
+                    f"{perfil:<11} {r['ok']:>6} ok  {r['errores']:>5} bloqueos  {r['tps']:>8.0f} tx/s  "
+                    f"p50 {r['p50']:.2f} ms  p95 {r['p95']:.2f} ms  ({r['segundos']:.2f} s)"
+                )
+
+        if len(resultados) == 2 and resultados["base"]["tps"]:
+            mejora = resultados["produccion"]["tps"] / resultados["base"]["tps"]
+            self.stdout.write(self.style.SUCCESS(f"OK -> producción x{mejora:.1f} transacciones confirmadas por segundo."))
+        else:
+            self.stdout.write(self.style.SUCCESS("OK -> benchmark terminado."))
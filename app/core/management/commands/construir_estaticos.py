@@ -0,0 +1,89 @@
+import gzip
+import urllib.request
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from core import estaticos
+
+
+class Command(BaseCommand):
+    help = (
+        "Descarga a static/vendor las librerías que falten, arma un bundle CSS/JS por layout "
+        "(core/estaticos.BUNDLES) y ejecuta collectstatic"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--descargar", action="store_true", help="Vuelve a descargar aunque ya estén.")
+        parser.add_argument("--sin-collectstatic", action="store_true", help="Solo descarga y arma los bundles.")
+        parser.add_argument("--timeout", type=int, default=30, help="Segundos por descarga.")
+
+    def _descargar(self, rutas, timeout):
+        fallidas = []
+        for ruta in rutas:
+            url = estaticos.VENDOR[ruta]
+            try:
+                with urllib.request.urlopen(url, timeout=timeout) as respuesta:
+                    datos = respuesta.read()
+            except OSError as e:
+                fallidas.append(f"{ruta} <- {url}: {e}")
+                continue
+            destino = estaticos.origen() / ruta
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            destino.write_bytes(datos)
+            self.stdout.write(f"  {ruta} ({len(datos) // 1024} KB)")
+        if fallidas:
+            raise CommandError(
+                "No se pudieron descargar (cópialas a mano en static/ o reintenta):\n" + "\n".join(fallidas)
+            )
+
+    def handle(self, *args, **options):
+        rutas = [
+            ruta for ruta in estaticos.VENDOR
+            if options["descargar"] or not (estaticos.origen() / ruta).is_file()
+        ]
+        if rutas:
+            self.stdout.write(f"Descargando {len(rutas)} archivos a static/vendor...")
+            self._descargar(rutas, options["timeout"])
+
+        # Sin sourceMappingURL, también en las copiadas a mano: los .map no se copian
+        for ruta in estaticos.VENDOR:
+            archivo = estaticos.origen() / ruta
+            if ruta.endswith((".css", ".js")) and archivo.is_file():
+                texto = archivo.read_text(encoding="utf-8")
+                limpio = estaticos.sin_source_map(texto)
+                if limpio != texto:
+                    archivo.write_text(limpio, encoding="utf-8")
+
+        carpeta = estaticos.origen() / estaticos.CARPETA_BUNDLES
+        carpeta.mkdir(exist_ok=True)
+        bundles = 0
+        for layout, tipos in estaticos.BUNDLES.items():
+            for tipo in tipos:
+                try:
+                    texto = estaticos.armar(layout, tipo).encode("utf-8")
+                except ValueError as e:
+                    raise CommandError(str(e))
+                (estaticos.origen() / estaticos.ruta_bundle(layout, tipo)).write_bytes(texto)
+                bundles += 1
+                self.stdout.write(
+                    f"  {estaticos.ruta_bundle(layout, tipo)}: {len(texto) // 1024} KB "
+                    f"({len(gzip.compress(texto, 9)) // 1024} KB gzip)"
+                )
+
+        if not options["sin_collectstatic"]:
+            if not isinstance(staticfiles_storage, estaticos.ManifestComprimido):
+                self.stdout.write(self.style.WARNING(
+                    "Sin ESTATICOS_COMPILADOS=1 collectstatic no pone hash ni deja copias .gz/.br."
+                ))
+            call_command("collectstatic", interactive=False, verbosity=options["verbosity"])
+            if estaticos.brotli is None:
+                self.stdout.write(self.style.WARNING("Sin el paquete brotli solo se generaron copias .gz."))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"OK -> {bundles} bundles en static/{estaticos.CARPETA_BUNDLES}"
+            + ("" if options["sin_collectstatic"] else f" y estáticos en {settings.STATIC_ROOT}")
+            + "."
+        ))
@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import generador
+from core.models import TerminoBusqueda
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera datos sintéticos verosímiles (clientes, catálogo, paquetes, reservas, interacciones, "
+        "comentarios) hasta los volúmenes indicados; solo crea lo que falta"
+    )
+
+    def add_arguments(self, parser):
+        for nombre, volumen in generador.VOLUMENES.items():
+            parser.add_argument(f"--{nombre}", type=int, default=volumen, help=f"Filas (por defecto {volumen}).")
+        parser.add_argument("--semilla", type=int, default=0, help="Misma semilla y misma base: mismos datos.")
+        parser.add_argument(
+            "--procesos", type=int, default=1, help="Procesos que arman las filas (la escritura es una sola)."
+        )
+        parser.add_argument("--lote", type=int, default=generador.BLOQUE, help="Filas por bloque y transacción.")
+
+    def handle(self, *args, **options):
+        if options["procesos"] < 1 or options["lote"] < 1:
+            raise CommandError("--procesos y --lote deben ser >= 1.")
+        if any(options[nombre] < 0 for nombre in generador.VOLUMENES):
+            raise CommandError("Los volúmenes no pueden ser negativos.")
+
+        inicio = time.perf_counter()
+
+        def log(mensaje):
+            self.stdout.write(f"[{time.perf_counter() - inicio:7.1f} s] {mensaje}")
+
+        creadas = generador.sembrar(
+            {nombre: options[nombre] for nombre in generador.VOLUMENES},
+            semilla=options["semilla"],
+            procesos=options["procesos"],
+            bloque=options["lote"],
+            log=log if options["verbosity"] > 1 else None,
+        )
+        segundos = time.perf_counter() - inicio
+
+        # Los términos de búsqueda son índice derivado: no cuentan en el ritmo de filas
+        terminos = creadas.pop(TerminoBusqueda, 0)
+        for model, n in creadas.items():
+            self.stdout.write(f"  {model._meta.verbose_name_plural}: {n}")
+        filas = sum(creadas.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"OK -> {filas} filas en {segundos:.1f} s ({filas / segundos if segundos else 0:,.0f} filas/s), "
+            f"más {terminos} términos de búsqueda derivados."
+        ))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from PIL import UnidentifiedImageError
+
+from core import imagenes
+from core.models import Empleado
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera (en línea) las variantes redimensionadas de Empleado.imagen y Empleado.cover "
+        "que falten, p. ej. para imágenes subidas antes de core/imagenes.py"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--todas", action="store_true",
+            help="Regenera también las que ya tienen variantes (p. ej. tras cambiar VARIANTES o FORMATOS).",
+        )
+
+    def handle(self, *args, **options):
+        con_imagen = Q()
+        for campo in imagenes.VARIANTES:
+            con_imagen |= Q(**{f"{campo}__gt": ""})
+        empleados = Empleado.objects.filter(con_imagen | ~Q(imagenes={})).only(
+            "pk", "imagenes", *imagenes.VARIANTES
+        )
+
+        hechas, fallidas = 0, []
+        for empleado in empleados.iterator():
+            campos = list(imagenes.VARIANTES) if options["todas"] else imagenes.pendientes(empleado)
+            for campo in campos:
+                try:
+                    imagenes.procesar(empleado.pk, campo)
+                except (OSError, UnidentifiedImageError) as e:
+                    fallidas.append(f"{empleado.pk}.{campo}: {e}")
+                    continue
+                hechas += 1
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"  {empleado.pk}.{campo}")
+
+        for error in fallidas:
+            self.stderr.write(error)
+        if fallidas and not hechas:
+            raise CommandError(f"No se pudo procesar ninguna imagen ({len(fallidas)} errores).")
+        self.stdout.write(self.style.SUCCESS(
+            f"OK -> {hechas} imágenes con variantes, {len(fallidas)} con errores."
+        ))
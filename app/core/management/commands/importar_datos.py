@@ -0,0 +1,47 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importacion import CHUNK_SIZE, FORMATOS, IMPORTADORES, detectar_formato, importar
+
+
+class Command(BaseCommand):
+    help = "Importa clientes, productos o reservas desde un CSV/JSONL de cualquier tamaño (por bloques)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("tipo", choices=sorted(IMPORTADORES))
+        parser.add_argument("archivo")
+        parser.add_argument("--formato", choices=FORMATOS, help="Por defecto, según la extensión del archivo.")
+        parser.add_argument("--lote", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--rechazos", help="CSV donde escribir las filas rechazadas y sus errores.")
+
+    def handle(self, *args, **options):
+        formato = options["formato"] or detectar_formato(options["archivo"])
+        salida = writer = None
+        if options["rechazos"]:
+            salida = open(options["rechazos"], "w", newline="", encoding="utf-8")
+            writer = csv.writer(salida)
+            writer.writerow(["linea", "errores", "fila"])
+
+        def on_rechazo(numero, fila, errores):
+            if writer:
+                writer.writerow([numero, json.dumps(errores, ensure_ascii=False), json.dumps(fila, ensure_ascii=False)])
+
+        try:
+            with open(options["archivo"], "rb") as archivo:
+                resultado = importar(
+                    options["tipo"], archivo, formato, chunk_size=options["lote"], on_rechazo=on_rechazo
+                )
+        except OSError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if salida:
+                salida.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"OK -> {resultado.leidas} filas: {resultado.creadas} creadas, "
+            f"{resultado.actualizadas} actualizadas, {resultado.rechazadas} rechazadas."
+        ))
+        for numero, errores in resultado.rechazos[:10]:
+            self.stdout.write(self.style.WARNING(f"  línea {numero}: {json.dumps(errores, ensure_ascii=False)}"))
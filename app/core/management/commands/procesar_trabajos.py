@@ -0,0 +1,98 @@
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, close_old_connections, connections
+
+from core import trabajos
+
+CADA_MANTENIMIENTO = 60  # segundos entre búsquedas de colgados y purgas de trabajos viejos
+
+
+class Command(BaseCommand):
+    help = (
+        "Trabajador de la cola de core/trabajos.py: toma trabajos pendientes y los ejecuta "
+        "respetando la concurrencia por tipo. Se detiene limpio con SIGTERM/Ctrl+C."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hilos", type=int, default=2, help="Trabajos a la vez en este proceso.")
+        parser.add_argument("--intervalo", type=float, default=2.0, help="Segundos de espera si la cola está vacía.")
+        parser.add_argument("--una-vez", action="store_true", help="Procesa lo pendiente y termina.")
+        parser.add_argument(
+            "--tipo", action="append", choices=sorted(trabajos.TIPOS),
+            help="Solo estos tipos (repetible); por defecto todos.",
+        )
+
+    def handle(self, *args, **options):
+        if options["hilos"] < 1:
+            raise CommandError("--hilos debe ser al menos 1.")
+        self.detener = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda *_: self.detener.set())
+            signal.signal(signal.SIGINT, lambda *_: self.detener.set())
+
+        self._mantenimiento(options["verbosity"])
+
+        prefijo = f"{socket.gethostname()}:{os.getpid()}"
+        self.hechos, self.fallidos = 0, 0
+        self.cerrojo = threading.Lock()
+        hilos = [
+            threading.Thread(
+                target=self._bucle, args=(f"{prefijo}:{n}", options), name=f"trabajos-{n}", daemon=True
+            )
+            for n in range(options["hilos"])
+        ]
+        for hilo in hilos:
+            hilo.start()
+        ultima = time.monotonic()
+        while any(hilo.is_alive() for hilo in hilos):
+            for hilo in hilos:
+                hilo.join(timeout=1)
+            if time.monotonic() - ultima > CADA_MANTENIMIENTO and not self.detener.is_set():
+                ultima = time.monotonic()
+                self._mantenimiento(options["verbosity"])
+        connections.close_all()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"OK -> {self.hechos} trabajos completados, {self.fallidos} con error."
+        ))
+
+    def _mantenimiento(self, verbosity):
+        """Libera los trabajos colgados y borra los terminados fuera de RETENCION (y sus archivos)."""
+        try:
+            liberados = trabajos.liberar_colgados()
+            purgados = trabajos.purgar()
+        except OperationalError:
+            return  # base bloqueada: en la próxima vuelta
+        finally:
+            close_old_connections()
+        if verbosity > 1 and (liberados or purgados):
+            self.stdout.write(f"{liberados} colgados liberados; {purgados} trabajos viejos purgados.")
+
+    def _bucle(self, trabajador, options):
+        try:
+            while not self.detener.is_set():
+                close_old_connections()
+                try:
+                    trabajo = trabajos.tomar(trabajador, options["tipo"])
+                except OperationalError:
+                    trabajo = None  # base bloqueada: se reintenta en la próxima vuelta
+                if trabajo is None:
+                    if options["una_vez"]:
+                        return
+                    self.detener.wait(options["intervalo"])
+                    continue
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"[{trabajador}] {trabajo.tipo} #{trabajo.pk}")
+                ok = trabajos.ejecutar(trabajo)
+                with self.cerrojo:
+                    if ok:
+                        self.hechos += 1
+                    else:
+                        self.fallidos += 1
+        finally:
+            connections.close_all()
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = "Recalcula rating_avg, rating_count y el histograma de estrellas de todos los paquetes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = rebuild_ratings(batch_size=options["lote"])
+        self.stdout.write(self.style.SUCCESS(f"OK -> {total} paquetes recalculados."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.indicadores import recalcular_indicadores
+
+
+class Command(BaseCommand):
+    help = "Recalcula los indicadores del dashboard desde las tablas (ejecutar periódicamente, p. ej. con cron)"
+
+    def handle(self, *args, **options):
+        valores = recalcular_indicadores()
+        self.stdout.write(self.style.SUCCESS(f"OK -> {len(valores)} indicadores recalculados."))
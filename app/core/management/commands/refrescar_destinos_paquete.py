@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Paquete
+from core.paquete_destinos import refresh_paquete_destinos
+
+
+class Command(BaseCommand):
+    help = "Reconstruye PaqueteDestino y Paquete.destinos_texto desde los productos de cada paquete"
+
+    def handle(self, *args, **options):
+        ids = list(Paquete.objects.values_list("pk", flat=True))
+        refresh_paquete_destinos(ids)
+        self.stdout.write(self.style.SUCCESS(f"OK -> {len(ids)} paquetes sincronizados."))
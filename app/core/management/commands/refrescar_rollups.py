@@ -0,0 +1,42 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.rollups import LAG, reconstruir, refrescar
+
+
+def _fecha(valor):
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise CommandError(f"Fecha inválida: {valor} (usa AAAA-MM-DD)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresca el rollup de ventas diarias desde la marca de agua y los días pendientes "
+        "(ejecutar periódicamente, p. ej. con cron). Con --todo, --desde o --hasta lo reconstruye."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lag", type=int, default=int(LAG.total_seconds()),
+            help="Segundos a releer antes de la marca de agua.",
+        )
+        parser.add_argument("--todo", action="store_true", help="Reconstruye el rollup completo.")
+        parser.add_argument("--desde", type=_fecha, help="Reconstruye desde este día (AAAA-MM-DD).")
+        parser.add_argument("--hasta", type=_fecha, help="Reconstruye hasta este día, incluido.")
+
+    def handle(self, *args, **options):
+        desde, hasta = options["desde"], options["hasta"]
+        if desde and hasta and desde > hasta:
+            raise CommandError("--desde no puede ser posterior a --hasta.")
+        if options["lag"] < 0:
+            raise CommandError("--lag debe ser >= 0.")
+        if options["todo"] or desde or hasta:
+            resultado = reconstruir(desde, hasta)
+        else:
+            resultado = refrescar(timedelta(seconds=options["lag"]))
+        self.stdout.write(self.style.SUCCESS(
+            f"OK -> {resultado['dias']} días recalculados, {resultado['filas']} filas de rollup."
+        ))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Cliente, Destino, Empleado, Interaccion, Paquete, Producto, Proveedor, Reserva
+
+MODELOS = {
+    m._meta.model_name: m
+    for m in (Cliente, Empleado, Proveedor, Destino, Producto, Paquete, Reserva, Interaccion)
+}
+
+
+class Command(BaseCommand):
+    help = "Recalcula la columna `busqueda` y el índice de términos (tras cargas con ignore_conflicts, SQL directo, etc.)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("modelos", nargs="*", help=f"Por defecto, todos: {', '.join(MODELOS)}.")
+        parser.add_argument("--lote", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        desconocidos = set(options["modelos"]) - set(MODELOS)
+        if desconocidos:
+            raise CommandError(f"Modelos desconocidos: {', '.join(sorted(desconocidos))}")
+        for nombre in options["modelos"] or MODELOS:
+            total = MODELOS[nombre].objects.all().reindex(batch_size=options["lote"])
+            self.stdout.write(self.style.SUCCESS(f"OK -> {nombre}: {total} registros reindexados."))
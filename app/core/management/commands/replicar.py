@@ -0,0 +1,46 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.db.router import PRIMARIO, REPLICA
+
+
+class Command(BaseCommand):
+    help = (
+        "Copia la base primaria SQLite a la réplica con la API de backup de SQLite "
+        "(sustituto local de la replicación). Con --intervalo repite la copia cada N segundos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--intervalo", type=float, help="Segundos entre copias; sin él, copia una vez.")
+        parser.add_argument("--paginas", type=int, default=1024, help="Páginas por paso de la copia.")
+
+    def handle(self, *args, **options):
+        if REPLICA not in settings.DATABASES:
+            raise CommandError("No hay base 'replica' configurada (variable DB_REPLICA).")
+        origen, destino = settings.DATABASES[PRIMARIO], settings.DATABASES[REPLICA]
+        if not all(db["ENGINE"].endswith("sqlite3") for db in (origen, destino)):
+            raise CommandError("La replicación local solo funciona entre bases SQLite.")
+        if str(origen["NAME"]) == str(destino["NAME"]):
+            raise CommandError("La réplica y el primario son el mismo archivo.")
+
+        intervalo = options["intervalo"]
+        try:
+            while True:
+                inicio = time.perf_counter()
+                self.copiar(str(origen["NAME"]), str(destino["NAME"]), options["paginas"])
+                self.stdout.write(self.style.SUCCESS(
+                    f"OK -> réplica actualizada en {(time.perf_counter() - inicio) * 1000:.0f} ms."
+                ))
+                if not intervalo:
+                    return
+                time.sleep(intervalo)
+        except KeyboardInterrupt:
+            return
+
+    def copiar(self, origen, destino, paginas):
+        # backup() da una copia consistente aunque el primario esté recibiendo escrituras
+        with sqlite3.connect(origen) as src, sqlite3.connect(destino) as dst:
+            src.backup(dst, pages=paginas)
@@ -0,0 +1,121 @@
+# core/metricas.py
+"""
+Métricas por vista en memoria del proceso (MetricasMiddleware) y su exposición
+en formato de texto de Prometheus (/metrics).
+Cada worker lleva sus propios contadores: Prometheus los suma al agregar por vista.
+"""
+import threading
+from bisect import bisect_left
+
+PREFIJO = "gabostours"
+SIN_VISTA = "sin_vista"  # 404 y rutas sin nombre
+
+# Límites superiores ("le") de cada histograma
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BUCKETS_CONSULTAS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Histograma:
+    __slots__ = ("limites", "cuentas", "suma", "total")
+
+    def __init__(self, limites):
+        self.limites = limites
+        self.cuentas = [0] * (len(limites) + 1)  # el último es +Inf
+        self.suma = 0
+        self.total = 0
+
+    def observar(self, valor):
+        self.cuentas[bisect_left(self.limites, valor)] += 1
+        self.suma += valor
+        self.total += 1
+
+    def acumulado(self):
+        """[(le, observaciones <= le)], terminando en +Inf."""
+        filas, acumulado = [], 0
+        for limite, cuenta in zip((*self.limites, "+Inf"), self.cuentas):
+            acumulado += cuenta
+            filas.append((limite, acumulado))
+        return filas
+
+
+class Medicion:
+    """Lo que se acumula durante una petición."""
+    __slots__ = ("consultas", "sql_segundos", "plantilla_segundos")
+
+    def __init__(self):
+        self.consultas = 0
+        self.sql_segundos = 0.0
+        self.plantilla_segundos = 0.0
+
+
+class Registro:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.vaciar()
+
+    def vaciar(self):
+        with self._lock:
+            self.latencia = {}
+            self.consultas = {}
+            self.sql_segundos = {}
+            self.plantilla_segundos = {}
+            self.respuestas = {}
+
+    def registrar(self, vista, estado, segundos, medicion):
+        with self._lock:
+            if vista not in self.latencia:
+                self.latencia[vista] = Histograma(BUCKETS_SEGUNDOS)
+                self.consultas[vista] = Histograma(BUCKETS_CONSULTAS)
+                self.sql_segundos[vista] = 0.0
+                self.plantilla_segundos[vista] = 0.0
+            self.latencia[vista].observar(segundos)
+            self.consultas[vista].observar(medicion.consultas)
+            self.sql_segundos[vista] += medicion.sql_segundos
+            self.plantilla_segundos[vista] += medicion.plantilla_segundos
+            clave = (vista, str(estado))
+            self.respuestas[clave] = self.respuestas.get(clave, 0) + 1
+
+    def exportar(self):
+        """Texto de exposición de Prometheus (version 0.0.4)."""
+        with self._lock:
+            lineas = []
+            _histogramas(lineas, "peticion_segundos", "Latencia de las peticiones por vista.", self.latencia)
+            _histogramas(lineas, "sql_consultas", "Consultas SQL por petición y vista.", self.consultas)
+            _contadores(lineas, "sql_segundos_total", "Tiempo en consultas SQL por vista.", {
+                (vista,): valor for vista, valor in self.sql_segundos.items()
+            }, ("vista",))
+            _contadores(lineas, "plantilla_segundos_total", "Tiempo renderizando plantillas por vista.", {
+                (vista,): valor for vista, valor in self.plantilla_segundos.items()
+            }, ("vista",))
+            _contadores(
+                lineas, "respuestas_total", "Respuestas por vista y código HTTP.", self.respuestas, ("vista", "estado")
+            )
+        return "\n".join(lineas) + "\n"
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _etiquetas(pares):
+    return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in pares) + "}"
+
+
+def _histogramas(lineas, nombre, ayuda, por_vista):
+    nombre = f"{PREFIJO}_{nombre}"
+    lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} histogram"]
+    for vista, histograma in sorted(por_vista.items()):
+        for limite, acumulado in histograma.acumulado():
+            lineas.append(f"{nombre}_bucket{_etiquetas((('vista', vista), ('le', limite)))} {acumulado}")
+        lineas.append(f"{nombre}_sum{_etiquetas((('vista', vista),))} {histograma.suma}")
+        lineas.append(f"{nombre}_count{_etiquetas((('vista', vista),))} {histograma.total}")
+
+
+def _contadores(lineas, nombre, ayuda, valores, etiquetas):
+    nombre = f"{PREFIJO}_{nombre}"
+    lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} counter"]
+    for clave, valor in sorted(valores.items()):
+        lineas.append(f"{nombre}{_etiquetas(zip(etiquetas, clave))} {valor}")
+
+
+registro = Registro()
@@ -0,0 +1,178 @@
+# core/middleware.py
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.views.generic import DetailView, ListView
+
+from . import estaticos
+from .db.router import activar_replica, replica_configurada, restaurar_replica
+from .metricas import SIN_VISTA, Medicion, registro
+
+COOKIE_PRIMARIO = "db_primario"
+
+
+def lee_de_replica(view_func):
+    """
+    Política por vista: `read_from_replica` en la clase manda; si no está,
+    los ListView y DetailView leen de la réplica.
+    """
+    view_class = getattr(view_func, "view_class", None)
+    if view_class is None:
+        return False
+    politica = getattr(view_class, "read_from_replica", None)
+    if politica is not None:
+        return politica
+    return issubclass(view_class, (ListView, DetailView))
+
+
+class ReplicaMiddleware:
+    """
+    Enruta los GET de las vistas de lectura a la réplica.
+    Tras una escritura (cualquier método no seguro) deja una cookie durante
+    REPLICA_STICKY_SECONDS: mientras exista, todo se lee del primario y la
+    redirección a success_url ya muestra el cambio (read-your-writes).
+    Bajo ASGI process_view corre en otro contexto que __call__: el ContextVar se fija
+    y se restaura aquí, en el mismo contexto, y process_view solo lo activa.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, "REPLICA_STICKY_SECONDS", 10)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _fijar_cookie(self, request, response):
+        if request.method not in ("GET", "HEAD", "OPTIONS", "TRACE") and replica_configurada():
+            response.set_cookie(
+                COOKIE_PRIMARIO, "1", max_age=self.sticky_seconds, httponly=True, samesite="Lax"
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = activar_replica(False)
+        try:
+            # La respuesta (TemplateResponse incluida) se renderiza dentro de get_response
+            response = self.get_response(request)
+        finally:
+            restaurar_replica(token)
+        return self._fijar_cookie(request, response)
+
+    async def __acall__(self, request):
+        token = activar_replica(False)
+        try:
+            response = await self.get_response(request)
+        finally:
+            restaurar_replica(token)
+        return self._fijar_cookie(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in ("GET", "HEAD")
+            and COOKIE_PRIMARIO not in request.COOKIES
+            and lee_de_replica(view_func)
+        ):
+            activar_replica()
+        return None
+
+
+class MetricasMiddleware:
+    """
+    Mide cada petición por nombre de URL (p. ej. "reservas:reserva_list"): latencia,
+    consultas SQL y su tiempo (execute wrapper en cada conexión) y render de plantillas
+    (TemplateResponse). Va el primero de MIDDLEWARE para que la latencia lo incluya todo.
+    Es también async para no forzar un salto de hilo a las vistas async bajo ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _envolver(self, request):
+        medicion = request._metricas = Medicion()
+
+        def medir_sql(execute, sql, params, many, context):
+            inicio = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                medicion.consultas += 1
+                medicion.sql_segundos += time.perf_counter() - inicio
+
+        stack = ExitStack()
+        for conexion in connections.all():
+            stack.enter_context(conexion.execute_wrapper(medir_sql))
+        return stack
+
+    def _registrar(self, request, response, inicio):
+        match = getattr(request, "resolver_match", None)
+        vista = match.view_name if match else SIN_VISTA
+        registro.registrar(vista, response.status_code, time.perf_counter() - inicio, request._metricas)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        inicio = time.perf_counter()
+        with self._envolver(request):
+            response = self.get_response(request)
+        self._registrar(request, response, inicio)
+        return response
+
+    async def __acall__(self, request):
+        inicio = time.perf_counter()
+        # Las conexiones son por hilo: el wrapper se instala en el hilo de la petición,
+        # el mismo en el que sync_to_async ejecuta las consultas de la vista
+        with await sync_to_async(self._envolver)(request):
+            response = await self.get_response(request)
+        self._registrar(request, response, inicio)
+        return response
+
+    def process_template_response(self, request, response):
+        # Es el último en este paso (orden inverso): el render empieza justo después
+        inicio = time.perf_counter()
+
+        def renderizada(response):
+            request._metricas.plantilla_segundos += time.perf_counter() - inicio
+
+        response.add_post_render_callback(renderizada)
+        return response
+
+
+class EstaticosMiddleware:
+    """
+    Sirve STATIC_ROOT (tras `manage.py construir_estaticos`) antes que el resto de la
+    cadena: la copia .br/.gz que acepte el cliente y, para los nombres con hash del
+    manifiesto, Cache-Control de un año e immutable. Va antes que MetricasMiddleware.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefijo = "/" + settings.STATIC_URL.lstrip("/")
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _servir(self, request):
+        if request.method in ("GET", "HEAD") and request.path.startswith(self.prefijo):
+            return estaticos.servir(request, request.path[len(self.prefijo):])
+        return None
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self._servir(request)
+        return response if response is not None else self.get_response(request)
+
+    async def __acall__(self, request):
+        response = await sync_to_async(self._servir)(request)
+        return response if response is not None else await self.get_response(request)
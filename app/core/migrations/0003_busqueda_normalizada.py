@@ -0,0 +1,117 @@
+# Generated by Django 4.2.6 on 2026-10-18 10:16
+
+from django.db import migrations, models
+
+from core.search import normalize, tokenize
+
+SEARCH_FIELDS = {
+    "cliente": ("nombre", "email", "preferencias"),
+    "empleado": ("nombre", "email"),
+    "proveedor": ("nombre", "tipo", "contacto"),
+    "destino": ("nombre", "pais", "descripcion"),
+    "producto": ("nombre", "tipo"),
+    "paquete": ("nombre",),
+    "reserva": ("estado",),
+    "interaccion": ("tipo", "notas"),
+}
+
+
+LOTE = 500
+
+
+def _lotes(iterable, n):
+    lote = []
+    for obj in iterable:
+        lote.append(obj)
+        if len(lote) == n:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def poblar_busqueda(apps, schema_editor):
+    # Por lotes: las tablas no se cargan enteras en memoria
+    Termino = apps.get_model("core", "TerminoBusqueda")
+    for model_name, fields in SEARCH_FIELDS.items():
+        Model = apps.get_model("core", model_name)
+        filas = Model.objects.only("pk", *fields).order_by("pk").iterator(chunk_size=LOTE)
+        for objs in _lotes(filas, LOTE):
+            for obj in objs:
+                obj.busqueda = " ".join(
+                    filter(None, (normalize(getattr(obj, f)) for f in fields))
+                )
+            Model.objects.bulk_update(objs, ["busqueda"], batch_size=LOTE)
+            Termino.objects.bulk_create(
+                [
+                    Termino(modelo=f"core.{model_name}", objeto_id=obj.pk, termino=t)
+                    for obj in objs
+                    for t in tokenize(obj.busqueda)
+                ],
+                batch_size=LOTE,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_reserva_fecha_viaje_alter_reserva_fecha_reserva_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliente',
+            name='busqueda',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='destino',
+            name='busqueda',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='empleado',
+            name='busqueda',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='interaccion',
+            name='busqueda',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='paquete',
+            name='busqueda',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='producto',
+            name='busqueda',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='proveedor',
+            name='busqueda',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='reserva',
+            name='busqueda',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.CreateModel(
+            name='TerminoBusqueda',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modelo', models.CharField(max_length=50)),
+                ('objeto_id', models.BigIntegerField()),
+                ('termino', models.CharField(max_length=64)),
+            ],
+            options={
+                'verbose_name': 'Término de búsqueda',
+                'verbose_name_plural': 'Términos de búsqueda',
+                'indexes': [models.Index(fields=['modelo', 'termino', 'objeto_id'], name='termino_busqueda_idx'), models.Index(fields=['modelo', 'objeto_id'], name='termino_objeto_idx')],
+            },
+        ),
+        migrations.RunPython(poblar_busqueda, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.6 on 2026-10-18 10:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def poblar_paquete_destino(apps, schema_editor):
+    Paquete = apps.get_model("core", "Paquete")
+    PaqueteDestino = apps.get_model("core", "PaqueteDestino")
+    Through = Paquete.productos.through
+    pares = set(
+        Through.objects.filter(producto__destino__isnull=False)
+        .values_list("paquete_id", "producto__destino_id", "producto__destino__nombre")
+    )
+    PaqueteDestino.objects.bulk_create(
+        [PaqueteDestino(paquete_id=p, destino_id=d) for p, d in {(p, d) for p, d, _n in pares}],
+        batch_size=500,
+    )
+    nombres = {}
+    for paquete_id, _destino_id, nombre in pares:
+        nombres.setdefault(paquete_id, set()).add(nombre)
+    for paquete_id, destinos in nombres.items():
+        Paquete.objects.filter(pk=paquete_id).update(destinos_texto=", ".join(sorted(destinos)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_busqueda_normalizada'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paquete',
+            name='destinos_texto',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.CreateModel(
+            name='PaqueteDestino',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('destino', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='paquetes_membresia', to='core.destino')),
+                ('paquete', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='destinos_membresia', to='core.paquete')),
+            ],
+            options={
+                'verbose_name': 'Destino de paquete',
+                'verbose_name_plural': 'Destinos de paquetes',
+                'indexes': [models.Index(fields=['destino', 'paquete'], name='destino_paquete_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='paquetedestino',
+            constraint=models.UniqueConstraint(fields=('paquete', 'destino'), name='paquete_destino_unico'),
+        ),
+        migrations.RunPython(poblar_paquete_destino, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.6 on 2026-10-18 10:18
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def poblar_calificaciones(apps, schema_editor):
+    Paquete = apps.get_model("core", "Paquete")
+    Comentario = apps.get_model("core", "Comentario")
+    histogramas = {}
+    for row in Comentario.objects.values("paquete_id", "calificacion").annotate(n=Count("id")).order_by():
+        histogramas.setdefault(row["paquete_id"], {})[row["calificacion"]] = row["n"]
+    for paquete_id, h in histogramas.items():
+        total = sum(h.values())
+        Paquete.objects.filter(pk=paquete_id).update(
+            rating_count=total,
+            rating_avg=sum(s * n for s, n in h.items()) / total,
+            **{f"rating_{s}": h.get(s, 0) for s in range(1, 6)},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_paquete_destino'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paquete',
+            name='rating_1',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='paquete',
+            name='rating_2',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='paquete',
+            name='rating_3',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='paquete',
+            name='rating_4',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='paquete',
+            name='rating_5',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='paquete',
+            name='rating_avg',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='paquete',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(poblar_calificaciones, migrations.RunPython.noop),
+    ]
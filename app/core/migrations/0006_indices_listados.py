@@ -0,0 +1,41 @@
+# Generated by Django 4.2.6 on 2026-10-18 10:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_calificaciones_paquete'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['nombre', 'id'], name='cliente_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='destino',
+            index=models.Index(fields=['pais', 'nombre'], name='destino_pais_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='metodopago',
+            index=models.Index(fields=['nombre', 'id'], name='metodopago_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paquete',
+            index=models.Index(fields=['nombre', 'id'], name='paquete_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['tipo', 'nombre', 'id'], name='producto_tipo_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['nombre', 'id'], name='producto_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proveedor',
+            index=models.Index(fields=['nombre', 'id'], name='proveedor_nombre_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.6 on 2026-10-18 10:25
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def poblar_indicadores(apps, schema_editor):
+    Indicador = apps.get_model("core", "Indicador")
+    Reserva = apps.get_model("core", "Reserva")
+    valores = {
+        clave: apps.get_model("core", modelo).objects.count()
+        for clave, modelo in (
+            ("clientes", "Cliente"), ("proveedores", "Proveedor"),
+            ("destinos", "Destino"), ("paquetes", "Paquete"),
+        )
+    }
+    for row in Reserva.objects.values("estado").annotate(n=Count("id")).order_by():
+        valores[f"reservas:{row['estado']}"] = row["n"]
+    ingresos = (
+        Reserva.objects.exclude(estado="Cancelada")
+        .annotate(mes=TruncMonth("fecha_reserva")).values("mes")
+        .annotate(total=Sum("precio_venta")).order_by()
+    )
+    for row in ingresos:
+        valores[f"ingresos:{row['mes']:%Y-%m}"] = row["total"] or 0
+    Indicador.objects.bulk_create([Indicador(clave=c, valor=v) for c, v in valores.items()])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_indices_listados'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Indicador',
+            fields=[
+                ('clave', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('valor', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'verbose_name': 'Indicador',
+                'verbose_name_plural': 'Indicadores',
+            },
+        ),
+        migrations.RunPython(poblar_indicadores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.6 on 2026-10-18 10:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_indicadores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupMarca',
+            fields=[
+                ('nombre', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('marca', models.DateTimeField(blank=True, null=True)),
+                ('actualizado', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Marca de rollup',
+                'verbose_name_plural': 'Marcas de rollup',
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupPendiente',
+            fields=[
+                ('dia', models.DateField(primary_key=True, serialize=False)),
+            ],
+            options={
+                'verbose_name': 'Día pendiente de rollup',
+                'verbose_name_plural': 'Días pendientes de rollup',
+            },
+        ),
+        migrations.CreateModel(
+            name='VentaDiaria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dia', models.DateField()),
+                ('estado', models.CharField(max_length=50)),
+                ('reservas', models.PositiveIntegerField(default=0)),
+                ('ingresos', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('empleado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('metodo_pago', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.metodopago')),
+                ('paquete', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.paquete')),
+            ],
+            options={
+                'verbose_name': 'Venta diaria',
+                'verbose_name_plural': 'Ventas diarias',
+                'indexes': [models.Index(fields=['dia'], name='venta_diaria_dia_idx'), models.Index(fields=['empleado', 'dia'], name='venta_diaria_empleado_idx')],
+            },
+        ),
+    ]
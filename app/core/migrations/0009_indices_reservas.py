@@ -0,0 +1,33 @@
+# Generated by Django 4.2.6 on 2026-10-18 10:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_rollups_ventas'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interaccion',
+            index=models.Index(fields=['fecha', 'id'], name='interaccion_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['fecha_reserva', 'id'], name='reserva_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['empleado', 'fecha_reserva', 'id'], name='reserva_empleado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['estado', 'fecha_reserva'], name='reserva_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['fecha_viaje'], name='reserva_fecha_viaje_idx'),
+        ),
+    ]
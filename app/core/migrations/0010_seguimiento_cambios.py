@@ -0,0 +1,87 @@
+# Generated by Django 4.2.6 on 2026-10-18 10:47
+
+from django.db import migrations, models
+from django.utils import timezone
+
+SEGUIDOS = (
+    "cliente", "comentario", "destino", "empleado", "interaccion",
+    "metodopago", "paquete", "producto", "proveedor", "reserva",
+)
+
+
+def poblar_marcas(apps, schema_editor):
+    CambioTabla = apps.get_model("core", "CambioTabla")
+    ahora = timezone.now()
+    CambioTabla.objects.bulk_create([CambioTabla(tabla=f"core.{m}", actualizado=ahora) for m in SEGUIDOS])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_indices_reservas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CambioTabla',
+            fields=[
+                ('tabla', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('actualizado', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Cambio de tabla',
+                'verbose_name_plural': 'Cambios de tabla',
+            },
+        ),
+        migrations.AddField(
+            model_name='cliente',
+            name='actualizado_en',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='comentario',
+            name='actualizado_en',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='destino',
+            name='actualizado_en',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='empleado',
+            name='actualizado_en',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='interaccion',
+            name='actualizado_en',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='metodopago',
+            name='actualizado_en',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='paquete',
+            name='actualizado_en',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='producto',
+            name='actualizado_en',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='proveedor',
+            name='actualizado_en',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='reserva',
+            name='actualizado_en',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(poblar_marcas, migrations.RunPython.noop),
+    ]
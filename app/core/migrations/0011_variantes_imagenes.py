@@ -0,0 +1,18 @@
+# Generated by Django 4.2.6 on 2026-10-18 11:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_seguimiento_cambios'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='empleado',
+            name='imagenes',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.6 on 2026-10-18 11:34
+
+import core.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_trabajos'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='trabajo',
+            name='archivo',
+            field=models.FileField(blank=True, max_length=255, storage=core.models.almacen_trabajos, upload_to=core.models.ruta_trabajo),
+        ),
+    ]
@@ -1,6 +1,16 @@
 # core/mixins.py
+import hashlib
+
+from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth.mixins import AccessMixin
+from django.core.cache import cache
 from django.shortcuts import redirect
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from . import cambios, listas
+from .cache import PERMISSIONS, get_version
 
 
 class PermissionRedirectMixin(AccessMixin):
@@ -10,9 +20,98 @@ class PermissionRedirectMixin(AccessMixin):
     """
     required_perm = None
 
-    def dispatch(self, request, *args, **kwargs):
+    def check_access(self, request):
+        """Redirección si no puede entrar; None si puede seguir."""
         if not request.user.is_authenticated:
             return redirect("login")
         if self.required_perm and not request.user.has_perm(self.required_perm):
             return redirect("access_denied")
-        return super().dispatch(request, *args, **kwargs)
+        return None
+
+    def dispatch(self, request, *args, **kwargs):
+        return self.check_access(request) or super().dispatch(request, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    GET condicional con las marcas de core/cambios.py: ETag y Last-Modified, y 304
+    si el navegador ya tiene la versión vigente. Va después de PermissionRedirectMixin.
+    `depende_de`: modelos cuyos datos muestra la vista (por defecto, `model`).
+    """
+    depende_de = ()
+
+    def get_validators(self, request):
+        """(etag, last_modified) o None si la respuesta no se puede validar."""
+        if request.method not in ("GET", "HEAD"):
+            return None
+        if len(messages.get_messages(request)):
+            return None  # mensajes flash pendientes: la página cambia aunque los datos no
+        ultima = cambios.ultima_modificacion(*(self.depende_de or (self.model,)))
+        if ultima is None:
+            return None
+        # Lo que cambia el HTML sin cambiar los datos: usuario (nombre y avatar de la
+        # barra), permisos, token CSRF
+        actualizado = getattr(request.user, "actualizado_en", None)
+        partes = (
+            ultima.isoformat(),
+            request.get_full_path(),
+            str(request.user.pk),
+            actualizado.isoformat() if actualizado else "",
+            str(get_version(PERMISSIONS)),
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        )
+        etag = quote_etag(hashlib.sha1("|".join(partes).encode()).hexdigest())
+        return etag, int(ultima.timestamp())
+
+    def set_validators(self, response, validadores):
+        if response.status_code in (200, 304):
+            etag, last_modified = validadores
+            response.headers["ETag"] = etag
+            response.headers["Last-Modified"] = http_date(last_modified)
+            # El navegador guarda la respuesta pero la revalida en cada uso
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        validadores = self.get_validators(request)
+        if validadores is None:
+            return super().dispatch(request, *args, **kwargs)
+        response = get_conditional_response(request, *validadores)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        return self.set_validators(response, validadores)
+
+
+class CachedListMixin:
+    """
+    ListView cuyo bloque {% lista_cacheada %} se guarda en caché (core/listas.py).
+    Si ya está guardado no se construye el queryset ni la paginación.
+    """
+    lista = None  # clave de listas.DEPENDENCIAS; por defecto, el nombre del modelo
+
+    def get_lista_perms(self):
+        # Los únicos permisos que cambian la tabla: botones de alta, edición y borrado
+        opts = self.model._meta
+        return [f"{opts.app_label}.{accion}_{opts.model_name}" for accion in ("add", "change", "delete")]
+
+    def cached_list_response(self):
+        """Respuesta con el HTML guardado, o None si no está en caché."""
+        self.lista_cache_key = listas.clave(
+            self.lista or self.model._meta.model_name, self.request, self.get_lista_perms()
+        )
+        html = cache.get(self.lista_cache_key)
+        if html is None:
+            return None
+        self.object_list = self.model._default_manager.none()  # sin consulta
+        return self.render_to_response({"view": self, "lista_cacheada": html})
+
+    def get(self, request, *args, **kwargs):
+        response = self.cached_list_response()
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return response
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["lista_cache_key"] = getattr(self, "lista_cache_key", None)
+        return ctx
@@ -1,14 +1,20 @@
 from django.conf import settings
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.contrib.auth.models import PermissionsMixin
+from django.core.files.storage import FileSystemStorage
 from django.core.validators import RegexValidator
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
+from django.utils.crypto import get_random_string
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
 
+from .cambios import SeguimientoModel, SeguimientoQuerySet
+from .search import SearchableModel, SearchManager, SearchQuerySet
 
 
-class Cliente(models.Model):
+class Cliente(SeguimientoModel, SearchableModel):
+    search_fields = ("nombre", "email", "preferencias")
+
     nombre = models.CharField(max_length=100)
     email = models.EmailField(verbose_name="Email", max_length=254, unique=True)
     telefono_validator = RegexValidator(
@@ -21,9 +27,14 @@ class Cliente(models.Model):
     fecha_registro = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Registro")
     preferencias = models.TextField(blank=True, null=True)
 
+    objects = SearchQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Cliente"
         verbose_name_plural = "Clientes"
+        indexes = [
+            models.Index(fields=["nombre", "id"], name="cliente_nombre_idx"),
+        ]
 
     def __str__(self):
         return f"{self.nombre}"
@@ -41,7 +52,7 @@ class Cargo(models.Model):
         return self.nombre
 
 
-class EmpleadoManager(BaseUserManager):
+class EmpleadoManager(SearchManager, BaseUserManager.from_queryset(SearchQuerySet)):
     def create_user(self, email, nombre, password=None, **extra_fields):
         if not email:
             raise ValueError("El email es obligatorio")
@@ -64,7 +75,11 @@ class EmpleadoManager(BaseUserManager):
         return self.create_user(email, nombre, password, **extra_fields)
 
 
-class Empleado(AbstractBaseUser, PermissionsMixin):
+class Empleado(SeguimientoModel, SearchableModel, AbstractBaseUser, PermissionsMixin):
+    search_fields = ("nombre", "email")
+    # El login y las variantes de imagen no cambian listados ni detalles de otros
+    campos_sin_marca = ("last_login", "imagenes")
+
     id = models.AutoField(primary_key=True)
     email = models.EmailField(unique=True)
     nombre = models.CharField(max_length=50)
@@ -75,6 +90,8 @@ class Empleado(AbstractBaseUser, PermissionsMixin):
     direccion = models.CharField(max_length=255, blank=True, null=True)
     imagen = models.ImageField(upload_to="empleados/", blank=True, null=True)
     cover = models.ImageField(upload_to="empleados/covers/", blank=True, null=True)
+    # Variantes redimensionadas de imagen y cover (core/imagenes.py)
+    imagenes = models.JSONField(default=dict, blank=True, editable=False)
     about_me = models.TextField(blank=True, null=True)
     puesto = models.ForeignKey(
         Cargo, on_delete=models.SET_NULL, blank=True, null=True
@@ -101,7 +118,9 @@ class Empleado(AbstractBaseUser, PermissionsMixin):
         return f"{self.nombre} - {puesto}"
 
 
-class Proveedor(models.Model):
+class Proveedor(SeguimientoModel, SearchableModel):
+    search_fields = ("nombre", "tipo", "contacto")
+
     TIPO_CHOICES = [
         ("Aerolínea", "Aerolínea"),
         ("Hotel", "Hotel"),
@@ -112,31 +131,45 @@ class Proveedor(models.Model):
     tipo = models.CharField(max_length=50, choices=TIPO_CHOICES)
     contacto = models.CharField(unique=True, max_length=100)
 
+    objects = SearchQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Proveedor"
         verbose_name_plural = "Proveedores"
         ordering = ["nombre"]
+        indexes = [
+            models.Index(fields=["nombre", "id"], name="proveedor_nombre_idx"),
+        ]
 
     def __str__(self):
         return self.nombre
 
 
-class Destino(models.Model):
+class Destino(SeguimientoModel, SearchableModel):
+    search_fields = ("nombre", "pais", "descripcion")
+
     nombre = models.CharField(max_length=100)
     pais = models.CharField(max_length=100)
     descripcion = models.TextField(blank=True, null=True)
 
+    objects = SearchQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Destino"
         verbose_name_plural = "Destinos"
         ordering = ["pais", "nombre"]
         unique_together = [("nombre", "pais")]
+        indexes = [
+            models.Index(fields=["pais", "nombre"], name="destino_pais_nombre_idx"),
+        ]
 
     def __str__(self):
         return f"{self.nombre}, {self.pais}"
 
 
-class Producto(models.Model):
+class Producto(SeguimientoModel, SearchableModel):
+    search_fields = ("nombre", "tipo")
+
     TIPO_CHOICES = [
         ("Vuelo", "Vuelo"),
         ("Hotel", "Hotel"),
@@ -153,43 +186,147 @@ class Producto(models.Model):
     )
     precio_base = models.DecimalField(max_digits=10, decimal_places=2, default=0)
 
+    objects = SearchQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Producto"
         verbose_name_plural = "Productos"
         ordering = ["tipo", "nombre"]
+        indexes = [
+            models.Index(fields=["tipo", "nombre", "id"], name="producto_tipo_nombre_idx"),
+            models.Index(fields=["nombre", "id"], name="producto_nombre_idx"),
+        ]
 
     def __str__(self):
         return self.nombre
 
 
-class Paquete(models.Model):
+class Paquete(SeguimientoModel, SearchableModel):
+    search_fields = ("nombre",)
+
     nombre = models.CharField(max_length=100)
     productos = models.ManyToManyField(Producto, related_name="paquetes")
     precio_final = models.DecimalField(max_digits=10, decimal_places=2)
     activo = models.BooleanField(default=True)
+    # Desnormalizado desde PaqueteDestino: "Cancún, París"
+    destinos_texto = models.TextField(default="", blank=True, editable=False)
+
+    # Agregados de Comentario.calificacion (ver core/ratings.py)
+    rating_avg = models.FloatField(blank=True, null=True, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_1 = models.PositiveIntegerField(default=0, editable=False)
+    rating_2 = models.PositiveIntegerField(default=0, editable=False)
+    rating_3 = models.PositiveIntegerField(default=0, editable=False)
+    rating_4 = models.PositiveIntegerField(default=0, editable=False)
+    rating_5 = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = SearchQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Paquete"
         verbose_name_plural = "Paquetes"
         ordering = ["nombre"]
+        indexes = [
+            models.Index(fields=["nombre", "id"], name="paquete_nombre_idx"),
+        ]
 
     def __str__(self):
         return self.nombre
 
+    @property
+    def rating_histogram(self):
+        """[(estrellas, cantidad, porcentaje)] de 5 a 1."""
+        rows = []
+        for stars in range(5, 0, -1):
+            count = getattr(self, f"rating_{stars}")
+            pct = round(count * 100 / self.rating_count) if self.rating_count else 0
+            rows.append((stars, count, pct))
+        return rows
+
+
+class PaqueteDestino(models.Model):
+    """
+    Destinos de cada paquete, derivados de Paquete.productos -> Producto.destino.
+    Se mantiene desde core/signals.py para filtrar por destino sin JOIN + DISTINCT.
+    """
+    paquete = models.ForeignKey(Paquete, on_delete=models.CASCADE, related_name="destinos_membresia")
+    destino = models.ForeignKey(Destino, on_delete=models.CASCADE, related_name="paquetes_membresia")
+
+    class Meta:
+        verbose_name = "Destino de paquete"
+        verbose_name_plural = "Destinos de paquetes"
+        constraints = [
+            models.UniqueConstraint(fields=["paquete", "destino"], name="paquete_destino_unico"),
+        ]
+        indexes = [
+            models.Index(fields=["destino", "paquete"], name="destino_paquete_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.paquete_id} -> {self.destino_id}"
+
 
-class MetodoPago(models.Model):
+class MetodoPago(SeguimientoModel):
     nombre = models.CharField(max_length=50)
     descripcion = models.TextField(blank=True, null=True)
 
+    objects = SeguimientoQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Método de Pago"
         verbose_name_plural = "Métodos de Pago"
+        indexes = [
+            models.Index(fields=["nombre", "id"], name="metodopago_nombre_idx"),
+        ]
 
     def __str__(self):
         return self.nombre
 
 
-class Reserva(models.Model):
+class ReservaQuerySet(SearchQuerySet):
+    """
+    update() y bulk_update() no envían señales: si tocan campos del rollup de ventas,
+    marcan aquí los días afectados (antes y después del cambio) al confirmar.
+    """
+
+    def _marcar_al_confirmar(self, dias):
+        from .rollups import marcar_dias
+        if dias:
+            transaction.on_commit(lambda: marcar_dias(dias), using=self.db)
+
+    def update(self, **kwargs):
+        from .rollups import CAMPOS, dias_de
+        if not {campo.removesuffix("_id") for campo in kwargs} & CAMPOS:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            if "fecha_reserva" in kwargs:
+                # El filtro puede dejar de cumplirse tras el cambio: los días nuevos, por pk
+                pks = list(self.values_list("pk", flat=True))
+                dias = dias_de(self.model.objects.using(self.db).filter(pk__in=pks))
+                rows = super().update(**kwargs)
+                dias |= dias_de(self.model.objects.using(self.db).filter(pk__in=pks))
+            else:
+                dias = dias_de(self)
+                rows = super().update(**kwargs)
+            self._marcar_al_confirmar(dias)
+        return rows
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        from .rollups import CAMPOS, dias_de
+        if not {campo.removesuffix("_id") for campo in fields} & CAMPOS:
+            return super().bulk_update(objs, fields, *args, **kwargs)
+        objs = list(objs)
+        with transaction.atomic(using=self.db):
+            dias = dias_de(self.model.objects.using(self.db).filter(pk__in=[obj.pk for obj in objs]))
+            dias.update(timezone.localdate(obj.fecha_reserva) for obj in objs if obj.fecha_reserva)
+            rows = super().bulk_update(objs, fields, *args, **kwargs)
+            self._marcar_al_confirmar(dias)
+        return rows
+
+
+class Reserva(SeguimientoModel, SearchableModel):
+    search_fields = ("estado",)
+
     cliente = models.ForeignKey(Cliente, on_delete=models.CASCADE)
     paquete = models.ForeignKey(Paquete, on_delete=models.CASCADE)
     empleado = models.ForeignKey(
@@ -208,14 +345,24 @@ class Reserva(models.Model):
     ]
     estado = models.CharField(max_length=50, choices=ESTADO_CHOICES, default="Pendiente")
 
+    objects = ReservaQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Reserva"
         verbose_name_plural = "Reservas"
+        indexes = [
+            # Listado (orden -fecha_reserva, -id), rangos de "creada" y marca de agua del rollup
+            models.Index(fields=["fecha_reserva", "id"], name="reserva_fecha_idx"),
+            # Colaborador: solo sus reservas, mismo orden
+            models.Index(fields=["empleado", "fecha_reserva", "id"], name="reserva_empleado_fecha_idx"),
+            models.Index(fields=["estado", "fecha_reserva"], name="reserva_estado_fecha_idx"),
+            models.Index(fields=["fecha_viaje"], name="reserva_fecha_viaje_idx"),
+        ]
 
     def __str__(self):
         return f"Reserva {self.id} - {self.cliente.nombre} - {self.paquete.nombre}"
 
-class Comentario(models.Model):
+class Comentario(SeguimientoModel):
     paquete = models.ForeignKey(Paquete, on_delete=models.CASCADE, related_name="comentarios")
     autor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="comentarios")
     texto = models.TextField()
@@ -224,6 +371,8 @@ class Comentario(models.Model):
     )
     creado_en = models.DateTimeField(auto_now_add=True)
 
+    objects = SeguimientoQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Comentario"
         verbose_name_plural = "Comentarios"
@@ -232,6 +381,11 @@ class Comentario(models.Model):
     def __str__(self):
         return f"{self.paquete.nombre} - {self.autor} ({self.calificacion}/5)"
 
+    def save(self, *args, **kwargs):
+        # Los agregados de Paquete se ajustan en post_save: misma transacción
+        with transaction.atomic(using=kwargs.get("using") or self._state.db):
+            super().save(*args, **kwargs)
+
 
 
 
@@ -248,7 +402,9 @@ class TipoInteraccion(models.TextChoices):
         return self.label
 
 
-class Interaccion(models.Model):
+class Interaccion(SeguimientoModel, SearchableModel):
+    search_fields = ("tipo", "notas")
+
     cliente = models.ForeignKey(Cliente, on_delete=models.CASCADE, related_name="interacciones")
     empleado = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="interacciones_realizadas"
@@ -257,11 +413,198 @@ class Interaccion(models.Model):
     fecha = models.DateTimeField(auto_now_add=True)
     notas = models.TextField(blank=True, null=True)
 
+    objects = SearchQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Interacción"
         verbose_name_plural = "Interacciones"
         ordering = ["-fecha"]
+        indexes = [
+            models.Index(fields=["fecha", "id"], name="interaccion_fecha_idx"),
+        ]
 
     def __str__(self):
         return f"Interacción {self.id} - {self.cliente.nombre} - {self.tipo}"
 
+
+class TerminoBusqueda(models.Model):
+    """Índice invertido de términos normalizados (ver core/search.py)."""
+    modelo = models.CharField(max_length=50)
+    objeto_id = models.BigIntegerField()
+    termino = models.CharField(max_length=64)
+
+    class Meta:
+        verbose_name = "Término de búsqueda"
+        verbose_name_plural = "Términos de búsqueda"
+        indexes = [
+            # Búsqueda por prefijo de término dentro de un modelo
+            models.Index(fields=["modelo", "termino", "objeto_id"], name="termino_busqueda_idx"),
+            # Reindexar/borrar los términos de un objeto
+            models.Index(fields=["modelo", "objeto_id"], name="termino_objeto_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.modelo}:{self.objeto_id} {self.termino}"
+
+
+class Indicador(models.Model):
+    """
+    Contador precalculado del dashboard (ver core/indicadores.py).
+    Claves: "clientes", "reservas:<estado>", "ingresos:<AAAA-MM>", ...
+    """
+    clave = models.CharField(max_length=50, primary_key=True)
+    valor = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = "Indicador"
+        verbose_name_plural = "Indicadores"
+
+    def __str__(self):
+        return f"{self.clave} = {self.valor}"
+
+
+class VentaDiaria(models.Model):
+    """
+    Rollup de reservas por día local y dimensiones (ver core/rollups.py).
+    Los reportes consultan esta tabla, nunca Reserva directamente.
+    """
+    dia = models.DateField()
+    paquete = models.ForeignKey(Paquete, on_delete=models.CASCADE, related_name="+")
+    empleado = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    estado = models.CharField(max_length=50)
+    metodo_pago = models.ForeignKey(MetodoPago, on_delete=models.SET_NULL, null=True, related_name="+")
+    reservas = models.PositiveIntegerField(default=0)
+    ingresos = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = "Venta diaria"
+        verbose_name_plural = "Ventas diarias"
+        indexes = [
+            models.Index(fields=["dia"], name="venta_diaria_dia_idx"),
+            models.Index(fields=["empleado", "dia"], name="venta_diaria_empleado_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.dia} {self.paquete_id}/{self.empleado_id}/{self.estado}: {self.reservas}"
+
+
+class RollupMarca(models.Model):
+    """Marca de agua de un rollup: hasta qué fecha_reserva ya se incorporó."""
+    nombre = models.CharField(max_length=50, primary_key=True)
+    marca = models.DateTimeField(null=True, blank=True)
+    actualizado = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Marca de rollup"
+        verbose_name_plural = "Marcas de rollup"
+
+    def __str__(self):
+        return f"{self.nombre} @ {self.marca}"
+
+
+class RollupPendiente(models.Model):
+    """Día con reservas editadas o borradas que el próximo refresco debe recalcular."""
+    dia = models.DateField(primary_key=True)
+
+    class Meta:
+        verbose_name = "Día pendiente de rollup"
+        verbose_name_plural = "Días pendientes de rollup"
+
+    def __str__(self):
+        return str(self.dia)
+
+
+class CambioTabla(models.Model):
+    """Última modificación de una tabla (ver core/cambios.py), p. ej. "core.paquete"."""
+    tabla = models.CharField(max_length=100, primary_key=True)
+    actualizado = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Cambio de tabla"
+        verbose_name_plural = "Cambios de tabla"
+
+    def __str__(self):
+        return f"{self.tabla} @ {self.actualizado}"
+
+
+class VersionCache(models.Model):
+    """Versión de un grupo de claves de caché (ver core/cache.py), p. ej. "permisos"."""
+    nombre = models.CharField(max_length=100, primary_key=True)
+    version = models.PositiveBigIntegerField(default=1)
+
+    class Meta:
+        verbose_name = "Versión de caché"
+        verbose_name_plural = "Versiones de caché"
+
+    def __str__(self):
+        return f"{self.nombre} v{self.version}"
+
+
+def almacen_trabajos():
+    """Archivos de los trabajos (exportaciones, rechazos): fuera de MEDIA_ROOT, sin URL pública."""
+    return FileSystemStorage(location=settings.TRABAJOS_ROOT, base_url=None)
+
+
+def ruta_trabajo(instance, filename):
+    # Carpeta aleatoria: el nombre del archivo (reservas-AAAAMMDD.csv) es fácil de adivinar
+    return f"{timezone.now():%Y/%m}/{get_random_string(32)}/{filename}"
+
+
+class Trabajo(models.Model):
+    """Operación larga en segundo plano (ver core/trabajos.py y `manage.py procesar_trabajos`)."""
+    PENDIENTE = "pendiente"
+    EN_CURSO = "en_curso"
+    COMPLETADO = "completado"
+    FALLIDO = "fallido"
+    ESTADO_CHOICES = [
+        (PENDIENTE, "Pendiente"),
+        (EN_CURSO, "En curso"),
+        (COMPLETADO, "Completado"),
+        (FALLIDO, "Fallido"),
+    ]
+
+    tipo = models.CharField(max_length=50)
+    estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default=PENDIENTE)
+    parametros = models.JSONField(default=dict, blank=True)
+    creado_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="trabajos"
+    )
+    # Progreso: `hechos` de `total` (None si no se conoce de antemano)
+    hechos = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(null=True, blank=True)
+    mensaje = models.CharField(max_length=255, blank=True)
+    resultado = models.JSONField(default=dict, blank=True)
+    # Solo se descarga por TrabajoDescargaView (dueño o superusuario)
+    archivo = models.FileField(upload_to=ruta_trabajo, storage=almacen_trabajos, max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    intentos = models.PositiveSmallIntegerField(default=0)
+    trabajador = models.CharField(max_length=100, blank=True)
+    disponible_en = models.DateTimeField(default=timezone.now)  # reintentos con espera
+    creado_en = models.DateTimeField(auto_now_add=True)
+    iniciado_en = models.DateTimeField(null=True, blank=True)
+    latido = models.DateTimeField(null=True, blank=True)  # último avance del trabajador
+    terminado_en = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Trabajo"
+        verbose_name_plural = "Trabajos"
+        indexes = [
+            # Cola: siguiente pendiente disponible, y en curso por tipo (límite de concurrencia)
+            models.Index(fields=["estado", "disponible_en", "id"], name="trabajo_cola_idx"),
+            models.Index(fields=["tipo", "estado"], name="trabajo_tipo_estado_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo} #{self.pk} ({self.estado})"
+
+    @property
+    def terminado(self):
+        return self.estado in (self.COMPLETADO, self.FALLIDO)
+
+    @property
+    def porcentaje(self):
+        if self.estado == self.COMPLETADO:
+            return 100
+        if not self.total:
+            return None
+        return min(100, round(self.hechos * 100 / self.total))
@@ -0,0 +1,237 @@
+# core/pagination.py
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+
+
+def encode_cursor(direction, values):
+    payload = []
+    for value in values:
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        payload.append(value)
+    raw = json.dumps({"d": direction, "v": payload}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Devuelve (direccion, valores) o None si el cursor no es válido."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        direction, values = data["d"], data["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        return None
+    if direction not in ("n", "p") or not isinstance(values, list):
+        return None
+    return direction, values
+
+
+def _table_row_estimate(model, using):
+    """Filas estimadas por las estadísticas del motor (sin recorrer la tabla)."""
+    connection = connections[using]
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                # Solo existe tras ejecutar ANALYZE
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+                row = cursor.fetchone()
+                return int(row[0].split()[0]) if row else None
+            if connection.vendor == "mysql":
+                cursor.execute(
+                    "SELECT table_rows FROM information_schema.tables "
+                    "WHERE table_schema = DATABASE() AND table_name = %s",
+                    [table],
+                )
+                row = cursor.fetchone()
+                return int(row[0]) if row and row[0] is not None else None
+            if connection.vendor == "postgresql":
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+                row = cursor.fetchone()
+                return int(row[0]) if row and row[0] >= 0 else None
+    except Exception:
+        return None
+    return None
+
+
+def estimate_count(queryset, cap=10000):
+    """
+    Total aproximado de un queryset: (total, es_aproximado).
+    - Sin filtros -> estadísticas del motor si existen.
+    - Con filtros -> COUNT acotado a `cap` filas (coste constante).
+    """
+    if not queryset.query.where:
+        estimate = _table_row_estimate(queryset.model, queryset.db)
+        if estimate is not None:
+            return estimate, True
+    total = queryset.order_by()[: cap + 1].count()
+    if total > cap:
+        return cap, True
+    return total, False
+
+
+async def aestimate_count(queryset, cap=10000):
+    """estimate_count() con el ORM async."""
+    if not queryset.query.where:
+        estimate = await sync_to_async(_table_row_estimate)(queryset.model, queryset.db)
+        if estimate is not None:
+            return estimate, True
+    total = await queryset.order_by()[: cap + 1].acount()
+    if total > cap:
+        return cap, True
+    return total, False
+
+
+class KeysetPage:
+    """Página de resultados por cursor; imita lo que usan las plantillas de `Page`."""
+
+    is_keyset = True
+
+    def __init__(self, object_list, next_cursor, previous_cursor, total, total_is_estimate):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.total = total
+        self.total_is_estimate = total_is_estimate
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginationMixin:
+    """
+    Paginación por cursor (keyset) para ListView.
+    - Ordena por `keyset_fields` (el último debe ser único, p. ej. "-id").
+    - `?cursor=` busca a partir de la última/primera fila vista: cada página
+      cuesta lo mismo que la primera, sin OFFSET ni COUNT(*) completo.
+    - `?page=N` mantiene la paginación clásica por compatibilidad.
+    """
+    keyset_fields = ("-id",)
+    cursor_kwarg = "cursor"
+    count_cap = 10000
+
+    def _keyset_spec(self, model):
+        spec = []
+        for field in self.keyset_fields:
+            name = field.lstrip("-")
+            spec.append((name, field.startswith("-"), model._meta.get_field(name)))
+        return spec
+
+    def _keyset_filter(self, spec, values, forward):
+        # (a, b) > (x, y)  ==  a > x OR (a = x AND b > y)
+        condition = Q()
+        for i, (name, descending, _field) in enumerate(spec):
+            lookup = "lt" if descending == forward else "gt"
+            term = Q(**{f"{name}__{lookup}": values[i]})
+            for j in range(i):
+                term &= Q(**{spec[j][0]: values[j]})
+            condition |= term
+        return condition
+
+    def _fetch_qs(self, queryset, spec, values, forward, page_size):
+        ordering = list(self.keyset_fields)
+        if not forward:
+            ordering = [f[1:] if f.startswith("-") else f"-{f}" for f in ordering]
+        qs = queryset.order_by(*ordering)
+        if values is not None:
+            qs = qs.filter(self._keyset_filter(spec, values, forward))
+        return qs[: page_size + 1]
+
+    def _trim(self, rows, forward, page_size):
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if not forward:
+            rows.reverse()
+        return rows, has_more
+
+    def _fetch(self, queryset, spec, values, forward, page_size):
+        rows = list(self._fetch_qs(queryset, spec, values, forward, page_size))
+        return self._trim(rows, forward, page_size)
+
+    async def _afetch(self, queryset, spec, values, forward, page_size):
+        rows = [obj async for obj in self._fetch_qs(queryset, spec, values, forward, page_size)]
+        return self._trim(rows, forward, page_size)
+
+    def _row_values(self, spec, obj):
+        return [getattr(obj, field.attname) for _name, _desc, field in spec]
+
+    def _cursor_values(self, spec):
+        """(valores del cursor o None, hacia delante)."""
+        decoded = decode_cursor(self.request.GET.get(self.cursor_kwarg))
+        values = None
+        if decoded and len(decoded[1]) == len(spec):
+            try:
+                values = [field.to_python(v) for (_n, _d, field), v in zip(spec, decoded[1])]
+            except ValidationError:
+                values = None
+        return values, not (values is not None and decoded[0] == "p")
+
+    def _keyset_page(self, spec, rows, has_more, values, forward, total, total_is_estimate):
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or not forward:
+                next_cursor = encode_cursor("n", self._row_values(spec, rows[-1]))
+            if values is not None:
+                previous_cursor = encode_cursor("p", self._row_values(spec, rows[0]))
+
+        page = KeysetPage(rows, next_cursor, previous_cursor, total, total_is_estimate)
+        return None, page, rows, page.has_other_pages()
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.page_kwarg in self.request.GET:
+            return super().paginate_queryset(queryset.order_by(*self.keyset_fields), page_size)
+
+        spec = self._keyset_spec(queryset.model)
+        total, total_is_estimate = estimate_count(queryset, self.count_cap)
+        values, forward = self._cursor_values(spec)
+
+        rows, has_more = self._fetch(queryset, spec, values, forward, page_size)
+        if not forward and not has_more:
+            # Al volver hasta el principio se muestra la primera página completa
+            values, forward = None, True
+            rows, has_more = self._fetch(queryset, spec, values, forward, page_size)
+        return self._keyset_page(spec, rows, has_more, values, forward, total, total_is_estimate)
+
+    async def akeyset_paginate(self, queryset, page_size):
+        """paginate_queryset() por cursor con el ORM async (core/async_views.py)."""
+        spec = self._keyset_spec(queryset.model)
+        total, total_is_estimate = await aestimate_count(queryset, self.count_cap)
+        values, forward = self._cursor_values(spec)
+
+        rows, has_more = await self._afetch(queryset, spec, values, forward, page_size)
+        if not forward and not has_more:
+            values, forward = None, True
+            rows, has_more = await self._afetch(queryset, spec, values, forward, page_size)
+        return self._keyset_page(spec, rows, has_more, values, forward, total, total_is_estimate)
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        params = self.request.GET.copy()
+        params.pop(self.cursor_kwarg, None)
+        params.pop(self.page_kwarg, None)
+        ctx["querystring"] = params.urlencode()
+        return ctx
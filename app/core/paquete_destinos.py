@@ -0,0 +1,104 @@
+# core/paquete_destinos.py
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from .cache import PAQUETES, bump_version, get_version
+from .models import Destino, Paquete, PaqueteDestino, Producto
+from .search import matching_ids
+
+PaqueteProducto = Paquete.productos.through
+
+BATCH_SIZE = 500
+
+
+def refresh_paquete_destinos(paquete_ids):
+    """
+    Sincroniza PaqueteDestino y Paquete.destinos_texto para los paquetes dados
+    con lo que indican sus productos. Solo escribe las diferencias.
+    """
+    paquete_ids = list({pk for pk in paquete_ids if pk is not None})
+    for start in range(0, len(paquete_ids), BATCH_SIZE):
+        _refresh_batch(paquete_ids[start:start + BATCH_SIZE])
+
+
+def _refresh_batch(paquete_ids):
+    rows = (
+        PaqueteProducto.objects
+        .filter(paquete_id__in=paquete_ids, producto__destino__isnull=False)
+        .values_list("paquete_id", "producto__destino_id", "producto__destino__nombre")
+    )
+    wanted = set()
+    nombres = {pk: set() for pk in paquete_ids}
+    for paquete_id, destino_id, nombre in rows:
+        wanted.add((paquete_id, destino_id))
+        nombres[paquete_id].add(nombre)
+
+    current = set(
+        PaqueteDestino.objects.filter(paquete_id__in=paquete_ids).values_list("paquete_id", "destino_id")
+    )
+    textos = dict(Paquete.objects.filter(pk__in=paquete_ids).values_list("pk", "destinos_texto"))
+
+    with transaction.atomic():
+        sobrantes = current - wanted
+        if sobrantes:
+            condition = Q()
+            for paquete_id, destino_id in sobrantes:
+                condition |= Q(paquete_id=paquete_id, destino_id=destino_id)
+            PaqueteDestino.objects.filter(condition).delete()
+        PaqueteDestino.objects.bulk_create(
+            [PaqueteDestino(paquete_id=p, destino_id=d) for p, d in wanted - current],
+            batch_size=BATCH_SIZE,
+        )
+        changed = False
+        for paquete_id, destinos in nombres.items():
+            texto = ", ".join(sorted(destinos))
+            if paquete_id in textos and textos[paquete_id] != texto:
+                Paquete.objects.filter(pk=paquete_id).update(destinos_texto=texto)
+                changed = True
+        if changed:
+            transaction.on_commit(lambda: bump_version(PAQUETES))
+
+
+def paquetes_de_productos(producto_ids):
+    return PaqueteProducto.objects.filter(producto_id__in=producto_ids).values_list("paquete_id", flat=True)
+
+
+def paquetes_de_destino(destino_id):
+    return PaqueteDestino.objects.filter(destino_id=destino_id).values("paquete_id")
+
+
+def paquete_search_terms(term):
+    """Coincidencias de un término en los productos y destinos de un paquete (sin JOIN)."""
+    return Q(
+        pk__in=PaqueteProducto.objects
+        .filter(producto_id__in=matching_ids(Producto, term))
+        .values("paquete_id")
+    ) | Q(
+        pk__in=PaqueteDestino.objects
+        .filter(destino_id__in=matching_ids(Destino, term))
+        .values("paquete_id")
+    )
+
+
+def paquete_labels():
+    """
+    Índice cacheado de paquetes ordenado por nombre: [(id, etiqueta, destinos_texto)].
+    Se construye con una consulta y se invalida al cambiar paquetes o sus destinos.
+    """
+    key = f"paquete_labels:{get_version(PAQUETES)}"
+    labels = cache.get(key)
+    if labels is None:
+        labels = [
+            (pk, f"{nombre} — {destinos}" if destinos else nombre, destinos)
+            for pk, nombre, destinos in (
+                Paquete.objects.order_by("nombre", "pk").values_list("pk", "nombre", "destinos_texto")
+            )
+        ]
+        cache.set(key, labels, None)
+    return labels
+
+
+def paquete_destinos_texto(paquete_id):
+    paquete_id = str(paquete_id)
+    return next((destinos for pk, _label, destinos in paquete_labels() if str(pk) == paquete_id), "")
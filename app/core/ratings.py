@@ -0,0 +1,85 @@
+# core/ratings.py
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Value, When
+from django.db.models.functions import Cast
+from django.db.models.lookups import GreaterThan
+
+from .listas import invalidar_listas
+from .models import Comentario, Paquete
+
+STARS = range(1, 6)
+RATING_FIELDS = ["rating_avg", "rating_count", *(f"rating_{s}" for s in STARS)]
+
+
+def adjust_rating(paquete_id, stars, delta):
+    """
+    Suma `delta` (+1 / -1) comentarios de `stars` estrellas a los agregados del
+    paquete con un único UPDATE (las columnas de la derecha son los valores previos).
+    """
+    count = F("rating_count") + delta
+    weighted = sum(F(f"rating_{s}") * s for s in STARS) + stars * delta
+    Paquete.objects.filter(pk=paquete_id).update(**{
+        f"rating_{stars}": F(f"rating_{stars}") + delta,
+        "rating_count": count,
+        "rating_avg": Case(
+            When(
+                GreaterThan(count, 0),
+                then=Cast(weighted, FloatField()) / Cast(count, FloatField()),
+            ),
+            default=Value(None),
+            output_field=FloatField(),
+        ),
+    })
+
+
+def apply_change(old, new):
+    """`old` / `new`: (paquete_id, calificacion) o None si no existía / ya no existe."""
+    if old == new:
+        return
+    with transaction.atomic():
+        if old:
+            adjust_rating(old[0], old[1], -1)
+        if new:
+            adjust_rating(new[0], new[1], +1)
+
+
+def rebuild_ratings(paquete_ids=None, batch_size=1000):
+    """Recalcula desde Comentario los agregados de todos (o algunos) paquetes."""
+    comentarios = Comentario.objects.all()
+    paquetes = Paquete.objects.order_by("pk")
+    if paquete_ids is not None:
+        comentarios = comentarios.filter(paquete_id__in=paquete_ids)
+        paquetes = paquetes.filter(pk__in=paquete_ids)
+
+    histograms = {}
+    for row in comentarios.values("paquete_id", "calificacion").annotate(n=Count("id")).order_by():
+        histograms.setdefault(row["paquete_id"], {})[row["calificacion"]] = row["n"]
+
+    total = 0
+    batch = []
+    for pk in paquetes.values_list("pk", flat=True):
+        histogram = histograms.get(pk, {})
+        paquete = Paquete(pk=pk, rating_count=sum(histogram.values()))
+        for s in STARS:
+            setattr(paquete, f"rating_{s}", histogram.get(s, 0))
+        paquete.rating_avg = (
+            sum(s * n for s, n in histogram.items()) / paquete.rating_count
+            if paquete.rating_count else None
+        )
+        batch.append(paquete)
+        if len(batch) >= batch_size:
+            total += _flush(batch)
+    total += _flush(batch)
+    if total:
+        invalidar_listas(Paquete)  # bulk_update no envía señales
+    return total
+
+
+def _flush(batch):
+    if not batch:
+        return 0
+    with transaction.atomic():
+        Paquete.objects.bulk_update(batch, RATING_FIELDS)
+    n = len(batch)
+    batch.clear()
+    return n
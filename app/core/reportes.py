@@ -0,0 +1,125 @@
+# core/reportes.py
+from datetime import date
+
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import Destino, MetodoPago, Paquete, PaqueteDestino, VentaDiaria
+
+DIMENSIONES = {
+    "periodo": "Periodo",
+    "destino": "Destino",
+    "empleado": "Colaborador",
+    "paquete": "Paquete",
+    "estado": "Estado",
+    "metodo_pago": "Método de pago",
+}
+MEDIDAS = {"ingresos": "Ingresos", "reservas": "Reservas"}
+GRANOS = {"dia": "Día", "mes": "Mes"}
+TOTAL = "Total"
+SIN_VALOR = "—"
+
+
+def _nombres(model, ids, etiqueta=str):
+    ids = [i for i in ids if pd.notna(i)]
+    return {pk: etiqueta(obj) for pk, obj in model.objects.in_bulk(ids).items()}
+
+
+def _etiqueta(valor, grano):
+    if isinstance(valor, date):
+        return f"{valor:%m/%Y}" if grano == "mes" else f"{valor:%d/%m/%Y}"
+    return str(valor)
+
+
+def _agrupar(qs, dims, grano):
+    """Pre-agrega el rollup en SQL por las dimensiones pedidas (el destino sale del paquete)."""
+    campos = []
+    if "periodo" in dims:
+        qs = qs.annotate(periodo=TruncMonth("dia") if grano == "mes" else F("dia"))
+        campos.append("periodo")
+    for dim in dims:
+        if dim == "destino":
+            campos.append("paquete_id")
+        elif dim in ("empleado", "paquete", "metodo_pago"):
+            campos.append(f"{dim}_id")
+        elif dim == "estado":
+            campos.append("estado")
+    return qs.values(*dict.fromkeys(campos)).annotate(
+        reservas=Sum("reservas"), ingresos=Sum("ingresos")
+    ).order_by()
+
+
+def ventas(filas="periodo", columnas=None, medida="ingresos", grano="mes",
+           desde=None, hasta=None, empleado=None, estado=None):
+    """
+    Pivote de ventas leído solo del rollup VentaDiaria.
+    Devuelve {"columnas": [...], "filas": [(etiqueta, [valores...]), ...]} con totales,
+    o None si no hay datos. Por destino, una reserva cuenta en cada destino de su paquete,
+    así que esas cifras no se suman: los totales se calculan sin repetir reservas.
+    """
+    qs = VentaDiaria.objects.all()
+    if desde:
+        qs = qs.filter(dia__gte=desde)
+    if hasta:
+        qs = qs.filter(dia__lte=hasta)
+    if empleado:
+        qs = qs.filter(empleado=empleado)
+    if estado:
+        qs = qs.filter(estado=estado)
+
+    dims = [d for d in (filas, columnas) if d]
+    df = pd.DataFrame.from_records(list(_agrupar(qs, dims, grano)))
+    if df.empty:
+        return None
+    df["reservas"] = df["reservas"].astype("int64")
+    df["ingresos"] = df["ingresos"].astype("float64")
+
+    if "empleado" in dims:
+        df["empleado"] = df["empleado_id"].map(
+            _nombres(get_user_model(), df["empleado_id"].unique().tolist(), lambda e: e.nombre or e.email)
+        )
+    if "paquete" in dims:
+        df["paquete"] = df["paquete_id"].map(_nombres(Paquete, df["paquete_id"].unique().tolist()))
+    if "metodo_pago" in dims:
+        df["metodo_pago"] = df["metodo_pago_id"].map(_nombres(MetodoPago, df["metodo_pago_id"].unique().tolist()))
+    for dim in dims:
+        if dim not in ("periodo", "destino"):
+            df[dim] = df[dim].fillna(SIN_VALOR)
+
+    # Cada reserva una vez: de aquí salen los totales que cruzan destinos
+    base = df
+    if "destino" in dims:
+        membresia = pd.DataFrame.from_records(
+            list(PaqueteDestino.objects.filter(paquete_id__in=df["paquete_id"].unique().tolist())
+                 .values("paquete_id", "destino_id")),
+            columns=["paquete_id", "destino_id"],
+        )
+        df = df.merge(membresia, on="paquete_id", how="left")
+        df["destino"] = df["destino_id"].map(
+            _nombres(Destino, df["destino_id"].unique().tolist(), lambda d: f"{d.nombre} ({d.pais})")
+        ).fillna(SIN_VALOR)
+
+    tabla = pd.pivot_table(
+        df, index=filas, columns=columnas, values=medida, aggfunc="sum",
+        fill_value=0, margins=True, margins_name=TOTAL,
+    )
+    if "destino" in dims:
+        # Los márgenes que suman varios destinos repetirían reservas: salen de `base`
+        total, otra = base[medida].sum(), columnas if filas == "destino" else filas
+        if filas == "destino":
+            tabla.loc[TOTAL] = base.groupby(otra)[medida].sum() if otra else total
+        else:
+            tabla[TOTAL] = base.groupby(otra)[medida].sum()
+        if columnas:
+            tabla.loc[TOTAL, TOTAL] = total
+        tabla = tabla.astype(df[medida].dtype)
+    encabezados = [_etiqueta(c, grano) for c in tabla.columns] if columnas else [MEDIDAS[medida]]
+    return {
+        "columnas": encabezados,
+        "filas": [
+            (_etiqueta(indice, grano), valores.tolist())
+            for indice, valores in zip(tabla.index, tabla.to_numpy())
+        ],
+    }
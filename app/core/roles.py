@@ -0,0 +1,68 @@
+# core/roles.py
+from collections import OrderedDict
+
+from django.contrib.auth.models import Permission
+
+# Permisos organizados por módulo para la UI de roles
+PERM_TABS = OrderedDict([
+    ("clientes", ("Clientes", {"app": "core", "models": ["cliente"]})),
+    ("paquetes", ("Paquetes", {"app": "core", "models": ["paquete"]})),
+    ("productos", ("Productos", {"app": "core", "models": ["producto"]})),
+    ("proveedores", ("Proveedores", {"app": "core", "models": ["proveedor"]})),
+    ("destinos", ("Destinos", {"app": "core", "models": ["destino"]})),
+    ("reservas", ("Reservas", {"app": "core", "models": ["reserva"]})),
+    ("interacciones", ("Interacciones", {"app": "core", "models": ["interaccion"]})),
+    ("metodopago", ("Métodos de pago", {"app": "core", "models": ["metodopago"]})),
+    ("colaboradores", ("Colaboradores", {"app": "core", "models": ["empleado"]})),
+    ("roles", ("Roles", {"app": "auth", "models": ["group"]})),
+    ("comentarios", ("Comentarios", {"app": "core", "models": ["comentario"]})),
+
+])
+
+# Catálogo en memoria del proceso; los permisos solo cambian con migraciones
+_perm_tabs = None
+
+
+def build_perm_tabs():
+    """Pestañas de permisos para la UI de roles (una sola consulta por proceso)."""
+    global _perm_tabs
+    if _perm_tabs is None:
+        _perm_tabs = _load_perm_tabs()
+    return _perm_tabs
+
+
+def _load_perm_tabs():
+    tab_of = {}
+    apps = set()
+    models = set()
+    for key, (_label, spec) in PERM_TABS.items():
+        apps.add(spec["app"])
+        for model in spec["models"]:
+            models.add(model)
+            tab_of[(spec["app"], model)] = key
+
+    grouped = {key: [] for key in PERM_TABS}
+    perms = (
+        Permission.objects
+        .select_related("content_type")
+        .filter(content_type__app_label__in=apps, content_type__model__in=models)
+        .order_by("content_type__model", "codename")
+    )
+    for perm in perms:
+        key = tab_of.get((perm.content_type.app_label, perm.content_type.model))
+        if key is not None:
+            grouped[key].append(perm)
+
+    return OrderedDict(
+        (key, {"label": label, "perms": tuple(grouped[key])})
+        for key, (label, _spec) in PERM_TABS.items()
+    )
+
+
+def perm_tab_ids():
+    return [perm.pk for tab in build_perm_tabs().values() for perm in tab["perms"]]
+
+
+def clear_perm_tabs(**kwargs):
+    global _perm_tabs
+    _perm_tabs = None
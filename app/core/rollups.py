@@ -0,0 +1,150 @@
+# core/rollups.py
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Reserva, RollupMarca, RollupPendiente, VentaDiaria
+
+VENTAS = "ventas_diarias"
+# Margen hacia atrás desde la marca: cubre reservas cuya transacción confirmó
+# después de que otra posterior ya hubiera avanzado la marca.
+LAG = timedelta(minutes=5)
+BATCH_SIZE = 1000
+DIMENSIONES = ("paquete_id", "empleado_id", "estado", "metodo_pago_id")
+# Campos de Reserva que mueven el rollup: un UPDATE masivo sobre ellos marca sus días
+CAMPOS = {"fecha_reserva", "precio_venta", "paquete", "empleado", "estado", "metodo_pago"}
+
+
+def inicio_dia(dia):
+    """Medianoche local de `dia` como datetime aware."""
+    return timezone.make_aware(datetime.combine(dia, time.min))
+
+
+def _tramos(dias):
+    """[d1, d2, d3, d7] -> [(d1, d3), (d7, d7)]: rangos de días consecutivos."""
+    tramos = []
+    for dia in sorted(dias):
+        if tramos and dia == tramos[-1][1] + timedelta(days=1):
+            tramos[-1] = (tramos[-1][0], dia)
+        else:
+            tramos.append((dia, dia))
+    return tramos
+
+
+def _reservas_de_dias(dias):
+    """Filtro de Reserva por días locales como rangos semiabiertos (usa el índice, no __date)."""
+    condicion = Q()
+    for desde, hasta in _tramos(dias):
+        condicion |= Q(fecha_reserva__gte=inicio_dia(desde), fecha_reserva__lt=inicio_dia(hasta + timedelta(days=1)))
+    return Reserva.objects.filter(condicion)
+
+
+def _agregar(reservas):
+    return (
+        reservas
+        .annotate(dia=TruncDate("fecha_reserva"))
+        .values("dia", *DIMENSIONES)
+        .annotate(n=Count("id"), total=Sum("precio_venta"))
+        .order_by()
+    )
+
+
+def _escribir(reservas, rollups):
+    """Reemplaza las filas `rollups` por la agregación de `reservas` (misma ventana) y las devuelve."""
+    filas = [
+        VentaDiaria(
+            dia=row["dia"],
+            paquete_id=row["paquete_id"],
+            empleado_id=row["empleado_id"],
+            estado=row["estado"],
+            metodo_pago_id=row["metodo_pago_id"],
+            reservas=row["n"],
+            ingresos=row["total"] or 0,
+        )
+        for row in _agregar(reservas)
+    ]
+    rollups.delete()
+    VentaDiaria.objects.bulk_create(filas, batch_size=BATCH_SIZE)
+    return filas
+
+
+def recalcular_dias(dias):
+    """Recalcula por completo los días locales indicados. Devuelve las filas escritas."""
+    dias = sorted(set(dias))
+    escritas = 0
+    for start in range(0, len(dias), BATCH_SIZE):
+        lote = dias[start:start + BATCH_SIZE]
+        with transaction.atomic():
+            escritas += len(_escribir(_reservas_de_dias(lote), VentaDiaria.objects.filter(dia__in=lote)))
+    return escritas
+
+
+def marcar_pendiente(*fechas):
+    """Anota los días (locales) de `fechas` para el próximo refresco."""
+    marcar_dias({timezone.localdate(f) for f in fechas if f})
+
+
+def marcar_dias(dias):
+    RollupPendiente.objects.bulk_create([RollupPendiente(dia=d) for d in set(dias)], ignore_conflicts=True)
+
+
+def dias_de(reservas):
+    """Días locales distintos de un queryset de Reserva, agrupados en SQL."""
+    return set(
+        reservas.annotate(dia=TruncDate("fecha_reserva")).values_list("dia", flat=True).order_by().distinct()
+    )
+
+
+def refrescar(lag=LAG):
+    """
+    Refresco incremental:
+    - días con reservas nuevas desde la marca de agua (menos `lag`);
+    - días marcados como pendientes por ediciones y borrados.
+    Sin marca previa reconstruye todo.
+    """
+    marca, _ = RollupMarca.objects.get_or_create(nombre=VENTAS)
+    if marca.marca is None:
+        return reconstruir()
+
+    nuevas = Reserva.objects.filter(fecha_reserva__gte=marca.marca - lag)
+    ultima = nuevas.aggregate(ultima=Max("fecha_reserva"))["ultima"]
+    dias = set()
+    if ultima is not None:
+        dias.update(dias_de(nuevas))
+    with transaction.atomic():
+        pendientes = RollupPendiente.objects.select_for_update()
+        dias.update(pendientes.values_list("dia", flat=True))
+        pendientes.delete()
+        escritas = recalcular_dias(dias)
+        marca.marca = max(marca.marca, ultima) if ultima else marca.marca
+        marca.actualizado = timezone.now()
+        marca.save()
+    return {"dias": len(dias), "filas": escritas}
+
+
+def reconstruir(desde=None, hasta=None):
+    """Recalcula el rollup entre los días `desde` y `hasta` (incluidos); sin límites, todo."""
+    reservas, rollups = Reserva.objects.all(), VentaDiaria.objects.all()
+    if desde:
+        reservas = reservas.filter(fecha_reserva__gte=inicio_dia(desde))
+        rollups = rollups.filter(dia__gte=desde)
+    if hasta:
+        reservas = reservas.filter(fecha_reserva__lt=inicio_dia(hasta + timedelta(days=1)))
+        rollups = rollups.filter(dia__lte=hasta)
+    with transaction.atomic():
+        marca, _ = RollupMarca.objects.select_for_update().get_or_create(nombre=VENTAS)
+        pendientes = RollupPendiente.objects.all()
+        if desde:
+            pendientes = pendientes.filter(dia__gte=desde)
+        if hasta:
+            pendientes = pendientes.filter(dia__lte=hasta)
+        pendientes.delete()
+        filas = _escribir(reservas, rollups)
+        if not desde and not hasta:
+            marca.marca = Reserva.objects.aggregate(ultima=Max("fecha_reserva"))["ultima"] or timezone.now()
+        marca.actualizado = timezone.now()
+        marca.save()
+    return {"dias": len({f.dia for f in filas}), "filas": len(filas)}
@@ -0,0 +1,190 @@
+# core/search.py
+import re
+
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models import Q
+from unidecode import unidecode
+
+from .cambios import SeguimientoQuerySet
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+MAX_TERM_LENGTH = 64
+BATCH_SIZE = 500
+
+
+def normalize(value) -> str:
+    """'José Pérez' -> 'jose perez' (sin acentos, minúsculas, solo alfanuméricos)."""
+    if value is None:
+        return ""
+    return " ".join(_NON_ALNUM.split(unidecode(str(value)).lower())).strip()
+
+
+def tokenize(value) -> set:
+    return {t[:MAX_TERM_LENGTH] for t in normalize(value).split()}
+
+
+def _prefix_range(term):
+    # Los términos son ASCII [a-z0-9]: "jos" <= x < "jot" equivale a "empieza por jos"
+    # y, a diferencia de LIKE, siempre puede usar el índice.
+    return term, term[:-1] + chr(ord(term[-1]) + 1)
+
+
+def _term_model():
+    return apps.get_model("core", "TerminoBusqueda")
+
+
+def matching_ids(model, term):
+    """Subconsulta con los ids de `model` que tienen algún término que empieza por `term`."""
+    low, high = _prefix_range(term)
+    return (
+        _term_model().objects
+        .filter(modelo=model._meta.label_lower, termino__gte=low, termino__lt=high)
+        .values("objeto_id")
+    )
+
+
+def search(queryset, q, related=(), extra=()):
+    """
+    Filtra `queryset` por el texto `q` usando el índice de términos.
+    - Cada palabra de `q` debe coincidir (AND), por prefijo y sin importar acentos.
+    - `related`: FKs cuyos textos también cuentan, p. ej. ("cliente", "paquete").
+    - `extra`: funciones término -> Q para otras coincidencias (p. ej. M2M).
+    """
+    model = queryset.model
+    for term in sorted(tokenize(q)):
+        condition = Q(pk__in=matching_ids(model, term))
+        for path in related:
+            related_model = model._meta.get_field(path).related_model
+            condition |= Q(**{f"{path}__in": matching_ids(related_model, term)})
+        for build in extra:
+            condition |= build(term)
+        queryset = queryset.filter(condition)
+    return queryset
+
+
+def index_objects(model, objs, using=None):
+    """Reemplaza los términos indexados de `objs` (ya guardados) por los de su `busqueda`."""
+    Termino = _term_model()
+    label = model._meta.label_lower
+    objs = [o for o in objs if o.pk is not None]
+    manager = Termino.objects.db_manager(using)
+    for start in range(0, len(objs), BATCH_SIZE):
+        chunk = objs[start:start + BATCH_SIZE]
+        manager.filter(modelo=label, objeto_id__in=[o.pk for o in chunk]).delete()
+        manager.bulk_create(
+            [
+                Termino(modelo=label, objeto_id=o.pk, termino=t)
+                for o in chunk
+                for t in tokenize(o.busqueda)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+
+def unindex_objects(model, pks, using=None):
+    manager = _term_model().objects.db_manager(using)
+    pks = list(pks)
+    for start in range(0, len(pks), BATCH_SIZE):
+        manager.filter(modelo=model._meta.label_lower, objeto_id__in=pks[start:start + BATCH_SIZE]).delete()
+
+
+class SearchManager(models.Manager):
+    """Manager por defecto: `busqueda` solo se escribe, así que no se lee en cada consulta."""
+
+    def get_queryset(self):
+        return super().get_queryset().defer("busqueda")
+
+
+class SearchQuerySet(SeguimientoQuerySet):
+    """Mantiene `busqueda` y el índice de términos también en operaciones masivas."""
+
+    @classmethod
+    def as_manager(cls):
+        manager = SearchManager.from_queryset(cls)()
+        manager._built_with_as_manager = True
+        return manager
+
+    as_manager.queryset_only = True
+
+    def _touches_search(self, fields):
+        return bool(set(fields) & set(self.model.search_fields))
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.busqueda = obj.build_search_text()
+        with transaction.atomic(using=self.db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            index_objects(self.model, created, using=self.db)
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if not self._touches_search(fields):
+            return super().bulk_update(objs, fields, *args, **kwargs)
+        objs = list(objs)
+        for obj in objs:
+            obj.busqueda = obj.build_search_text()
+        with transaction.atomic(using=self.db):
+            rows = super().bulk_update(objs, [*fields, "busqueda"], *args, **kwargs)
+            index_objects(self.model, objs, using=self.db)
+        return rows
+
+    def update(self, **kwargs):
+        if not self._touches_search(kwargs):
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list("pk", flat=True))
+            rows = super().update(**kwargs)
+            type(self)(self.model, using=self.db).filter(pk__in=pks).reindex()
+        return rows
+
+    def reindex(self, batch_size=2000):
+        """Recalcula `busqueda` y los términos de las filas del queryset."""
+        total = 0
+        base = self.model._base_manager.using(self.db)
+        last_pk = None
+        while True:
+            batch = self.order_by("pk")
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            objs = list(batch[:batch_size])
+            if not objs:
+                return total
+            for obj in objs:
+                obj.busqueda = obj.build_search_text()
+            with transaction.atomic(using=self.db):
+                base.bulk_update(objs, ["busqueda"])
+                index_objects(self.model, objs, using=self.db)
+            total += len(objs)
+            last_pk = objs[-1].pk
+
+
+class SearchableModel(models.Model):
+    """
+    Modelo con columna sombra `busqueda` (texto normalizado de `search_fields`).
+    Al guardar se actualizan la columna y sus términos en TerminoBusqueda.
+    """
+    search_fields = ()
+
+    busqueda = models.TextField(default="", blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def build_search_text(self):
+        return " ".join(
+            filter(None, (normalize(getattr(self, name)) for name in self.search_fields))
+        )
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not set(update_fields) & set(self.search_fields):
+            return super().save(*args, **kwargs)
+        self.busqueda = self.build_search_text()
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "busqueda"}
+        using = kwargs.get("using") or self._state.db
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+            index_objects(type(self), [self], using=self._state.db)
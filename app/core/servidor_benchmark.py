@@ -0,0 +1,43 @@
+# core/servidor_benchmark.py
+"""
+Aplicaciones para `manage.py benchmark_asgi`: las mismas de app/wsgi.py y app/asgi.py,
+con la latencia de base simulada que indique BENCHMARK_LATENCIA_DB (ms por consulta).
+- gunicorn "core.servidor_benchmark:wsgi()"
+- uvicorn core.servidor_benchmark:asgi --factory
+"""
+import os
+import time
+
+from django.db.backends.signals import connection_created
+
+
+def simular_latencia(ms):
+    """Añade `ms` de espera a cada consulta, como el viaje de red a un servidor de base de datos."""
+    def esperar(execute, sql, params, many, context):
+        time.sleep(ms / 1000)
+        return execute(sql, params, many, context)
+
+    def instalar(sender, connection, **kwargs):
+        if esperar not in connection.execute_wrappers:
+            connection.execute_wrappers.append(esperar)
+
+    connection_created.connect(instalar, weak=False)
+
+
+def _preparar():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+    latencia = float(os.environ.get("BENCHMARK_LATENCIA_DB") or 0)
+    if latencia:
+        simular_latencia(latencia)
+
+
+def wsgi():
+    _preparar()
+    from django.core.wsgi import get_wsgi_application
+    return get_wsgi_application()
+
+
+def asgi():
+    _preparar()
+    from django.core.asgi import get_asgi_application
+    return get_asgi_application()
@@ -0,0 +1,234 @@
+# core/signals.py
+from django.apps import apps
+from django.contrib.auth.models import Group, Permission
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_migrate, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+
+from .cache import PAQUETES, PERMISSIONS, bump_version
+from .roles import clear_perm_tabs
+
+from .models import (
+    Cliente, Comentario, Destino, Empleado, Interaccion, Paquete, PaqueteDestino, Producto,
+    Proveedor, Reserva,
+)
+from .cambios import SeguimientoModel, mueve_marca, tocar
+from . import imagenes
+from .indicadores import CONTADOS, adjust, apply_reserva_change
+from .listas import DEPENDENCIAS, invalidar_listas
+from .paquete_destinos import paquetes_de_productos, refresh_paquete_destinos
+from .ratings import apply_change
+from .rollups import marcar_pendiente
+from .search import unindex_objects
+
+
+# ===== Índice de búsqueda =====
+
+def drop_search_terms(sender, instance, using, **kwargs):
+    unindex_objects(sender, [instance.pk], using=using)
+
+
+for _model in (Cliente, Empleado, Proveedor, Destino, Producto, Paquete, Reserva, Interaccion):
+    post_delete.connect(drop_search_terms, sender=_model, dispatch_uid=f"busqueda-{_model.__name__}")
+
+
+# ===== Destinos por paquete =====
+
+@receiver(m2m_changed, sender=Paquete.productos.through)
+def paquete_productos_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        # producto.paquetes.clear(): después ya no se sabe qué paquetes tenía
+        instance._paquetes_previos = list(paquetes_de_productos([instance.pk]))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        refresh_paquete_destinos([instance.pk])
+    elif action == "post_clear":
+        refresh_paquete_destinos(getattr(instance, "_paquetes_previos", []))
+    else:
+        refresh_paquete_destinos(pk_set or [])
+
+
+@receiver(post_save, sender=Producto)
+def producto_saved(sender, instance, created, **kwargs):
+    if not created:
+        refresh_paquete_destinos(paquetes_de_productos([instance.pk]))
+
+
+@receiver(pre_delete, sender=Producto)
+def producto_pre_delete(sender, instance, **kwargs):
+    instance._paquetes_previos = list(paquetes_de_productos([instance.pk]))
+
+
+@receiver(post_delete, sender=Producto)
+def producto_deleted(sender, instance, **kwargs):
+    refresh_paquete_destinos(getattr(instance, "_paquetes_previos", []))
+
+
+@receiver(post_save, sender=Destino)
+def destino_saved(sender, instance, created, **kwargs):
+    if not created:
+        refresh_paquete_destinos(
+            PaqueteDestino.objects.filter(destino=instance).values_list("paquete_id", flat=True)
+        )
+
+
+# Índice de etiquetas de paquetes (core/paquete_destinos.paquete_labels)
+@receiver(post_save, sender=Paquete, dispatch_uid="paquete-labels-guardado")
+@receiver(post_delete, sender=Paquete, dispatch_uid="paquete-labels-borrado")
+def invalidate_paquete_labels(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(PAQUETES))
+
+
+# ===== Marcas de modificación por tabla (core/cambios.py) =====
+
+def touch_tabla(sender, update_fields=None, **kwargs):
+    if mueve_marca(sender, update_fields):
+        tocar(sender)
+
+
+for _model in apps.get_app_config("core").get_models():
+    if issubclass(_model, SeguimientoModel):
+        post_save.connect(touch_tabla, sender=_model, dispatch_uid=f"cambios-{_model.__name__}-guardado")
+        post_delete.connect(touch_tabla, sender=_model, dispatch_uid=f"cambios-{_model.__name__}-borrado")
+
+
+@receiver(m2m_changed, sender=Paquete.productos.through, dispatch_uid="cambios-paquete-productos")
+def paquete_productos_touch(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        tocar(Paquete)
+
+
+# ===== Listados de catálogo en caché (core/listas.py) =====
+
+def invalidate_listas(sender, **kwargs):
+    invalidar_listas(sender)
+
+
+for _nombre in sorted({m for modelos in DEPENDENCIAS.values() for m in modelos}):
+    _model = apps.get_model("core", _nombre)
+    post_save.connect(invalidate_listas, sender=_model, dispatch_uid=f"listas-{_nombre}-guardado")
+    post_delete.connect(invalidate_listas, sender=_model, dispatch_uid=f"listas-{_nombre}-borrado")
+
+
+@receiver(m2m_changed, sender=Paquete.productos.through, dispatch_uid="listas-paquete-productos")
+def paquete_productos_listas(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidar_listas(Paquete)
+
+
+# ===== Calificaciones de paquetes =====
+
+@receiver(pre_save, sender=Comentario)
+def comentario_pre_save(sender, instance, **kwargs):
+    instance._rating_previo = None
+    if instance.pk:
+        instance._rating_previo = (
+            Comentario.objects.filter(pk=instance.pk).values_list("paquete_id", "calificacion").first()
+        )
+
+
+@receiver(post_save, sender=Comentario)
+def comentario_saved(sender, instance, **kwargs):
+    apply_change(instance._rating_previo, (instance.paquete_id, instance.calificacion))
+
+
+@receiver(post_delete, sender=Comentario)
+def comentario_deleted(sender, instance, **kwargs):
+    apply_change((instance.paquete_id, instance.calificacion), None)
+
+
+# ===== Indicadores del dashboard (core/indicadores.py) y rollups (core/rollups.py) =====
+
+def _contador(clave):
+    def saved(sender, instance, created, **kwargs):
+        if created:
+            adjust(clave, 1)
+
+    def deleted(sender, instance, **kwargs):
+        adjust(clave, -1)
+
+    return saved, deleted
+
+
+for _clave, _model in CONTADOS.items():
+    _saved, _deleted = _contador(_clave)
+    post_save.connect(_saved, sender=_model, weak=False, dispatch_uid=f"indicador-{_clave}-guardado")
+    post_delete.connect(_deleted, sender=_model, weak=False, dispatch_uid=f"indicador-{_clave}-borrado")
+
+
+def _reserva_valores(reserva):
+    return reserva.estado, reserva.precio_venta, reserva.fecha_reserva
+
+
+@receiver(pre_save, sender=Reserva)
+def reserva_pre_save(sender, instance, **kwargs):
+    instance._indicador_previo = None
+    if instance.pk:
+        instance._indicador_previo = (
+            Reserva.objects.filter(pk=instance.pk).values_list("estado", "precio_venta", "fecha_reserva").first()
+        )
+
+
+@receiver(post_save, sender=Reserva)
+def reserva_saved(sender, instance, created, **kwargs):
+    apply_reserva_change(instance._indicador_previo, _reserva_valores(instance))
+    if not created:
+        # Las altas las recoge la marca de agua; las ediciones recalculan su día
+        marcar_pendiente(instance.fecha_reserva)
+
+
+@receiver(post_delete, sender=Reserva)
+def reserva_deleted(sender, instance, **kwargs):
+    apply_reserva_change(_reserva_valores(instance), None)
+    marcar_pendiente(instance.fecha_reserva)
+
+
+# ===== Caché de permisos (core/backends.py) =====
+
+def invalidate_permissions(**kwargs):
+    transaction.on_commit(lambda: bump_version(PERMISSIONS))
+
+
+m2m_changed.connect(invalidate_permissions, sender=Group.permissions.through, dispatch_uid="perms-grupo")
+m2m_changed.connect(invalidate_permissions, sender=Empleado.groups.through, dispatch_uid="perms-empleado-grupos")
+m2m_changed.connect(
+    invalidate_permissions, sender=Empleado.user_permissions.through, dispatch_uid="perms-empleado-permisos"
+)
+post_save.connect(invalidate_permissions, sender=Group, dispatch_uid="perms-grupo-guardado")
+post_delete.connect(invalidate_permissions, sender=Group, dispatch_uid="perms-grupo-borrado")
+post_delete.connect(invalidate_permissions, sender=Permission, dispatch_uid="perms-permiso-borrado")
+def invalidate_permissions_migrate(apps, **kwargs):
+    try:
+        apps.get_model("core", "VersionCache")
+    except LookupError:
+        return  # migraciones de core sin aplicar (o revertidas): no hay tabla de versiones
+    invalidate_permissions()
+
+
+post_migrate.connect(invalidate_permissions_migrate, dispatch_uid="perms-migrate")
+
+# Catálogo de permisos de la UI de roles (core/roles.py)
+post_migrate.connect(clear_perm_tabs, dispatch_uid="perm-tabs-migrate")
+post_save.connect(clear_perm_tabs, sender=Permission, dispatch_uid="perm-tabs-guardado")
+post_delete.connect(clear_perm_tabs, sender=Permission, dispatch_uid="perm-tabs-borrado")
+
+
+# ===== Variantes de imágenes (core/imagenes.py) =====
+
+@receiver(post_save, sender=Empleado)
+def empleado_imagenes(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    for campo in imagenes.pendientes(instance):
+        transaction.on_commit(lambda campo=campo: imagenes.encolar(instance.pk, campo))
+
+
+@receiver(post_delete, sender=Empleado)
+def empleado_imagenes_borradas(sender, instance, **kwargs):
+    sobrantes = [n for d in (instance.imagenes or {}).values() for n in imagenes.archivos(d)]
+    if sobrantes:
+        transaction.on_commit(lambda: imagenes.borrar(sobrantes))
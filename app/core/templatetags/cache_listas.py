@@ -0,0 +1,30 @@
+from django import template
+from django.core.cache import cache
+
+from core.listas import TIMEOUT
+
+register = template.Library()
+
+
+class ListaCacheadaNode(template.Node):
+    def __init__(self, nodelist):
+        self.nodelist = nodelist
+
+    def render(self, context):
+        # La vista ya encontró el HTML: no se evalúa ni una consulta del bloque
+        html = context.get("lista_cacheada")
+        if html is not None:
+            return html
+        html = self.nodelist.render(context)
+        key = context.get("lista_cache_key")
+        if key:
+            cache.set(key, html, TIMEOUT)
+        return html
+
+
+@register.tag
+def lista_cacheada(parser, token):
+    """{% lista_cacheada %}...{% endlista_cacheada %}: contenido guardado por CachedListMixin."""
+    nodelist = parser.parse(("endlista_cacheada",))
+    parser.delete_first_token()
+    return ListaCacheadaNode(nodelist)
@@ -0,0 +1,15 @@
+from django import template
+
+from core import estaticos
+
+register = template.Library()
+
+
+@register.simple_tag
+def bundle(layout, tipo):
+    """
+    Enlaces de un layout de core/estaticos.BUNDLES: el bundle armado o, sin
+    `manage.py construir_estaticos`, los archivos sueltos desde su CDN.
+        {% bundle "base" "css" %}
+    """
+    return estaticos.etiquetas(layout, tipo)
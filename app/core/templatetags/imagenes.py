@@ -0,0 +1,46 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+
+from core import imagenes
+
+register = template.Library()
+
+
+def _srcset(datos, extension):
+    return ", ".join(f"{default_storage.url(d[extension])} {d['ancho']}w" for d in datos)
+
+
+@register.simple_tag
+def imagen_variante(objeto, campo, variante=None, clase="", alt="", sizes="100vw"):
+    """
+    <picture> con la variante pedida (o todas, como srcset) en WebP y JPEG.
+    Vacío si aún no hay variantes: la plantilla muestra su alternativa, nunca el original.
+        {% imagen_variante request.user "imagen" "miniatura" clase="img-circle" %}
+        {% imagen_variante empleado "cover" sizes="(max-width: 768px) 100vw, 50vw" %}
+    """
+    disponibles = imagenes.variantes(objeto, campo)
+    if variante:
+        datos = [disponibles[variante]] if variante in disponibles else []
+    else:
+        datos = sorted(disponibles.values(), key=lambda d: d["ancho"])
+    if not datos:
+        return ""
+    preferido, respaldo = imagenes.FORMATOS[0][0], imagenes.FORMATOS[-1][0]
+    mayor = datos[-1]
+    if variante:
+        fuentes = format_html(
+            '<source type="image/{}" srcset="{}">', preferido, default_storage.url(mayor[preferido])
+        )
+        atributos = format_html('src="{}"', default_storage.url(mayor[respaldo]))
+    else:
+        fuentes = format_html(
+            '<source type="image/{}" srcset="{}" sizes="{}">', preferido, _srcset(datos, preferido), sizes
+        )
+        atributos = format_html(
+            'src="{}" srcset="{}" sizes="{}"', default_storage.url(mayor[respaldo]), _srcset(datos, respaldo), sizes
+        )
+    return format_html(
+        '<picture>{}<img {} width="{}" height="{}" class="{}" alt="{}" loading="lazy" decoding="async"></picture>',
+        fuentes, atributos, mayor["ancho"], mayor["alto"], clase, alt,
+    )
@@ -0,0 +1,60 @@
+from django import template
+from django.contrib.auth.context_processors import PermWrapper
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from core.cache import PERMISSIONS, get_version
+
+register = template.Library()
+
+TIMEOUT = 60 * 60
+# Partes de base.html que solo dependen del rol y de la sección activa
+FRAGMENTOS = {
+    "superior": "includes/nav_superior.html",
+    "lateral": "includes/nav_lateral.html",
+    "modulo": "includes/nav_modulo.html",
+}
+# Permisos que consultan los fragmentos; si se usa otro `perms`, hay que añadirlo aquí
+PERMISOS = ("auth.view_group", "core.view_empleado")
+
+
+def seccion(request):
+    """(namespace, url_name) que marcan el menú activo; url_name solo fuera de un namespace."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "", ""
+    return match.namespace, "" if match.namespace else match.url_name or ""
+
+
+def rol(user):
+    """Lo que distingue el menú de un usuario a otro: los PERMISOS que tiene."""
+    if user.is_superuser:
+        return "su"
+    return "".join("1" if user.has_perm(p) else "0" for p in PERMISOS)
+
+
+def nav_cache_key(user, ns, url_name):
+    # Con la versión de permisos: cambiar roles invalida todos los menús
+    return f"nav:{get_version(PERMISSIONS)}:{rol(user)}:{ns}:{url_name}"
+
+
+def renderizar(user, ns, url_name):
+    contexto = {"ns": ns, "url_name": url_name, "perms": PermWrapper(user)}
+    return {nombre: render_to_string(plantilla, contexto) for nombre, plantilla in FRAGMENTOS.items()}
+
+
+@register.simple_tag(takes_context=True)
+def navegacion(context):
+    """{% navegacion as nav %}: los FRAGMENTOS ya renderizados, con una lectura de caché."""
+    request = context.get("request")
+    user = context.get("user") or getattr(request, "user", None)
+    ns, url_name = seccion(request)
+    if user is None:
+        return {nombre: "" for nombre in FRAGMENTOS}
+    key = nav_cache_key(user, ns, url_name)
+    nav = cache.get(key)
+    if nav is None:
+        nav = renderizar(user, ns, url_name)
+        cache.set(key, nav, TIMEOUT)
+    return {nombre: mark_safe(html) for nombre, html in nav.items()}
@@ -1,3 +1,896 @@
-from django.test import TestCase
+import io
+import re
+import shutil
+import tempfile
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.http import Http404
+from django.test import AsyncRequestFactory, Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.views.generic import ListView
+
+from . import async_views, reportes, rollups, trabajos, views
+from .cache import PERMISSIONS, VERSIONES_TTL, get_version, olvidar_versiones
+from .db import router as router_replica
+from .db.router import ReplicaRouter
+from .importacion import importar
+from .indicadores import clave_ingresos, recalcular_indicadores, snapshot
+from .models import (
+    Cliente, Comentario, Destino, Empleado, Indicador, MetodoPago, Paquete, PaqueteDestino, Producto, Proveedor,
+    Reserva, RollupMarca, RollupPendiente, TerminoBusqueda, Trabajo, VentaDiaria, VersionCache, almacen_trabajos,
+)
+from .pagination import KeysetPaginationMixin, decode_cursor, encode_cursor
+from .paquete_destinos import paquete_search_terms
+from .ratings import rebuild_ratings
+from .search import MAX_TERM_LENGTH, normalize, search, tokenize
+
+
+class CacheTestCase(TestCase):
+    """Caché y versiones en memoria vacías: la base se deshace entre pruebas, ellas no."""
+
+    def setUp(self):
+        cache.clear()
+        olvidar_versiones()
+
+
+class DestinoKeysetView(KeysetPaginationMixin, ListView):
+    model = Destino
+    # Orden mixto con empates en el primer campo
+    keyset_fields = ("pais", "-id")
+
+
+def pagina(params=None, page_size=4):
+    view = DestinoKeysetView()
+    view.setup(RequestFactory().get("/", params or {}))
+    _paginator, page, rows, _hay_mas = view.paginate_queryset(view.get_queryset(), page_size)
+    return page, [obj.pk for obj in rows]
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(10):
+            Destino.objects.create(nombre=f"Ciudad {i}", pais=("México", "Perú", "Chile")[i % 3])
+        cls.orden = list(Destino.objects.order_by("pais", "-id").values_list("pk", flat=True))
+
+    def test_cursor_ida_y_vuelta(self):
+        fecha = datetime(2024, 5, 1, 12, 30, tzinfo=dt_timezone.utc)
+        direccion, valores = decode_cursor(encode_cursor("n", [fecha, Decimal("10.50"), 7]))
+        self.assertEqual(direccion, "n")
+        self.assertEqual(valores, [fecha.isoformat(), "10.50", 7])
+
+    def test_cursor_invalido(self):
+        for cursor in ("", "no-es-base64!", encode_cursor("x", [1])):
+            self.assertIsNone(decode_cursor(cursor))
+        page, ids = pagina({"cursor": "basura"})
+        self.assertEqual(ids, self.orden[:4])
+        self.assertFalse(page.has_previous())
+
+    def test_recorrido_hacia_adelante(self):
+        vistos, params = [], {}
+        while True:
+            page, ids = pagina(params)
+            vistos += ids
+            if not page.has_next():
+                break
+            params = {"cursor": page.next_cursor}
+        self.assertEqual(vistos, self.orden)
+
+    def test_volver_atras(self):
+        primera, _ids = pagina()
+        segunda, ids_segunda = pagina({"cursor": primera.next_cursor})
+        tercera, _ids = pagina({"cursor": segunda.next_cursor})
+        atras, ids_atras = pagina({"cursor": tercera.previous_cursor})
+        self.assertEqual(ids_atras, ids_segunda)
+        # Desde la segunda página se vuelve a la primera completa
+        inicio, ids_inicio = pagina({"cursor": atras.previous_cursor})
+        self.assertEqual(ids_inicio, self.orden[:4])
+        self.assertFalse(inicio.has_previous())
+
+    def test_page_clasica(self):
+        _page, ids = pagina({"page": "2"})
+        self.assertEqual(ids, self.orden[4:8])
+
+
+class BusquedaTests(TestCase):
+    def test_busqueda_no_se_lee_pero_se_mantiene(self):
+        cliente = Cliente.objects.create(nombre="José Pérez", email="jose@example.com")
+        cliente = Cliente.objects.get(pk=cliente.pk)
+        self.assertIn("busqueda", cliente.get_deferred_fields())
+        self.assertIn("busqueda", Empleado.objects.all().query.deferred_loading[0])
+
+        cliente.nombre = "Josefina Pérez"
+        with self.assertNumQueries(0):
+            cliente.build_search_text()
+        cliente.save()
+        self.assertEqual(
+            Cliente._base_manager.get(pk=cliente.pk).busqueda, "josefina perez jose example com"
+        )
+        self.assertEqual(list(search(Cliente.objects.all(), "josef")), [cliente])
+
+    def test_normalizacion(self):
+        self.assertEqual(normalize("  José PÉREZ-Núñez, 3º "), "jose perez nunez 3o")
+        self.assertEqual(normalize(None), "")
+        self.assertEqual(tokenize("Ñandú ñandu " + "x" * 80), {"nandu", "x" * MAX_TERM_LENGTH})
+
+    def terminos(self, obj):
+        return set(
+            TerminoBusqueda.objects.filter(modelo=obj._meta.label_lower, objeto_id=obj.pk)
+            .values_list("termino", flat=True)
+        )
+
+    def test_terminos_al_guardar_y_borrar(self):
+        destino = Destino.objects.create(nombre="Mérida", pais="México")
+        self.assertEqual(self.terminos(destino), {"merida", "mexico"})
+        destino.nombre = "Cancún"
+        destino.save(update_fields=["nombre"])
+        self.assertEqual(self.terminos(destino), {"cancun", "mexico"})
+        pk = destino.pk
+        destino.delete()
+        self.assertFalse(TerminoBusqueda.objects.filter(modelo="core.destino", objeto_id=pk).exists())
+
+    def test_operaciones_masivas(self):
+        a, b = Destino.objects.bulk_create(
+            [Destino(nombre="Tulum", pais="México"), Destino(nombre="Lima", pais="Perú")]
+        )
+        Destino.objects.filter(pk=a.pk).update(pais="Mexico Caribe")
+        self.assertEqual(self.terminos(a), {"tulum", "mexico", "caribe"})
+        b.nombre = "Cusco"
+        Destino.objects.bulk_update([b], ["nombre"])
+        self.assertEqual(self.terminos(b), {"cusco", "peru"})
+
+    def test_busqueda_por_prefijo_y_relaciones(self):
+        cliente = Cliente.objects.create(nombre="Ana Ávila", email="ana@example.com")
+        otra = Cliente.objects.create(nombre="Ana Ruiz", email="ruiz@example.com")
+        paquete = Paquete.objects.create(nombre="Cancún 5 noches", precio_final=Decimal("900"))
+        empleado = Empleado.objects.create_user("eva@example.com", "Eva", "x")
+        datos = {"paquete": paquete, "empleado": empleado, "precio_venta": Decimal("900")}
+        reserva = Reserva.objects.create(cliente=cliente, **datos)
+        Reserva.objects.create(cliente=otra, **datos)
+
+        # Todas las palabras, por prefijo y sin acentos
+        self.assertEqual(list(search(Cliente.objects.all(), "ANA avi")), [cliente])
+        self.assertEqual(set(search(Cliente.objects.all(), "an")), {cliente, otra})
+        self.assertFalse(search(Cliente.objects.all(), "ana lopez").exists())
+        self.assertEqual(list(search(Reserva.objects.all(), "avila cancun", related=("cliente", "paquete"))), [reserva])
+
+
+class PaqueteDestinoTests(TestCase):
+    def setUp(self):
+        self.cancun = Destino.objects.create(nombre="Cancún", pais="México")
+        self.lima = Destino.objects.create(nombre="Lima", pais="Perú")
+        self.hotel = Producto.objects.create(nombre="Hotel Playa", tipo="Hotel", destino=self.cancun)
+        self.tour = Producto.objects.create(nombre="Tour Centro", tipo="Tour", destino=self.lima)
+        self.paquete = Paquete.objects.create(nombre="Combo", precio_final=Decimal("900"))
+
+    def destinos(self):
+        self.paquete.refresh_from_db()
+        ids = set(PaqueteDestino.objects.filter(paquete=self.paquete).values_list("destino_id", flat=True))
+        return ids, self.paquete.destinos_texto
+
+    def test_altas_y_bajas_de_productos(self):
+        self.paquete.productos.add(self.hotel, self.tour)
+        self.assertEqual(self.destinos(), ({self.cancun.pk, self.lima.pk}, "Cancún, Lima"))
+        self.paquete.productos.remove(self.tour)
+        self.assertEqual(self.destinos(), ({self.cancun.pk}, "Cancún"))
+        self.hotel.paquetes.clear()  # desde el lado del producto
+        self.assertEqual(self.destinos(), (set(), ""))
+
+    def test_cambios_en_producto_y_destino(self):
+        self.paquete.productos.add(self.hotel)
+        self.hotel.destino = self.lima
+        self.hotel.save()
+        self.assertEqual(self.destinos(), ({self.lima.pk}, "Lima"))
+
+        self.lima.nombre = "Lima Metropolitana"
+        self.lima.save()
+        self.assertEqual(self.destinos(), ({self.lima.pk}, "Lima Metropolitana"))
+        self.assertEqual(list(search(Paquete.objects.all(), "metropol", extra=(paquete_search_terms,))), [self.paquete])
+
+        self.hotel.delete()
+        self.assertEqual(self.destinos(), (set(), ""))
+
+
+class CalificacionesTests(TestCase):
+    def setUp(self):
+        self.autor = Empleado.objects.create_user("ana@example.com", "Ana", "x")
+        self.playa = Paquete.objects.create(nombre="Playa", precio_final=Decimal("900"))
+        self.sierra = Paquete.objects.create(nombre="Sierra", precio_final=Decimal("700"))
+
+    def comentar(self, paquete, calificacion):
+        return Comentario.objects.create(paquete=paquete, autor=self.autor, texto="ok", calificacion=calificacion)
+
+    def agregados(self, paquete):
+        return Paquete.objects.values_list("rating_count", "rating_avg", "rating_4", "rating_5").get(pk=paquete.pk)
+
+    def test_alta_edicion_y_borrado(self):
+        primero = self.comentar(self.playa, 5)
+        self.comentar(self.playa, 4)
+        self.assertEqual(self.agregados(self.playa), (2, 4.5, 1, 1))
+
+        primero.calificacion = 4
+        primero.save()
+        self.assertEqual(self.agregados(self.playa), (2, 4.0, 2, 0))
+
+        # Cambiar de paquete resta en uno y suma en el otro
+        primero.paquete = self.sierra
+        primero.save()
+        self.assertEqual(self.agregados(self.playa), (1, 4.0, 1, 0))
+        self.assertEqual(self.agregados(self.sierra), (1, 4.0, 1, 0))
+
+        primero.delete()
+        self.assertEqual(self.agregados(self.sierra), (0, None, 0, 0))
+
+    def test_reconstruccion_coincide(self):
+        self.comentar(self.playa, 3)
+        self.comentar(self.playa, 5)
+        Comentario.objects.filter(paquete=self.playa, calificacion=3).update(calificacion=1)  # sin señales
+        self.assertEqual(rebuild_ratings(), 2)
+        self.assertEqual(self.agregados(self.playa), (2, 3.0, 0, 1))
+        self.assertEqual(Paquete.objects.get(pk=self.playa.pk).rating_1, 1)
+
+
+class PermisosCacheTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.grupo = Group.objects.create(name="Ventas")
+        self.permiso = Permission.objects.get(codename="view_reserva")
+        self.usuario = Empleado.objects.create_user("ana@example.com", "Ana", "x")
+        self.usuario.groups.add(self.grupo)
+
+    def tiene_permiso(self):
+        # Instancia nueva, como en cada petición
+        return Empleado.objects.get(pk=self.usuario.pk).has_perm("core.view_reserva")
+
+    def test_cambio_de_rol_invalida(self):
+        self.assertFalse(self.tiene_permiso())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.grupo.permissions.add(self.permiso)
+        self.assertTrue(self.tiene_permiso())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.usuario.groups.remove(self.grupo)
+        self.assertFalse(self.tiene_permiso())
+
+    def test_permisos_en_cache(self):
+        self.grupo.permissions.add(self.permiso)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.usuario.groups.add(self.grupo)
+        self.assertTrue(self.tiene_permiso())
+        with self.assertNumQueries(1):  # solo el usuario; permisos y versión vienen de memoria
+            self.assertTrue(self.tiene_permiso())
+
+    @mock.patch("core.cache.time.monotonic", return_value=1000.0)
+    def test_version_subida_por_otro_proceso(self, reloj):
+        """Otro worker (o procesar_trabajos) revoca el permiso: se nota al pasar VERSIONES_TTL."""
+        self.grupo.permissions.add(self.permiso)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.usuario.groups.add(self.grupo)
+        self.assertTrue(self.tiene_permiso())
+        version = get_version(PERMISSIONS)
+
+        # Lo que haría el otro proceso: quitar el permiso y subir la versión en la base
+        self.grupo.permissions.through.objects.filter(group=self.grupo).delete()
+        VersionCache.objects.filter(nombre=PERMISSIONS).update(version=F("version") + 1)
+        self.assertTrue(self.tiene_permiso())  # aún dentro del TTL
+
+        reloj.return_value += VERSIONES_TTL
+        self.assertEqual(get_version(PERMISSIONS), version + 1)
+        self.assertFalse(self.tiene_permiso())
+
+
+def csv_archivo(*lineas):
+    return io.StringIO("\n".join(lineas) + "\n")
+
+
+class ImportacionTests(CacheTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cliente = Cliente.objects.create(nombre="Luis", email="luis@example.com", telefono="5512345678")
+        cls.proveedor = Proveedor.objects.create(nombre="Hoteles Sol", tipo="Hotel", contacto="sol@example.com")
+        cls.destino = Destino.objects.create(nombre="Cancún", pais="México")
+        cls.empleado = Empleado.objects.create_user("eva@example.com", "Eva", "x")
+        cls.metodo = MetodoPago.objects.create(nombre="Tarjeta")
+        cls.paquete = Paquete.objects.create(nombre="Cancún 5 noches", precio_final=Decimal("900"))
+
+    def test_clientes_upsert_por_email(self):
+        resultado = importar("clientes", csv_archivo(
+            "nombre,email,telefono,preferencias",
+            "Luis Pérez,luis@example.com,5512345678,Playa",
+            "Marta,marta@example.com,5587654321,",
+        ), "csv")
+        self.assertEqual((resultado.leidas, resultado.creadas, resultado.actualizadas), (2, 1, 1))
+        self.assertEqual(Cliente.objects.get(pk=self.cliente.pk).nombre, "Luis Pérez")
+        self.assertTrue(Cliente.objects.filter(email="marta@example.com").exists())
+
+    def test_rechazos_con_numero_de_linea(self):
+        rechazadas = []
+        resultado = importar("clientes", csv_archivo(
+            "nombre,email,telefono,preferencias",
+            "Sin teléfono,nadie@example.com,123,",
+            "Bien,bien@example.com,5511112222,",
+        ), "csv", on_rechazo=lambda numero, fila, errores: rechazadas.append((numero, fila["email"], errores)))
+        self.assertEqual((resultado.creadas, resultado.rechazadas), (1, 1))
+        self.assertEqual(rechazadas[0][:2], (2, "nadie@example.com"))
+        self.assertIn("telefono", rechazadas[0][2])
+        self.assertEqual(resultado.rechazos[0][0], 2)
+
+    def test_jsonl_linea_ilegible(self):
+        resultado = importar("clientes", io.StringIO(
+            '{"nombre": "Ana", "email": "ana@example.com", "telefono": "5500000000"}\n'
+            "esto no es json\n"
+        ), "jsonl")
+        self.assertEqual((resultado.creadas, resultado.rechazadas), (1, 1))
+        self.assertEqual(resultado.rechazos[0], (2, {"__all__": ["Fila ilegible."]}))
+
+    def test_referencias_por_valor_natural_y_ambiguas(self):
+        Proveedor.objects.create(nombre="Duplicado", tipo="Otro", contacto="d1@example.com")
+        Proveedor.objects.create(nombre="Duplicado", tipo="Otro", contacto="d2@example.com")
+        resultado = importar("productos", csv_archivo(
+            "nombre,tipo,proveedor,destino,precio_base",
+            "Hotel playa,Hotel,Hoteles Sol,Cancún,100",
+            f"Hotel centro,Hotel,{self.proveedor.pk},{self.destino.pk},80",
+            "Tour,Tour,Duplicado,Cancún,50",
+        ), "csv")
+        self.assertEqual((resultado.creadas, resultado.rechazadas), (2, 1))
+        self.assertEqual(Producto.objects.filter(proveedor=self.proveedor, destino=self.destino).count(), 2)
+        self.assertIn("proveedor", resultado.rechazos[0][1])
+
+    def test_fechas_de_origen(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            resultado = importar("reservas", csv_archivo(
+                "cliente,paquete,empleado,precio_venta,metodo_pago,estado,fecha_reserva",
+                "luis@example.com,Cancún 5 noches,eva@example.com,900,Tarjeta,Completada,2019-03-01 10:00",
+                "luis@example.com,Cancún 5 noches,eva@example.com,900,Tarjeta,Completada,",
+            ), "csv")
+        self.assertEqual(resultado.creadas, 2)
+        fechas = sorted(Reserva.objects.values_list("fecha_reserva__year", flat=True))
+        self.assertEqual(fechas[0], 2019)
+        self.assertGreater(fechas[1], 2019)  # sin columna: la fecha de la importación
+        # Quedó detrás de la marca de agua: el próximo refresco del rollup lo recalcula
+        self.assertTrue(RollupPendiente.objects.filter(dia=date(2019, 3, 1)).exists())
+
+        importar("clientes", csv_archivo(
+            "nombre,email,telefono,fecha_registro",
+            "Luis,luis@example.com,5512345678,2015-06-01",
+        ), "csv")
+        self.assertEqual(Cliente.objects.get(pk=self.cliente.pk).fecha_registro.year, 2015)
+
+
+class ListasCacheadasTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = Client()
+        self.client.force_login(Empleado.objects.create_superuser("admin@example.com", "Admin", "x"))
+        self.proveedor = Proveedor.objects.create(nombre="Hoteles Sol", tipo="Hotel", contacto="sol@example.com")
+
+    def listado(self, url="/destinos/"):
+        return self.client.get(url).content.decode()
+
+    def test_segunda_visita_sale_de_cache(self):
+        Destino.objects.create(nombre="Cancún", pais="México")
+        self.listado()
+        with CaptureQueriesContext(connection) as consultas:
+            self.assertIn("Cancún", self.listado())
+        self.assertFalse([q for q in consultas.captured_queries if 'FROM "core_destino"' in q["sql"]])
+
+    def test_alta_y_edicion_invalidan(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            destino = Destino.objects.create(nombre="Cancún", pais="México")
+        self.assertIn("Cancún", self.listado())
+        with self.captureOnCommitCallbacks(execute=True):
+            destino.nombre = "Tulum"
+            destino.save()
+        html = self.listado()
+        self.assertIn("Tulum", html)
+        self.assertNotIn("Cancún", html)
+
+    def test_dependencias(self):
+        """El listado de productos muestra el proveedor: renombrarlo lo invalida."""
+        with self.captureOnCommitCallbacks(execute=True):
+            Producto.objects.create(nombre="Hotel playa", tipo="Hotel", proveedor=self.proveedor)
+        self.assertIn("Hoteles Sol", self.listado("/productos/"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.proveedor.nombre = "Hoteles Luna"
+            self.proveedor.save()
+        self.assertIn("Hoteles Luna", self.listado("/productos/"))
+
+    @mock.patch("core.cache.time.monotonic", return_value=1000.0)
+    def test_invalidacion_desde_otro_proceso(self, reloj):
+        """Una importación en procesar_trabajos sube la versión en la base; el worker web la ve."""
+        self.assertNotIn("Cancún", self.listado())
+        # Sin señales ni versión: el listado sigue saliendo de la caché
+        Destino.objects.bulk_create([Destino(nombre="Cancún", pais="México")])
+        self.assertNotIn("Cancún", self.listado())
+
+        VersionCache.objects.update_or_create(nombre="lista:destino", defaults={"version": 99})
+        reloj.return_value += VERSIONES_TTL
+        self.assertIn("Cancún", self.listado())
+
+
+class GetCondicionalTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.usuario = Empleado.objects.create_superuser("admin@example.com", "Admin", "x")
+        self.client = Client()
+        self.client.force_login(self.usuario)
+        Destino.objects.create(nombre="Cancún", pais="México")
+        self.client.get("/destinos/")  # fija la cookie CSRF, que forma parte del ETag
+        self.etag = self.client.get("/destinos/")["ETag"]
+
+    def revalidar(self):
+        return self.client.get("/destinos/", HTTP_IF_NONE_MATCH=self.etag).status_code
+
+    def test_sin_cambios_304(self):
+        self.assertEqual(self.revalidar(), 304)
+
+    def test_cambio_de_datos(self):
+        Destino.objects.create(nombre="Tulum", pais="México")
+        self.assertEqual(self.revalidar(), 200)
+
+    def test_cambio_del_propio_usuario(self):
+        """La barra muestra nombre y avatar: editarlos cambia la página."""
+        self.usuario.nombre = "Administradora"
+        self.usuario.save()
+        self.assertEqual(self.revalidar(), 200)
+
+    def test_cambio_de_permisos(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Group.objects.create(name="Ventas")
+        self.assertEqual(self.revalidar(), 200)
+
+    def test_login_de_otro_no_invalida(self):
+        """last_login y las variantes de imagen no mueven la marca de Empleado."""
+        otra = Empleado.objects.create_user("bea@example.com", "Bea", "x")
+        etag = self.client.get("/reservas/")["ETag"]
+        antes = otra.actualizado_en
+        Client().force_login(otra)
+        Empleado.objects.filter(pk=otra.pk).update(imagenes={"imagen": {}})
+        self.assertEqual(self.client.get("/reservas/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # La fila sí cambia: el ETag propio de Bea incluye su actualizado_en
+        otra.refresh_from_db()
+        self.assertGreater(otra.actualizado_en, antes)
+
+
+class TrabajosTests(TestCase):
+    def setUp(self):
+        # Archivos en una carpeta temporal y tipos de prueba sin tocar el registro real
+        carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, carpeta, ignore_errors=True)
+        ajustes = override_settings(TRABAJOS_ROOT=carpeta)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        for parche in (
+            mock.patch.object(Trabajo._meta.get_field("archivo"), "storage", almacen_trabajos()),
+            mock.patch.dict(trabajos.TIPOS),
+        ):
+            parche.start()
+            self.addCleanup(parche.stop)
+
+        self.fallos = []
+        trabajos.tarea("falla", "Falla", intentos=2)(self._falla)
+        trabajos.tarea("archivo", "Archivo", concurrencia=1)(self._archivo)
+        self.duena = Empleado.objects.create_user("ana@example.com", "Ana", "x")
+
+    def _falla(self, trabajo, avance):
+        self.fallos.append(trabajo.intentos)
+        raise RuntimeError("se cayó")
+
+    def _archivo(self, trabajo, avance):
+        avance.actualizar(1, total=1)
+        avance.adjuntar("datos.csv", io.BytesIO(b"a,b\n1,2\n"))
+        return {"filas": 1}
+
+    def correr(self, trabajador="w1", tipos=None):
+        trabajo = trabajos.tomar(trabajador, tipos)
+        if trabajo:
+            trabajos.ejecutar(trabajo)
+            trabajo.refresh_from_db()
+        return trabajo
+
+    def test_encolar_unico(self):
+        primero = trabajos.encolar("archivo", {"x": 1}, unico=True)
+        self.assertEqual(trabajos.encolar("archivo", {"x": 1}, unico=True), primero)
+        self.assertNotEqual(trabajos.encolar("archivo", {"x": 2}, unico=True), primero)
+        with self.assertRaises(ValueError):
+            trabajos.encolar("no_existe")
+
+    def test_reintento_con_espera_y_fallo_final(self):
+        trabajos.encolar("falla")
+        with self.assertLogs("core.trabajos", "ERROR"):
+            trabajo = self.correr()
+        self.assertEqual((trabajo.estado, trabajo.intentos), (Trabajo.PENDIENTE, 1))
+        self.assertGreater(trabajo.disponible_en, timezone.now())
+        self.assertIsNone(trabajos.tomar("w1"))  # aún en espera
+
+        Trabajo.objects.filter(pk=trabajo.pk).update(disponible_en=timezone.now())
+        with self.assertLogs("core.trabajos", "ERROR"):
+            trabajo = self.correr()
+        self.assertEqual((trabajo.estado, trabajo.intentos), (Trabajo.FALLIDO, 2))
+        self.assertIn("RuntimeError: se cayó", trabajo.error)
+        self.assertEqual(self.fallos, [1, 2])
+
+    def test_error_permanente_no_se_reintenta(self):
+        @trabajos.tarea("invalido", "Inválido", intentos=5)
+        def invalido(trabajo, avance):
+            raise trabajos.ErrorPermanente("parámetros inválidos")
+
+        trabajos.encolar("invalido")
+        with self.assertLogs("core.trabajos", "ERROR"):
+            trabajo = self.correr()
+        self.assertEqual((trabajo.estado, trabajo.error), (Trabajo.FALLIDO, "parámetros inválidos"))
+
+    def test_concurrencia_por_tipo(self):
+        primero = trabajos.encolar("archivo")
+        trabajos.encolar("archivo")
+        trabajos.encolar("falla")
+        tomado = trabajos.tomar("w1")
+        self.assertEqual(tomado, primero)
+        # El segundo "archivo" espera a que termine el primero; "falla" sí tiene hueco
+        self.assertEqual(trabajos.tomar("w2").tipo, "falla")
+        self.assertIsNone(trabajos.tomar("w3"))
+        trabajos.ejecutar(tomado)
+        self.assertEqual(trabajos.tomar("w3").tipo, "archivo")
+
+    def test_liberar_colgados(self):
+        tipo = trabajos.TIPOS["archivo"]
+        trabajos.encolar("archivo")
+        trabajo = trabajos.tomar("w1")
+        Trabajo.objects.filter(pk=trabajo.pk).update(latido=timezone.now() - tipo.colgado - timedelta(seconds=1))
+        self.assertEqual(trabajos.liberar_colgados(), 1)
+        trabajo.refresh_from_db()
+        self.assertEqual((trabajo.estado, trabajo.trabajador), (Trabajo.PENDIENTE, ""))
+        # El trabajador original ya no puede escribir su resultado
+        self.assertTrue(trabajos.ejecutar(trabajo))
+        trabajo.refresh_from_db()
+        self.assertEqual(trabajo.estado, Trabajo.PENDIENTE)
+
+    def test_estado_y_descarga_solo_para_el_dueno(self):
+        trabajos.encolar("archivo", usuario=self.duena)
+        trabajo = self.correr()
+        self.assertEqual(trabajo.estado, Trabajo.COMPLETADO)
+
+        otro, admin = Client(), Client()
+        otro.force_login(Empleado.objects.create_user("otro@example.com", "Otro", "x"))
+        admin.force_login(Empleado.objects.create_superuser("admin@example.com", "Admin", "x"))
+        duena = Client()
+        duena.force_login(self.duena)
+        estado_url = f"/trabajos/{trabajo.pk}/"
+
+        datos = duena.get(estado_url).json()
+        self.assertEqual((datos["estado"], datos["porcentaje"], datos["resultado"]), ("completado", 100, {"filas": 1}))
+        self.assertEqual(b"".join(duena.get(datos["descarga_url"]).streaming_content), b"a,b\n1,2\n")
+        self.assertEqual(admin.get(estado_url).status_code, 200)
+        self.assertEqual(otro.get(estado_url).status_code, 404)
+        self.assertEqual(otro.get(datos["descarga_url"]).status_code, 404)
+        self.assertRedirects(Client().get(estado_url), "/login/", fetch_redirect_response=False)
+
+    def test_archivo_fuera_de_media(self):
+        trabajos.encolar("archivo", usuario=self.duena)
+        trabajo = self.correr()
+        # Carpeta aleatoria bajo TRABAJOS_ROOT: ni en MEDIA_ROOT ni con nombre adivinable
+        self.assertTrue(trabajo.archivo.path.startswith(str(almacen_trabajos().location)))
+        self.assertRegex(trabajo.archivo.name, r"^\d{4}/\d{2}/\w{32}/datos\.csv$")
+
+    def test_purgar(self):
+        trabajos.encolar("archivo")
+        trabajo = self.correr()
+        ruta = trabajo.archivo.path
+        self.assertEqual(trabajos.purgar(), 0)
+        Trabajo.objects.filter(pk=trabajo.pk).update(terminado_en=timezone.now() - trabajos.RETENCION - timedelta(hours=1))
+        self.assertEqual(trabajos.purgar(), 1)
+        self.assertFalse(Trabajo.objects.exists())
+        with self.assertRaises(FileNotFoundError):
+            open(ruta)
+
+    def test_exportacion_de_reservas(self):
+        cliente = Cliente.objects.create(nombre="Luis", email="luis@example.com", telefono="5512345678")
+        paquete = Paquete.objects.create(nombre="Cancún 5 noches", precio_final=Decimal("900"))
+        Reserva.objects.create(cliente=cliente, paquete=paquete, empleado=self.duena, precio_venta=Decimal("900"))
+        otro = Empleado.objects.create_user("otro@example.com", "Otro", "x")
+        Reserva.objects.create(cliente=cliente, paquete=paquete, empleado=otro, precio_venta=Decimal("500"))
+        self.duena.user_permissions.add(Permission.objects.get(codename="view_reserva"))
+        cliente_http = Client()
+        cliente_http.force_login(self.duena)
+
+        respuesta = cliente_http.post("/reservas/exportar/?formato=csv")
+        self.assertEqual(respuesta.status_code, 202)
+        self.assertIsNotNone(self.correr(tipos=["exportar_reservas"]))
+        datos = cliente_http.get(respuesta.json()["estado_url"]).json()
+        self.assertEqual(datos["resultado"], {"filas": 1, "formato": "csv"})  # alcance de colaborador
+        contenido = b"".join(cliente_http.get(datos["descarga_url"]).streaming_content).decode()
+        self.assertIn("luis@example.com", contenido)
+
+    def test_cambio_de_estado_masivo(self):
+        cliente = Cliente.objects.create(nombre="Luis", email="luis@example.com", telefono="5512345678")
+        paquete = Paquete.objects.create(nombre="Cancún 5 noches", precio_final=Decimal("900"))
+        propia = Reserva.objects.create(
+            cliente=cliente, paquete=paquete, empleado=self.duena, precio_venta=Decimal("900")
+        )
+        otro = Empleado.objects.create_user("otro@example.com", "Otro", "x")
+        ajena = Reserva.objects.create(cliente=cliente, paquete=paquete, empleado=otro, precio_venta=Decimal("500"))
+        self.duena.user_permissions.add(*Permission.objects.filter(codename__in=["view_reserva", "change_reserva"]))
+        cliente_http = Client()
+        cliente_http.force_login(self.duena)
+
+        self.assertEqual(cliente_http.post("/reservas/estado/", {"estado": "Borrada"}).status_code, 400)
+        respuesta = cliente_http.post("/reservas/estado/?q=luis", {"estado": "Cancelada"})
+        self.assertEqual(respuesta.status_code, 202)
+        with self.captureOnCommitCallbacks(execute=True):
+            trabajo = self.correr(tipos=["cambiar_estado_reservas"])
+        self.assertEqual(trabajo.resultado, {"estado": "Cancelada", "cambiadas": 1})  # alcance de colaborador
+
+        propia.refresh_from_db()
+        ajena.refresh_from_db()
+        self.assertEqual((propia.estado, ajena.estado), ("Cancelada", "Pendiente"))
+        indicadores = dict(Indicador.objects.values_list("clave", "valor"))
+        self.assertEqual(indicadores["reservas:Pendiente"], 1)
+        self.assertEqual(indicadores["reservas:Cancelada"], 1)
+        self.assertEqual(indicadores[clave_ingresos(propia.fecha_reserva)], 500)
+        self.assertTrue(RollupPendiente.objects.filter(dia=timezone.localdate(propia.fecha_reserva)).exists())
+        self.assertEqual([r.pk for r in search(Reserva.objects.all(), "cancel")], [propia.pk])
+
+
+@override_settings(
+    MIDDLEWARE=settings.MIDDLEWARE + ["core.middleware.ReplicaMiddleware"],
+    DATABASE_ROUTERS=["core.db.router.ReplicaRouter"],
+)
+class ReplicaTests(CacheTestCase):
+    """Alias de réplica configurado; apunta a la base de pruebas para poder consultarla."""
+
+    def setUp(self):
+        super().setUp()
+        for parche in (
+            mock.patch("core.db.router.replica_configurada", return_value=True),
+            mock.patch("core.db.router.REPLICA", "default"),
+            mock.patch("core.middleware.replica_configurada", return_value=True),
+        ):
+            parche.start()
+            self.addCleanup(parche.stop)
+        self.usuario = Empleado.objects.create_superuser("admin@example.com", "Admin", "x")
+        Destino.objects.create(nombre="Cancún", pais="México")
+        self.lecturas = []
+        original = ReplicaRouter.db_for_read
+
+        def espia(router, model, **hints):
+            self.lecturas.append((model._meta.model_name, router_replica._leer_de_replica.get()))
+            return original(router, model, **hints)
+
+        parche = mock.patch.object(ReplicaRouter, "db_for_read", espia)
+        parche.start()
+        self.addCleanup(parche.stop)
+
+    def de_replica(self, modelo):
+        return {replica for nombre, replica in self.lecturas if nombre == modelo}
+
+    def test_listado_lee_de_replica(self):
+        self.client.force_login(self.usuario)
+        self.assertEqual(self.client.get("/destinos/").status_code, 200)
+        self.assertEqual(self.de_replica("destino"), {True})
+        self.assertFalse(router_replica._leer_de_replica.get())
+
+    def test_tras_escritura_lee_del_primario(self):
+        self.client.force_login(self.usuario)
+        self.client.post("/destinos/nuevo/", {"nombre": "Tulum", "pais": "México"})
+        self.lecturas.clear()
+        self.assertEqual(self.client.get("/destinos/").status_code, 200)
+        self.assertEqual(self.de_replica("destino"), {False})
+
+    async def test_asgi(self):
+        """Bajo ASGI la vista y el middleware corren en contextos distintos."""
+        await sync_to_async(self.async_client.force_login)(self.usuario)
+        for _ in range(2):
+            respuesta = await self.async_client.get("/destinos/")
+            self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(self.de_replica("destino"), {True})
+        self.assertFalse(router_replica._leer_de_replica.get())
+
+
+class VentasTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.empleado = Empleado.objects.create_user("eva@example.com", "Eva", "x")
+        cls.cancun = Destino.objects.create(nombre="Cancún", pais="México")
+        cls.tulum = Destino.objects.create(nombre="Tulum", pais="México")
+        cls.doble = Paquete.objects.create(nombre="Cancún y Tulum", precio_final=Decimal("50"))
+        cls.simple = Paquete.objects.create(nombre="Solo Cancún", precio_final=Decimal("30"))
+        PaqueteDestino.objects.bulk_create([
+            PaqueteDestino(paquete=cls.doble, destino=cls.cancun),
+            PaqueteDestino(paquete=cls.doble, destino=cls.tulum),
+            PaqueteDestino(paquete=cls.simple, destino=cls.cancun),
+        ])
+
+    def venta(self, paquete, dia, ingresos, estado="Completada"):
+        VentaDiaria.objects.create(
+            dia=dia, paquete=paquete, empleado=self.empleado, estado=estado, reservas=1, ingresos=ingresos,
+        )
+
+    def test_totales_por_destino_sin_duplicar(self):
+        self.venta(self.doble, date(2024, 1, 10), 50)
+        self.venta(self.simple, date(2024, 2, 10), 30)
+        filas = dict(reportes.ventas(filas="destino")["filas"])
+        self.assertEqual(filas, {"Cancún (México)": [80.0], "Tulum (México)": [50.0], "Total": [80.0]})
+
+        reporte = reportes.ventas(filas="destino", columnas="periodo", medida="reservas")
+        self.assertEqual(reporte["columnas"], ["01/2024", "02/2024", "Total"])
+        self.assertEqual(dict(reporte["filas"])["Total"], [1, 1, 2])
+
+        reporte = reportes.ventas(filas="periodo", columnas="destino")
+        self.assertEqual(reporte["columnas"], ["Cancún (México)", "Tulum (México)", "Total"])
+        self.assertEqual(dict(reporte["filas"]), {
+            "01/2024": [50.0, 50.0, 50.0], "02/2024": [30.0, 0.0, 30.0], "Total": [80.0, 50.0, 80.0],
+        })
+
+    def test_update_masivo_marca_dias(self):
+        cliente = Cliente.objects.create(nombre="Luis", email="luis@example.com", telefono="5512345678")
+        reserva = Reserva.objects.create(
+            cliente=cliente, paquete=self.simple, empleado=self.empleado, precio_venta=Decimal("30"),
+        )
+        dia = timezone.localdate(reserva.fecha_reserva)
+        RollupPendiente.objects.all().delete()
+
+        Reserva.objects.filter(pk=reserva.pk).update(fecha_viaje=date(2030, 1, 1))  # no afecta al rollup
+        with self.captureOnCommitCallbacks(execute=True):
+            Reserva.objects.filter(estado="Pendiente").update(estado="Cancelada")
+        self.assertEqual(list(RollupPendiente.objects.values_list("dia", flat=True)), [dia])
+
+        # Cambiar la fecha marca el día de origen y el de destino
+        RollupPendiente.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            Reserva.objects.filter(estado="Cancelada").update(
+                fecha_reserva=datetime(2020, 5, 4, 12, tzinfo=dt_timezone.utc)
+            )
+        self.assertEqual(set(RollupPendiente.objects.values_list("dia", flat=True)), {dia, date(2020, 5, 4)})
+
+    def reservar(self, precio, cuando=None):
+        cliente = Cliente.objects.get_or_create(nombre="Luis", email="luis@example.com")[0]
+        with mock.patch("django.utils.timezone.now", return_value=cuando or timezone.now()):
+            return Reserva.objects.create(
+                cliente=cliente, paquete=self.simple, empleado=self.empleado, precio_venta=Decimal(precio),
+            )
+
+    def rollup(self):
+        return {
+            (fila["dia"], fila["estado"]): (fila["reservas"], fila["ingresos"])
+            for fila in VentaDiaria.objects.values("dia", "estado", "reservas", "ingresos")
+        }
+
+    def test_refresco_incremental(self):
+        hoy = timezone.localdate()
+        ayer = hoy - timedelta(days=1)
+        ahora = rollups.inicio_dia(hoy) + timedelta(hours=12)
+        primera = self.reservar("100", ahora)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(rollups.refrescar(), {"dias": 1, "filas": 1})  # sin marca: reconstruye
+        self.assertEqual(RollupMarca.objects.get(nombre=rollups.VENTAS).marca, ahora)
+
+        # Confirmada tarde pero dentro del margen: la recoge; fuera del margen, no
+        self.reservar("20", ahora - rollups.LAG / 2)
+        tardia = self.reservar("7", ahora - timedelta(days=1))
+        self.assertEqual(rollups.refrescar()["dias"], 1)
+        self.assertEqual(self.rollup(), {(hoy, "Pendiente"): (2, Decimal("120"))})
+        rollups.reconstruir(desde=ayer, hasta=ayer)
+        self.assertEqual(self.rollup()[(ayer, "Pendiente")], (1, Decimal("7")))
+
+        # Ediciones y borrados marcan su día
+        primera.estado = "Confirmada"
+        primera.save()
+        tardia.delete()
+        self.assertEqual(set(RollupPendiente.objects.values_list("dia", flat=True)), {hoy, ayer})
+        self.assertEqual(rollups.refrescar()["dias"], 2)
+        self.assertEqual(
+            self.rollup(), {(hoy, "Pendiente"): (1, Decimal("20")), (hoy, "Confirmada"): (1, Decimal("100"))}
+        )
+        self.assertFalse(RollupPendiente.objects.exists())
+
+
+class VistasAsyncTests(CacheTestCase):
+    """Las vistas de core/async_views.py leen con el ORM async y pintan lo mismo que las síncronas."""
+
+    def setUp(self):
+        super().setUp()
+        self.usuario = Empleado.objects.create_superuser("admin@example.com", "Admin", "x")
+        Destino.objects.bulk_create([Destino(nombre=f"Destino {n:02}", pais="México") for n in range(15)])
+        self.paquete = Paquete.objects.create(nombre="Cancún 5 noches", precio_final=Decimal("900"))
+        cliente = Cliente.objects.create(nombre="Luis", email="luis@example.com", telefono="5512345678")
+        for _ in range(12):
+            Reserva.objects.create(cliente=cliente, paquete=self.paquete, empleado=self.usuario, precio_venta=1)
+
+    def peticion(self, factory, url):
+        request = factory.get(url)
+        request.user = self.usuario
+        return request
+
+    def html(self, response):
+        response.render()
+        return re.sub(r'name="csrfmiddlewaretoken" value="[^"]+"', "", response.content.decode())
+
+    async def comparar(self, nombre, url, **kwargs):
+        sync = getattr(views, nombre).as_view()
+        asincrona = getattr(async_views, nombre).as_view()
+        esperada = await sync_to_async(sync)(self.peticion(RequestFactory(), url), **kwargs)
+        respuesta = await asincrona(self.peticion(AsyncRequestFactory(), url), **kwargs)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(self.html(respuesta), await sync_to_async(self.html)(esperada))
+        return respuesta
+
+    async def test_listado_paginado(self):
+        respuesta = await self.comparar("DestinoListView", "/destinos/?page=2")
+        self.assertEqual(len(respuesta.context_data["page_obj"]), 5)
+        with self.assertRaises(Http404):
+            await async_views.DestinoListView.as_view()(self.peticion(AsyncRequestFactory(), "/destinos/?page=9"))
+
+    async def test_listado_por_cursor(self):
+        respuesta = await self.comparar("ReservaListView", "/reservas/")
+        pagina = respuesta.context_data["page_obj"]
+        self.assertTrue(pagina.has_next())
+        await self.comparar("ReservaListView", f"/reservas/?cursor={pagina.next_cursor}")
+
+    async def test_detalle(self):
+        await self.comparar("PaqueteDetailView", f"/paquetes/{self.paquete.pk}/", pk=self.paquete.pk)
+        with self.assertRaises(Http404):
+            await async_views.PaqueteDetailView.as_view()(self.peticion(AsyncRequestFactory(), "/paquetes/0/"), pk=0)
+
+
+class IndicadoresTests(CacheTestCase):
+    def test_dashboard_ventas_solo_admin(self):
+        colaborador, admin = Client(), Client()
+        colaborador.force_login(Empleado.objects.create_user("eva@example.com", "Eva", "x"))
+        admin.force_login(Empleado.objects.create_superuser("admin@example.com", "Admin", "x"))
+        html = colaborador.get("/inicio/").content.decode()
+        self.assertIn("Clientes", html)
+        self.assertNotIn("Ingresos del mes", html)
+        self.assertNotIn("Reservas por estado", html)
+        self.assertIn("Ingresos del mes", admin.get("/inicio/").content.decode())
+
+    def indicadores(self):
+        return {clave: valor for clave, valor in Indicador.objects.values_list("clave", "valor") if valor}
+
+    def test_deltas_de_reservas_y_contadores(self):
+        cliente = Cliente.objects.create(nombre="Luis", email="luis@example.com")
+        paquete = Paquete.objects.create(nombre="Cancún", precio_final=Decimal("900"))
+        empleado = Empleado.objects.create_user("eva@example.com", "Eva", "x")
+        reserva = Reserva.objects.create(
+            cliente=cliente, paquete=paquete, empleado=empleado, precio_venta=Decimal("900")
+        )
+        este_mes = clave_ingresos(reserva.fecha_reserva)
+        self.assertEqual(
+            self.indicadores(),
+            {"clientes": 1, "paquetes": 1, "reservas:Pendiente": 1, este_mes: 900},
+        )
+
+        reserva.precio_venta = Decimal("750")
+        reserva.save()
+        self.assertEqual(self.indicadores()[este_mes], 750)
+
+        # Otro mes: el ingreso se mueve de clave
+        reserva.fecha_reserva -= timedelta(days=40)
+        reserva.save()
+        otro_mes = clave_ingresos(reserva.fecha_reserva)
+        self.assertEqual(self.indicadores()[otro_mes], 750)
+        self.assertNotIn(este_mes, self.indicadores())
+
+        reserva.estado = "Cancelada"
+        reserva.save()
+        self.assertEqual(self.indicadores(), {"clientes": 1, "paquetes": 1, "reservas:Cancelada": 1})
+        self.assertEqual(snapshot()["reservas"]["Cancelada"], 1)
+
+        reserva.estado = "Confirmada"
+        reserva.save()
+        esperado = {"clientes": 1, "paquetes": 1, "reservas:Confirmada": 1, otro_mes: 750}
+        self.assertEqual(self.indicadores(), esperado)
+        # Lo incremental coincide con recalcular desde las tablas
+        recalcular_indicadores()
+        self.assertEqual(self.indicadores(), esperado)
+
+        reserva.delete()
+        cliente.delete()
+        self.assertEqual(self.indicadores(), {"paquetes": 1})
@@ -0,0 +1,369 @@
+# core/trabajos.py
+"""
+Cola de trabajos en la base de datos, sin broker: exportaciones, importaciones,
+ediciones masivas y refrescos del reporte que no deben ocupar un worker web.
+- `encolar(tipo, parametros, usuario)` crea el Trabajo; `manage.py procesar_trabajos`
+  los toma y ejecuta, y la UI sondea trabajos:trabajo_estado.
+- Cada tipo se registra con @tarea: cuántos pueden correr a la vez (entre todos los
+  trabajadores), cuántos intentos tiene y tras cuánto sin avance se da por colgado.
+- Tomar un trabajo es un UPDATE condicionado al estado: si dos trabajadores eligen el
+  mismo, solo uno lo consigue.
+- Un fallo se reintenta con espera exponencial salvo que sea ErrorPermanente.
+"""
+import csv
+import io
+import json
+import logging
+import tempfile
+import time
+import os
+import traceback
+from datetime import date, timedelta
+
+from django.core.files import File
+from django.db import OperationalError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from .models import Trabajo, almacen_trabajos
+
+logger = logging.getLogger(__name__)
+
+REINTENTO_BASE = 30  # segundos; se duplica en cada intento
+REINTENTO_MAXIMO = 60 * 60
+INTERVALO_AVANCE = 1.0  # segundos mínimos entre escrituras de progreso
+RETENCION = timedelta(days=7)  # trabajos terminados (y sus archivos) que se conservan
+MAX_ERROR = 4000  # caracteres del traceback que se guardan
+LOTE_EDICION = 500  # filas por transacción en las ediciones masivas
+
+
+class ErrorPermanente(Exception):
+    """Fallo que no se arregla reintentando (parámetros inválidos, usuario borrado...)."""
+
+
+class Tipo:
+    def __init__(self, nombre, funcion, etiqueta, concurrencia, intentos, colgado):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.etiqueta = etiqueta
+        self.concurrencia = concurrencia
+        self.intentos = intentos
+        self.colgado = colgado
+
+
+TIPOS = {}
+
+
+def tarea(nombre, etiqueta, concurrencia=1, intentos=3, colgado=timedelta(minutes=30)):
+    """Registra `funcion(trabajo, avance) -> dict` como tipo de trabajo."""
+    def registrar(funcion):
+        TIPOS[nombre] = Tipo(nombre, funcion, etiqueta, concurrencia, intentos, colgado)
+        return funcion
+    return registrar
+
+
+class Avance:
+    """Progreso del trabajo en curso; escribe como mucho cada INTERVALO_AVANCE segundos."""
+
+    def __init__(self, trabajo):
+        self.trabajo = trabajo
+        self.hechos = 0
+        self._ultima = 0.0
+
+    def actualizar(self, hechos=None, total=None, mensaje=None, forzar=False):
+        campos = {}
+        if hechos is not None:
+            self.hechos = campos["hechos"] = hechos
+        if total is not None:
+            campos["total"] = total
+        if mensaje is not None:
+            campos["mensaje"] = mensaje[:255]
+        ahora = time.monotonic()
+        if not forzar and total is None and mensaje is None and ahora - self._ultima < INTERVALO_AVANCE:
+            return
+        self._ultima = ahora
+        try:
+            _del_trabajador(self.trabajo).update(latido=timezone.now(), **campos)
+        except OperationalError:
+            pass  # base bloqueada un momento: el progreso no es crítico
+
+    def adjuntar(self, nombre, archivo):
+        """Guarda `archivo` (objeto de archivo abierto) como resultado descargable."""
+        self.trabajo.archivo.save(nombre, File(archivo, name=nombre), save=False)
+
+
+def _del_trabajador(trabajo):
+    # Si se dio por colgado y lo tomó otro, este ya no escribe
+    return Trabajo.objects.filter(pk=trabajo.pk, estado=Trabajo.EN_CURSO, trabajador=trabajo.trabajador)
+
+
+def encolar(tipo, parametros=None, usuario=None, unico=False):
+    """
+    Crea un trabajo pendiente. Con `unico`, si ya hay uno igual pendiente o en curso
+    devuelve ese (p. ej. varios clics en "Actualizar").
+    """
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo de trabajo desconocido: {tipo}")
+    parametros = parametros or {}
+    if unico:
+        existente = (
+            Trabajo.objects
+            .filter(tipo=tipo, parametros=parametros, estado__in=(Trabajo.PENDIENTE, Trabajo.EN_CURSO))
+            .order_by("id").first()
+        )
+        if existente:
+            return existente
+    return Trabajo.objects.create(
+        tipo=tipo, parametros=parametros, creado_por=usuario if usuario and usuario.is_authenticated else None
+    )
+
+
+def _en_curso():
+    filas = Trabajo.objects.filter(estado=Trabajo.EN_CURSO).values("tipo").annotate(n=Count("id")).order_by()
+    return {fila["tipo"]: fila["n"] for fila in filas}
+
+
+def tomar(trabajador, tipos=None):
+    """Marca como en curso el siguiente trabajo disponible cuyo tipo tenga hueco; None si no hay."""
+    tipos = [t for t in (tipos or TIPOS) if t in TIPOS]
+    en_curso = _en_curso()
+    libres = [t for t in tipos if en_curso.get(t, 0) < TIPOS[t].concurrencia]
+    if not libres:
+        return None
+    ahora = timezone.now()
+    candidatos = (
+        Trabajo.objects
+        .filter(estado=Trabajo.PENDIENTE, disponible_en__lte=ahora, tipo__in=libres)
+        .order_by("disponible_en", "id")
+        .values_list("pk", "tipo")[:20]
+    )
+    for pk, tipo in candidatos:
+        if en_curso.get(tipo, 0) >= TIPOS[tipo].concurrencia:
+            continue
+        tomado = Trabajo.objects.filter(pk=pk, estado=Trabajo.PENDIENTE).update(
+            estado=Trabajo.EN_CURSO, trabajador=trabajador, iniciado_en=ahora, latido=ahora,
+            intentos=F("intentos") + 1,
+        )
+        if not tomado:
+            continue  # otro trabajador se adelantó
+        # Dos trabajadores pueden tomar a la vez dos del mismo tipo: se comprueba el límite después
+        if Trabajo.objects.filter(tipo=tipo, estado=Trabajo.EN_CURSO).count() > TIPOS[tipo].concurrencia:
+            Trabajo.objects.filter(pk=pk, trabajador=trabajador).update(
+                estado=Trabajo.PENDIENTE, trabajador="", iniciado_en=None, latido=None,
+                intentos=F("intentos") - 1,
+            )
+            en_curso[tipo] = TIPOS[tipo].concurrencia
+            continue
+        return Trabajo.objects.get(pk=pk)
+    return None
+
+
+def _fallo(trabajo, tipo, error, permanente=False):
+    if not permanente and trabajo.intentos < tipo.intentos:
+        espera = min(REINTENTO_BASE * 2 ** (trabajo.intentos - 1), REINTENTO_MAXIMO)
+        return {
+            "estado": Trabajo.PENDIENTE,
+            "disponible_en": timezone.now() + timedelta(seconds=espera),
+            "mensaje": f"Intento {trabajo.intentos} de {tipo.intentos} fallido; se reintenta en {espera} s",
+            "error": error[-MAX_ERROR:],
+        }
+    return {
+        "estado": Trabajo.FALLIDO,
+        "terminado_en": timezone.now(),
+        "mensaje": "Falló",
+        "error": error[-MAX_ERROR:],
+    }
+
+
+def ejecutar(trabajo):
+    """Ejecuta un trabajo ya tomado; True si terminó bien."""
+    tipo = TIPOS[trabajo.tipo]
+    avance = Avance(trabajo)
+    try:
+        resultado = tipo.funcion(trabajo, avance) or {}
+    except Exception as e:
+        logger.exception("Trabajo %s #%s", trabajo.tipo, trabajo.pk)
+        permanente = isinstance(e, ErrorPermanente)
+        error = str(e) if permanente else traceback.format_exc()
+        _del_trabajador(trabajo).update(**_fallo(trabajo, tipo, error, permanente))
+        if trabajo.archivo:
+            _borrar(trabajo.archivo.name)
+        return False
+    _del_trabajador(trabajo).update(
+        estado=Trabajo.COMPLETADO, resultado=resultado, archivo=trabajo.archivo.name or "",
+        hechos=avance.hechos, mensaje="", error="", terminado_en=timezone.now(),
+    )
+    return True
+
+
+def liberar_colgados():
+    """Trabajos en curso sin avance durante más de `colgado`: se reintentan o fallan."""
+    ahora = timezone.now()
+    liberados = 0
+    for nombre, tipo in TIPOS.items():
+        colgados = Trabajo.objects.filter(tipo=nombre, estado=Trabajo.EN_CURSO, latido__lt=ahora - tipo.colgado)
+        error = f"Sin avance durante más de {tipo.colgado}; el trabajador se detuvo o quedó colgado."
+        liberados += colgados.filter(intentos__lt=tipo.intentos).update(
+            estado=Trabajo.PENDIENTE, trabajador="", disponible_en=ahora, error=error
+        )
+        liberados += colgados.update(estado=Trabajo.FALLIDO, terminado_en=ahora, mensaje="Falló", error=error)
+    return liberados
+
+
+def _borrar(nombre):
+    """Borra un archivo del almacén de trabajos y su carpeta aleatoria si queda vacía."""
+    almacen = almacen_trabajos()
+    almacen.delete(nombre)
+    try:
+        os.rmdir(os.path.dirname(almacen.path(nombre)))
+    except OSError:
+        pass
+
+
+def purgar(retencion=RETENCION):
+    """Borra los trabajos terminados hace más de `retencion` y sus archivos."""
+    viejos = Trabajo.objects.filter(
+        estado__in=(Trabajo.COMPLETADO, Trabajo.FALLIDO), terminado_en__lt=timezone.now() - retencion
+    )
+    for nombre in viejos.exclude(archivo="").values_list("archivo", flat=True):
+        _borrar(nombre)
+    return viejos.delete()[0]
+
+
+def guardar_entrada(archivo):
+    """Guarda un archivo subido para que lo lea el trabajador; devuelve su nombre en el almacén."""
+    return almacen_trabajos().save(f"entrada/{get_random_string(32)}/{archivo.name}", archivo)
+
+
+# ===== Tareas =====
+
+@tarea("exportar_reservas", "Exportar reservas", concurrencia=2)
+def exportar_reservas(trabajo, avance):
+    """Reservas con los filtros del listado (parametros["filtros"]) en CSV o JSONL."""
+    from .exportacion import RESERVA_COLUMNAS, csv_lines, filas_reservas, jsonl_lines
+    from .models import Reserva
+    from .views import filter_reservas
+
+    if trabajo.creado_por is None:
+        raise ErrorPermanente("El usuario que pidió la exportación ya no existe.")
+    formato = "jsonl" if trabajo.parametros.get("formato") == "jsonl" else "csv"
+    qs = filter_reservas(Reserva.objects.all(), trabajo.parametros.get("filtros", {}), trabajo.creado_por)
+    avance.actualizar(0, total=qs.count())
+
+    filas = 0
+
+    def contadas(iterable):
+        nonlocal filas
+        for fila in iterable:
+            filas += 1
+            if filas % 500 == 0:
+                avance.actualizar(filas)
+            yield fila
+
+    encabezados = [nombre for nombre, _ruta in RESERVA_COLUMNAS]
+    lineas = (jsonl_lines if formato == "jsonl" else csv_lines)(encabezados, contadas(filas_reservas(qs)))
+    with tempfile.TemporaryFile() as salida:
+        for trozo in lineas:
+            salida.write(trozo.encode("utf-8"))
+        avance.actualizar(filas, forzar=True)
+        salida.seek(0)
+        avance.adjuntar(f"reservas-{timezone.localdate():%Y%m%d}.{formato}", salida)
+    return {"filas": filas, "formato": formato}
+
+
+@tarea("cambiar_estado_reservas", "Cambiar estado de reservas", concurrencia=1)
+def cambiar_estado_reservas(trabajo, avance):
+    """Pasa a parametros["estado"] las reservas con los filtros del listado (parametros["filtros"])."""
+    from .indicadores import apply_reserva_changes
+    from .models import Reserva
+    from .views import filter_reservas
+
+    estado = trabajo.parametros.get("estado")
+    if estado not in dict(Reserva.ESTADO_CHOICES):
+        raise ErrorPermanente(f"Estado desconocido: {estado}")
+    usuario = trabajo.creado_por
+    if usuario is None or not usuario.has_perm("core.change_reserva"):
+        raise ErrorPermanente("El usuario que pidió el cambio ya no puede editar reservas.")
+    qs = filter_reservas(Reserva.objects.all(), trabajo.parametros.get("filtros", {}), usuario).exclude(estado=estado)
+    avance.actualizar(0, total=qs.count())
+
+    # Por lotes de pk: cada lote es una transacción y un reintento sigue donde quedó
+    revisadas = cambiadas = 0
+    ultimo = 0
+    while True:
+        with transaction.atomic():
+            filas = list(
+                qs.filter(pk__gt=ultimo).order_by("pk").select_for_update()
+                .values_list("pk", "estado", "precio_venta", "fecha_reserva")[:LOTE_EDICION]
+            )
+            if not filas:
+                break
+            pks = [pk for pk, *_resto in filas]
+            cambiadas += Reserva.objects.filter(pk__in=pks).update(estado=estado)
+            # update() no envía señales: los indicadores se ajustan aquí
+            apply_reserva_changes(
+                ((viejo, precio, fecha), (estado, precio, fecha)) for _pk, viejo, precio, fecha in filas
+            )
+        revisadas += len(filas)
+        ultimo = pks[-1]
+        avance.actualizar(revisadas)
+    avance.actualizar(revisadas, forzar=True)
+    return {"estado": estado, "cambiadas": cambiadas}
+
+
+@tarea("importar", "Importar datos", concurrencia=1, intentos=1)
+def importar_archivo(trabajo, avance):
+    """Importa el archivo subido (parametros["archivo"]); las filas rechazadas quedan en un CSV."""
+    from .importacion import IMPORTADORES, importar
+
+    parametros = trabajo.parametros
+    if parametros.get("tipo") not in IMPORTADORES:
+        raise ErrorPermanente(f"Tipo de importación desconocido: {parametros.get('tipo')}")
+    rechazos = io.StringIO()
+    writer = csv.writer(rechazos)
+    writer.writerow(["linea", "errores", "fila"])
+
+    def on_rechazo(numero, fila, errores):
+        writer.writerow([numero, json.dumps(errores, ensure_ascii=False), json.dumps(fila, ensure_ascii=False)])
+
+    def on_bloque(resultado):
+        avance.actualizar(resultado.leidas)
+
+    try:
+        with almacen_trabajos().open(parametros["archivo"], "rb") as archivo:
+            resultado = importar(
+                parametros["tipo"], archivo, parametros.get("formato", "csv"),
+                on_rechazo=on_rechazo, on_bloque=on_bloque,
+            )
+    finally:
+        _borrar(parametros["archivo"])  # sin reintentos: la entrada ya no hace falta
+    avance.actualizar(resultado.leidas, forzar=True)
+    if resultado.rechazadas:
+        avance.adjuntar(
+            f"rechazos-{parametros['tipo']}.csv", io.BytesIO(rechazos.getvalue().encode("utf-8"))
+        )
+    return {
+        "leidas": resultado.leidas,
+        "creadas": resultado.creadas,
+        "actualizadas": resultado.actualizadas,
+        "rechazadas": resultado.rechazadas,
+        "rechazos": resultado.rechazos[:20],
+    }
+
+
+@tarea("refrescar_rollups", "Refrescar reporte de ventas", concurrencia=1, colgado=timedelta(hours=2))
+def refrescar_rollups(trabajo, avance):
+    """Refresco incremental del rollup de ventas, o reconstrucción con todo/desde/hasta."""
+    from .rollups import reconstruir, refrescar
+
+    parametros = trabajo.parametros
+    try:
+        desde = date.fromisoformat(parametros["desde"]) if parametros.get("desde") else None
+        hasta = date.fromisoformat(parametros["hasta"]) if parametros.get("hasta") else None
+    except ValueError as e:
+        raise ErrorPermanente(str(e))
+    avance.actualizar(mensaje="Recalculando")
+    if parametros.get("todo") or desde or hasta:
+        return reconstruir(desde, hasta)
+    return refrescar()
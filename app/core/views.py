@@ -1,21 +1,38 @@
 # core/views.py
-from collections import OrderedDict
-from datetime import datetime
+import hmac
+from datetime import datetime, timedelta
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.contrib.auth.models import Group, Permission
-from django.db.models import Q, Avg, Count
-from django.shortcuts import redirect
-from django.urls import reverse_lazy
+from django.contrib.auth.models import Group
+from django.db.models import Count
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
 from django.views import View
 from django.views.generic import CreateView, DeleteView, ListView, TemplateView, UpdateView, DetailView
 
-from .mixins import PermissionRedirectMixin
+from .datatables import DataTableMixin
+from .exportacion import RESERVA_COLUMNAS, csv_lines, filas_reservas, jsonl_lines
+from .mixins import CachedListMixin, ConditionalGetMixin, PermissionRedirectMixin
+from .pagination import KeysetPaginationMixin
+from .roles import build_perm_tabs
+from .paquete_destinos import paquete_search_terms, paquetes_de_destino
+from .search import search
 from .models import (
-    Cliente, Destino, Interaccion, MetodoPago, Paquete, Producto, Proveedor, Reserva, Comentario
+    Cliente, Destino, Interaccion, MetodoPago, Paquete, Producto, Proveedor, Reserva, Comentario,
+    Empleado, RollupMarca, Trabajo,
 )
+from .indicadores import snapshot
+from . import trabajos
+from .metricas import registro
+from .reportes import DIMENSIONES, GRANOS, MEDIDAS, ventas
+from .rollups import VENTAS, inicio_dia
 from .forms import (
     ClienteForm, DestinoForm, InteraccionForm, MetodoPagoForm,
     PaqueteForm, ProductoForm, ProveedorForm, ReservaForm,
@@ -36,11 +53,35 @@ class RootRedirectView(View):
 class IndexView(LoginRequiredMixin, TemplateView):
     template_name = "index.html"
 
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        # Contadores precalculados (core/indicadores.py): una lectura en vez de COUNT/SUM.
+        # Reservas e ingresos son globales: como en el listado y el reporte, solo admin
+        ctx["ver_ventas"] = is_admin_user(self.request.user)
+        ctx["kpis"] = snapshot(ventas=ctx["ver_ventas"])
+        return ctx
+
 
 class AccessDeniedView(TemplateView):
     template_name = "errors/403.html"
 
 
+class MetricasView(View):
+    """
+    Métricas por vista en formato de texto de Prometheus (core/metricas.py).
+    Solo staff con sesión, o un scraper con `Authorization: Bearer <METRICS_TOKEN>`.
+    """
+
+    def get(self, request, *args, **kwargs):
+        token = getattr(settings, "METRICS_TOKEN", "")
+        autorizado = request.user.is_staff or (
+            token and hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}")
+        )
+        if not autorizado:
+            return HttpResponseForbidden()
+        return HttpResponse(registro.exportar(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 
 
 
@@ -70,7 +111,7 @@ def user_login(request):
 
 
 
-class ClienteListView(PermissionRedirectMixin,ListView):
+class ClienteListView(PermissionRedirectMixin, ConditionalGetMixin, ListView):
     required_perm = "core.view_cliente"
     model = Cliente
     template_name = "clientes/clientes_list.html"
@@ -81,13 +122,19 @@ class ClienteListView(PermissionRedirectMixin,ListView):
         qs = super().get_queryset()
         q = self.request.GET.get("q")
         if q:
-            qs = qs.filter(
-                Q(nombre__icontains=q) |
-                Q(email__icontains=q) |
-                Q(preferencias__icontains=q)
-            )
+            qs = search(qs, q)
         return qs
 
+
+class ClienteDataView(DataTableMixin, ClienteListView):
+    columns = (
+        ("nombre", "nombre"),
+        ("email", "email"),
+        ("telefono", None),
+        ("preferencias", None),
+    )
+
+
 class ClienteCreateView(PermissionRedirectMixin,CreateView):
     required_perm = "core.add_cliente"
     model = Cliente
@@ -152,12 +199,13 @@ class ClienteDeleteView(PermissionRedirectMixin, DeleteView):
 
 
 
-class PaqueteListView(PermissionRedirectMixin,ListView):
+class PaqueteListView(PermissionRedirectMixin, ConditionalGetMixin, CachedListMixin, ListView):
     required_perm = "core.view_paquete"
     model = Paquete
     template_name = "paquetes/paquete_list.html"
     context_object_name = "paquetes"
     paginate_by = 10
+    depende_de = (Paquete, Producto)
 
     def get_queryset(self):
         qs = (
@@ -166,21 +214,36 @@ class PaqueteListView(PermissionRedirectMixin,ListView):
             .prefetch_related(
                 "productos__proveedor",
                 "productos__destino",
-                "comentarios__autor",
-            )
-            .annotate(
-                comentarios_count=Count("comentarios", distinct=True),
             )
         )
         q = self.request.GET.get("q")
         if q:
-            qs = qs.filter(
-                Q(nombre__icontains=q)
-                | Q(productos__nombre__icontains=q)
-                | Q(productos__destino__nombre__icontains=q)
-            ).distinct()
+            qs = search(qs, q, extra=(paquete_search_terms,))
         return qs
-    
+
+
+class PaqueteDataView(DataTableMixin, PaqueteListView):
+    columns = (
+        ("nombre", "nombre"),
+        (None, None),  # productos
+        ("precio_final", None),
+        ("activo", None),
+    )
+
+    def decorate_rows(self, rows):
+        nombres = {}
+        productos = (
+            Paquete.productos.through.objects
+            .filter(paquete_id__in=[row[0] for row in rows])
+            .order_by("producto__nombre")
+            .values_list("paquete_id", "producto__nombre")
+        )
+        for paquete_id, nombre in productos:
+            nombres.setdefault(paquete_id, []).append(nombre)
+        for row in rows:
+            row[2] = ", ".join(nombres.get(row[0], []))
+
+
 class PaqueteCreateView(PermissionRedirectMixin, CreateView):
     # Implementación similar a ClienteCreateView
     required_perm = "core.add_paquete"
@@ -247,11 +310,12 @@ class PaqueteDeleteView(PermissionRedirectMixin, DeleteView):
         messages.success(request, f"Paquete {nombre} eliminado correctamente.")
         return response
 
-class PaqueteDetailView(PermissionRedirectMixin, DetailView):
+class PaqueteDetailView(PermissionRedirectMixin, ConditionalGetMixin, DetailView):
     required_perm = "core.view_paquete"
     model = Paquete
     template_name = "paquetes/paquete_detail.html"
     context_object_name = "paquete"
+    depende_de = (Paquete, Producto, Proveedor, Destino, Comentario, Empleado)
 
     def get_queryset(self):
         return (
@@ -268,9 +332,12 @@ class PaqueteDetailView(PermissionRedirectMixin, DetailView):
         ctx = super().get_context_data(**kwargs)
         form = kwargs.get("comentario_form") or ComentarioForm()
         ctx["comentario_form"] = form
-        stats = self.object.comentarios.aggregate(avg=Avg("calificacion"))
-        ctx["rating_avg"] = stats["avg"]
-        ctx["rating_count"] = self.object.comentarios.count()
+        ctx["productos"] = self.object.productos.all()
+        ctx["comentarios"] = self.object.comentarios.all()
+        # Agregados mantenidos en Paquete (core/ratings.py), sin consultas extra
+        ctx["rating_avg"] = self.object.rating_avg
+        ctx["rating_count"] = self.object.rating_count
+        ctx["rating_histogram"] = self.object.rating_histogram
         return ctx
 
     def post(self, request, *args, **kwargs):
@@ -292,27 +359,32 @@ class PaqueteDetailView(PermissionRedirectMixin, DetailView):
 
 
 # Productos
-class ProductoListView(PermissionRedirectMixin,ListView):
+class ProductoListView(PermissionRedirectMixin, ConditionalGetMixin, CachedListMixin, ListView):
     required_perm = "core.view_producto"
     model = Producto
     template_name = "paquetes/productos/productos_list.html"
     context_object_name = "productos"
     paginate_by = 10
+    depende_de = (Producto, Proveedor, Destino)
 
     def get_queryset(self):
         qs = super().get_queryset().select_related("proveedor", "destino")
         q = self.request.GET.get("q")
         if q:
-            qs = qs.filter(
-                Q(nombre__icontains=q)
-                | Q(tipo__icontains=q)
-                | Q(proveedor__nombre__icontains=q)
-                | Q(destino__nombre__icontains=q)
-                | Q(destino__pais__icontains=q)
-            )
+            qs = search(qs, q, related=("proveedor", "destino"))
         return qs
 
 
+class ProductoDataView(DataTableMixin, ProductoListView):
+    columns = (
+        ("nombre", "nombre"),
+        ("tipo", ("tipo", "nombre")),
+        ("proveedor__nombre", None),
+        ("destino__nombre", None),
+        ("precio_base", None),
+    )
+
+
 class ProductoCreateView(PermissionRedirectMixin, CreateView):
     required_perm = "core.add_producto"
     model = Producto
@@ -375,7 +447,7 @@ class ProductoDeleteView(PermissionRedirectMixin, DeleteView):
         return response
 
 
-class ProveedorListView(PermissionRedirectMixin, ListView):
+class ProveedorListView(PermissionRedirectMixin, ConditionalGetMixin, CachedListMixin, ListView):
     required_perm = "core.view_proveedor"
     model = Proveedor
     template_name = "proveedores/proveedor_list.html"
@@ -386,14 +458,18 @@ class ProveedorListView(PermissionRedirectMixin, ListView):
         qs = super().get_queryset()
         q = self.request.GET.get("q")
         if q:
-            qs = qs.filter(
-                Q(nombre__icontains=q)
-                | Q(tipo__icontains=q)
-                | Q(contacto__icontains=q)
-            )
+            qs = search(qs, q)
         return qs
 
 
+class ProveedorDataView(DataTableMixin, ProveedorListView):
+    columns = (
+        ("nombre", "nombre"),
+        ("tipo", None),
+        ("contacto", "contacto"),
+    )
+
+
 class ProveedorCreateView(PermissionRedirectMixin, CreateView):
     required_perm = "core.add_proveedor"
     model = Proveedor
@@ -456,7 +532,7 @@ class ProveedorDeleteView(PermissionRedirectMixin, DeleteView):
         return response
 
 
-class DestinoListView(PermissionRedirectMixin, ListView):
+class DestinoListView(PermissionRedirectMixin, ConditionalGetMixin, CachedListMixin, ListView):
     required_perm = "core.view_destino"
     model = Destino
     template_name = "destinos/destino_list.html"
@@ -467,14 +543,18 @@ class DestinoListView(PermissionRedirectMixin, ListView):
         qs = super().get_queryset()
         q = self.request.GET.get("q")
         if q:
-            qs = qs.filter(
-                Q(nombre__icontains=q)
-                | Q(pais__icontains=q)
-                | Q(descripcion__icontains=q)
-            )
+            qs = search(qs, q)
         return qs
 
 
+class DestinoDataView(DataTableMixin, DestinoListView):
+    columns = (
+        ("nombre", ("nombre", "pais")),
+        ("pais", ("pais", "nombre")),
+        ("descripcion", None),
+    )
+
+
 class DestinoCreateView(PermissionRedirectMixin, CreateView):
     required_perm = "core.add_destino"
     model = Destino
@@ -538,13 +618,20 @@ class DestinoDeleteView(PermissionRedirectMixin, DeleteView):
 
 
 # Métodos de pago
-class MetodoPagoListView(PermissionRedirectMixin, ListView):
+class MetodoPagoListView(PermissionRedirectMixin, ConditionalGetMixin, CachedListMixin, ListView):
     required_perm = "core.view_metodopago"
     model = MetodoPago
     template_name = "paquetes/metodoDePago/metodo_list.html"
     context_object_name = "metodos"
 
 
+class MetodoPagoDataView(DataTableMixin, MetodoPagoListView):
+    columns = (
+        ("nombre", "nombre"),
+        ("descripcion", None),
+    )
+
+
 class MetodoPagoCreateView(PermissionRedirectMixin, CreateView):
     required_perm = "core.add_metodopago"
     model = MetodoPago
@@ -607,81 +694,260 @@ class MetodoPagoDeleteView(PermissionRedirectMixin, DeleteView):
         return response
 
 
-class ReservaListView(PermissionRedirectMixin, ListView):
+def _parse_date(val: str):
+    if not val:
+        return None
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(val, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def filter_reservas(qs, params, user):
+    """Filtros del listado de reservas (q, destino, empleado, fechas) con el alcance por rol."""
+    # Control por rol: admin ve todo, colaborador solo lo asignado
+    if not is_admin_user(user):
+        qs = qs.filter(empleado=user)
+
+    q = params.get("q")
+    if q:
+        qs = search(qs, q, related=("cliente", "paquete", "empleado"))
+
+    destino_id = params.get("destino")
+    if destino_id:
+        qs = qs.filter(paquete__in=paquetes_de_destino(destino_id))
+
+    empleado_id = params.get("empleado")
+    if empleado_id and is_admin_user(user):
+        qs = qs.filter(empleado_id=empleado_id)
+
+    fecha_tipo = params.get("fecha_tipo") or "viaje"
+
+    fecha_desde = _parse_date(params.get("fecha_desde"))
+    fecha_hasta = _parse_date(params.get("fecha_hasta"))
+
+    if fecha_desde:
+        if fecha_tipo == "creada":
+            # Rango semiabierto sobre la columna: __date aplicaría una función y no usaría el índice
+            qs = qs.filter(fecha_reserva__gte=inicio_dia(fecha_desde))
+        else:
+            qs = qs.filter(fecha_viaje__gte=fecha_desde)
+
+    if fecha_hasta:
+        if fecha_tipo == "creada":
+            qs = qs.filter(fecha_reserva__lt=inicio_dia(fecha_hasta + timedelta(days=1)))
+        else:
+            qs = qs.filter(fecha_viaje__lte=fecha_hasta)
+
+    return qs
+
+
+class ReservaListView(PermissionRedirectMixin, ConditionalGetMixin, KeysetPaginationMixin, ListView):
     required_perm = "core.view_reserva"
     model = Reserva
     template_name = "reservas/reserva_list.html"
     context_object_name = "reservas"
     paginate_by = 10
+    depende_de = (Reserva, Cliente, Paquete, Empleado, MetodoPago, Destino)
+    keyset_fields = ("-fecha_reserva", "-id")
 
     def get_queryset(self):
         qs = (
             super()
             .get_queryset()
             .select_related("cliente", "paquete", "empleado", "metodo_pago")
-            .prefetch_related("paquete__productos__destino")
         )
 
-        # Control por rol: admin ve todo, colaborador solo lo asignado
-        if not is_admin_user(self.request.user):
-            qs = qs.filter(empleado=self.request.user)
+        return filter_reservas(qs, self.request.GET, self.request.user)
 
-        q = self.request.GET.get("q")
-        if q:
-            qs = qs.filter(
-                Q(cliente__nombre__icontains=q)
-                | Q(paquete__nombre__icontains=q)
-                | Q(empleado__nombre__icontains=q)
-                | Q(estado__icontains=q)
-            )
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["destinos"] = Destino.objects.order_by("pais", "nombre")
+        ctx["can_filter_colaborador"] = is_admin_user(self.request.user)
+        if ctx["can_filter_colaborador"]:
+            User = get_user_model()
+            ctx["colaboradores"] = User.objects.order_by("nombre", "email")
+        return ctx
 
-        destino_id = self.request.GET.get("destino")
-        if destino_id:
-            qs = qs.filter(paquete__productos__destino_id=destino_id)
+        
 
-        empleado_id = self.request.GET.get("empleado")
-        if empleado_id and is_admin_user(self.request.user):
-            qs = qs.filter(empleado_id=empleado_id)
 
-        def _parse_date(val: str):
-            if not val:
-                return None
-            for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
-                try:
-                    return datetime.strptime(val, fmt).date()
-                except ValueError:
-                    continue
-            return None
+class ReservaDataView(DataTableMixin, ReservaListView):
+    columns = (
+        ("cliente__nombre", None),
+        ("paquete__nombre", None),
+        ("paquete__destinos_texto", None),
+        ("empleado__nombre", None),
+        ("metodo_pago__nombre", None),
+        ("precio_venta", None),
+        ("estado", None),
+        ("fecha_viaje", "fecha_viaje"),
+        ("fecha_reserva", "fecha_reserva"),
+    )
+
+
+class ReservaExportView(PermissionRedirectMixin, View):
+    """
+    Descarga en streaming (CSV o JSONL) de las reservas con los filtros del listado.
+    Por POST la arma el trabajador (core/trabajos.py) y responde 202 con la URL de estado.
+    """
+    required_perm = "core.view_reserva"
 
-        fecha_tipo = self.request.GET.get("fecha_tipo") or "viaje"
+    def post(self, request, *args, **kwargs):
+        parametros = {
+            "formato": "jsonl" if request.GET.get("formato") == "jsonl" else "csv",
+            "filtros": {k: v for k, v in request.GET.items() if k != "formato"},
+        }
+        trabajo = trabajos.encolar("exportar_reservas", parametros, request.user)
+        return trabajo_aceptado(trabajo)
 
-        fecha_desde = _parse_date(self.request.GET.get("fecha_desde"))
-        fecha_hasta = _parse_date(self.request.GET.get("fecha_hasta"))
+    def get(self, request, *args, **kwargs):
+        formato = "jsonl" if request.GET.get("formato") == "jsonl" else "csv"
+        qs = filter_reservas(Reserva.objects.all(), request.GET, request.user)
+        encabezados = [nombre for nombre, _ruta in RESERVA_COLUMNAS]
+        if formato == "jsonl":
+            stream, content_type = jsonl_lines(encabezados, filas_reservas(qs)), "application/x-ndjson"
+        else:
+            stream, content_type = csv_lines(encabezados, filas_reservas(qs)), "text/csv"
+        response = StreamingHttpResponse(stream, content_type=f"{content_type}; charset=utf-8")
+        response["Content-Disposition"] = (
+            f'attachment; filename="reservas-{timezone.localdate():%Y%m%d}.{formato}"'
+        )
+        return response
 
-        if fecha_desde:
-            if fecha_tipo == "creada":
-                qs = qs.filter(fecha_reserva__date__gte=fecha_desde)
-            else:
-                qs = qs.filter(fecha_viaje__gte=fecha_desde)
 
-        if fecha_hasta:
-            if fecha_tipo == "creada":
-                qs = qs.filter(fecha_reserva__date__lte=fecha_hasta)
-            else:
-                qs = qs.filter(fecha_viaje__lte=fecha_hasta)
+class ReservaCambiarEstadoView(PermissionRedirectMixin, View):
+    """Cambia el estado (POST `estado`) de las reservas con los filtros del listado, en el trabajador."""
+    required_perm = "core.change_reserva"
 
-        return qs.distinct()
+    def post(self, request, *args, **kwargs):
+        estado = request.POST.get("estado")
+        if estado not in dict(Reserva.ESTADO_CHOICES):
+            return JsonResponse({"error": "Estado no válido."}, status=400)
+        parametros = {"estado": estado, "filtros": dict(request.GET.items())}
+        trabajo = trabajos.encolar("cambiar_estado_reservas", parametros, request.user)
+        return trabajo_aceptado(trabajo)
+
+
+class ReporteVentasView(PermissionRedirectMixin, TemplateView):
+    """Pivote de ventas sobre el rollup VentaDiaria (se refresca con `refrescar_rollups`)."""
+    required_perm = "core.view_reserva"
+    template_name = "reportes/ventas.html"
+    read_from_replica = True
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        ctx["destinos"] = Destino.objects.order_by("pais", "nombre")
-        ctx["can_filter_colaborador"] = is_admin_user(self.request.user)
+        params = self.request.GET
+        user = self.request.user
+
+        filas = params.get("filas") if params.get("filas") in DIMENSIONES else "periodo"
+        columnas = params.get("columnas") if params.get("columnas") in DIMENSIONES else ""
+        if columnas == filas:
+            columnas = ""
+        medida = params.get("medida") if params.get("medida") in MEDIDAS else "ingresos"
+        grano = params.get("grano") if params.get("grano") in GRANOS else "mes"
+        estado = params.get("estado") if params.get("estado") in dict(Reserva.ESTADO_CHOICES) else ""
+
+        # Mismo alcance que el listado: el colaborador solo ve sus ventas
+        empleado_id = params.get("empleado", "")
+        empleado = user if not is_admin_user(user) else (empleado_id if empleado_id.isdigit() else None)
+
+        ctx.update({
+            "dimensiones": DIMENSIONES,
+            "medidas": MEDIDAS,
+            "granos": GRANOS,
+            "estados": Reserva.ESTADO_CHOICES,
+            "filas": filas,
+            "filas_nombre": DIMENSIONES[filas],
+            "columnas": columnas,
+            "medida": medida,
+            "grano": grano,
+            "estado": estado,
+            "reporte": ventas(
+                filas=filas,
+                columnas=columnas or None,
+                medida=medida,
+                grano=grano,
+                desde=_parse_date(params.get("fecha_desde")),
+                hasta=_parse_date(params.get("fecha_hasta")),
+                empleado=empleado,
+                estado=estado or None,
+            ),
+            "marca": RollupMarca.objects.filter(nombre=VENTAS).first(),
+            "can_filter_colaborador": is_admin_user(user),
+        })
         if ctx["can_filter_colaborador"]:
-            User = get_user_model()
-            ctx["colaboradores"] = User.objects.order_by("nombre", "email")
+            ctx["colaboradores"] = get_user_model().objects.order_by("nombre", "email")
         return ctx
 
-        
+
+class ReporteVentasRefrescarView(PermissionRedirectMixin, View):
+    """Encola el refresco del rollup de ventas (solo admin); varios clics comparten trabajo."""
+    required_perm = "core.view_reserva"
+
+    def post(self, request, *args, **kwargs):
+        if not is_admin_user(request.user):
+            return HttpResponseForbidden()
+        trabajo = trabajos.encolar("refrescar_rollups", usuario=request.user, unico=True)
+        return trabajo_aceptado(trabajo)
+
+
+def trabajo_aceptado(trabajo):
+    return JsonResponse(
+        {"id": trabajo.pk, "estado_url": reverse("trabajos:trabajo_estado", args=[trabajo.pk])}, status=202
+    )
+
+
+def trabajo_visible(request, pk):
+    """El trabajo si es del usuario (o es superusuario); 404 en otro caso, sin revelar que existe."""
+    trabajo = get_object_or_404(Trabajo, pk=pk)
+    if trabajo.creado_por_id != request.user.pk and not request.user.is_superuser:
+        raise Http404
+    return trabajo
+
+
+class TrabajoEstadoView(PermissionRedirectMixin, View):
+    """Estado y progreso de un trabajo en JSON, para sondear desde la UI."""
+
+    def get(self, request, pk, *args, **kwargs):
+        trabajo = trabajo_visible(request, pk)
+        tipo = trabajos.TIPOS.get(trabajo.tipo)
+        response = JsonResponse({
+            "id": trabajo.pk,
+            "tipo": trabajo.tipo,
+            "etiqueta": tipo.etiqueta if tipo else trabajo.tipo,
+            "estado": trabajo.estado,
+            "terminado": trabajo.terminado,
+            "hechos": trabajo.hechos,
+            "total": trabajo.total,
+            "porcentaje": trabajo.porcentaje,
+            "mensaje": trabajo.mensaje,
+            "resultado": trabajo.resultado,
+            # El traceback queda para el admin; al usuario solo la última línea
+            "error": trabajo.error.strip().splitlines()[-1] if trabajo.error else "",
+            "descarga_url": (
+                reverse("trabajos:trabajo_descarga", args=[trabajo.pk])
+                if trabajo.estado == Trabajo.COMPLETADO and trabajo.archivo else None
+            ),
+        })
+        response["Cache-Control"] = "no-store"
+        return response
+
+
+class TrabajoDescargaView(PermissionRedirectMixin, View):
+    """Archivo resultado de un trabajo (exportación, rechazos de una importación...)."""
+
+    def get(self, request, pk, *args, **kwargs):
+        trabajo = trabajo_visible(request, pk)
+        if trabajo.estado != Trabajo.COMPLETADO or not trabajo.archivo:
+            raise Http404
+        try:
+            archivo = trabajo.archivo.open("rb")
+        except FileNotFoundError:
+            raise Http404
+        return FileResponse(archivo, as_attachment=True, filename=trabajo.archivo.name.rsplit("/", 1)[-1])
 
 
 class ReservaCreateView(PermissionRedirectMixin, CreateView):
@@ -749,26 +1015,33 @@ class ReservaDeleteView(PermissionRedirectMixin, DeleteView):
         return response
 
 
-class InteraccionListView(PermissionRedirectMixin, ListView):
+class InteraccionListView(PermissionRedirectMixin, ConditionalGetMixin, KeysetPaginationMixin, ListView):
     required_perm = "core.view_interaccion"
     model = Interaccion
     template_name = "interacciones/interaccion_list.html"
     context_object_name = "interacciones"
     paginate_by = 10
+    depende_de = (Interaccion, Cliente, Empleado)
+    keyset_fields = ("-fecha", "-id")
 
     def get_queryset(self):
         qs = super().get_queryset().select_related("cliente", "empleado")
         q = self.request.GET.get("q")
         if q:
-            qs = qs.filter(
-                Q(cliente__nombre__icontains=q)
-                | Q(empleado__nombre__icontains=q)
-                | Q(tipo__icontains=q)
-                | Q(notas__icontains=q)
-            )
+            qs = search(qs, q, related=("cliente", "empleado"))
         return qs
 
 
+class InteraccionDataView(DataTableMixin, InteraccionListView):
+    columns = (
+        ("cliente__nombre", None),
+        ("empleado__nombre", None),
+        ("tipo", None),
+        ("fecha", "fecha"),
+        ("notas", None),
+    )
+
+
 class InteraccionCreateView(PermissionRedirectMixin, CreateView):
     required_perm = "core.add_interaccion"
     model = Interaccion
@@ -833,39 +1106,6 @@ class InteraccionDeleteView(PermissionRedirectMixin, DeleteView):
 
 User = get_user_model()
 
-# Permisos organizados por módulo para la UI de roles
-PERM_TABS = OrderedDict([
-    ("clientes", ("Clientes", {"app": "core", "models": ["cliente"]})),
-    ("paquetes", ("Paquetes", {"app": "core", "models": ["paquete"]})),
-    ("productos", ("Productos", {"app": "core", "models": ["producto"]})),
-    ("proveedores", ("Proveedores", {"app": "core", "models": ["proveedor"]})),
-    ("destinos", ("Destinos", {"app": "core", "models": ["destino"]})),
-    ("reservas", ("Reservas", {"app": "core", "models": ["reserva"]})),
-    ("interacciones", ("Interacciones", {"app": "core", "models": ["interaccion"]})),
-    ("metodopago", ("Métodos de pago", {"app": "core", "models": ["metodopago"]})),
-    ("colaboradores", ("Colaboradores", {"app": "core", "models": ["empleado"]})),
-    ("roles", ("Roles", {"app": "auth", "models": ["group"]})),
-    ("comentarios", ("Comentarios", {"app": "core", "models": ["comentario"]})),
-
-])
-
-
-def build_perm_tabs():
-    tabs = OrderedDict()
-    for key, (label, spec) in PERM_TABS.items():
-        perms = (
-            Permission.objects
-            .select_related("content_type")
-            .filter(
-                content_type__app_label=spec["app"],
-                content_type__model__in=spec["models"],
-            )
-            .order_by("content_type__model", "codename")
-        )
-        tabs[key] = {"label": label, "perms": perms}
-    return tabs
-
-
 # ===== ROLES (Group + Permission) =====
 
 class RolListView(PermissionRedirectMixin, ListView):
@@ -10,6 +10,73 @@
     }
   }
 
+  function escapeAttr(value) {
+    return $("<div>").text(value).html().replace(/"/g, "&quot;");
+  }
+
+  function rowUrl(template, id) {
+    return template.replace("/0/", "/" + encodeURIComponent(id) + "/");
+  }
+
+  // Modo servidor: las filas vienen de data-source como [pk, celda1, celda2, ...]
+  function serverSideOptions($table) {
+    const editUrl = $table.data("edit-url");
+    const deleteUrl = $table.data("delete-url");
+    const hasActions = Boolean(editUrl || deleteUrl);
+    const nColumns = $table.find("thead th").length;
+    const params = new URLSearchParams(window.location.search);
+    let acciones = {};
+
+    const columns = [];
+    for (let i = 1; i <= (hasActions ? nColumns - 1 : nColumns); i++) {
+      columns.push({ data: i, render: $.fn.dataTable.render.text() });
+    }
+    if (hasActions) {
+      columns.push({
+        data: 0,
+        orderable: false,
+        searchable: false,
+        className: "text-nowrap",
+        render: function (id) {
+          let html = "";
+          if (editUrl && acciones.editar) {
+            html += '<a href="' + escapeAttr(rowUrl(editUrl, id)) + '" class="btn btn-sm btn-info mr-1" title="Editar"><i class="fas fa-edit"></i></a>';
+          }
+          if (deleteUrl && acciones.eliminar) {
+            html += '<a href="' + escapeAttr(rowUrl(deleteUrl, id)) + '" class="btn btn-sm btn-danger" title="Eliminar"><i class="fas fa-trash"></i></a>';
+          }
+          return html;
+        },
+      });
+    }
+
+    return {
+      serverSide: true,
+      processing: true,
+      searchDelay: 400,
+      search: { search: params.get("q") || "" },
+      columns,
+      ajax: {
+        url: $table.data("source"),
+        data: function (d) {
+          // Los filtros del formulario de la página (fechas, destino...) viajan
+          // con cada petición; la caja de búsqueda sustituye a ?q=
+          params.forEach(function (value, key) {
+            if (key !== "page" && key !== "cursor" && key !== "q") d[key] = value;
+          });
+          d.q = d.search.value;
+          // Sin contador "draw" la URL se repite y el navegador puede revalidar
+          // la respuesta guardada (ETag): si no cambió nada, el servidor da 304
+          delete d.draw;
+        },
+        dataSrc: function (json) {
+          acciones = json.acciones || {};
+          return json.data;
+        },
+      },
+    };
+  }
+
   function initDataTables() {
     if (!$.fn.DataTable) return;
 
@@ -21,14 +88,21 @@
       const pageLength = parseInt($table.data("page-length"), 10) || 10;
       const order = parseOrderAttr($table.data("order"));
 
-      $table.DataTable({
+      let options = {
         language: { url: DATATABLE_LANG, emptyTable: emptyText },
         pageLength,
         lengthChange: false,
         autoWidth: false,
         responsive: true,
         order,
-      });
+      };
+      if ($table.data("source")) {
+        options = $.extend(options, serverSideOptions($table));
+        // La paginación renderizada por Django queda como respaldo sin JS
+        $table.closest(".card-body").find("[data-datatable-fallback]").hide();
+      }
+
+      $table.DataTable(options);
 
       $table.data("dt-init", true);
     });
@@ -53,10 +127,71 @@
     });
   }
 
+  function getCookie(name) {
+    const match = document.cookie.match(new RegExp("(?:^|; )" + name + "=([^;]*)"));
+    return match ? decodeURIComponent(match[1]) : "";
+  }
+
+  function trabajoTexto(t) {
+    if (t.estado === "pendiente") return "En cola" + (t.mensaje ? " (" + t.mensaje + ")" : "") + "…";
+    let texto = t.mensaje || "Procesando";
+    if (t.total) texto += ": " + t.hechos + " de " + t.total;
+    else if (t.hechos) texto += ": " + t.hechos;
+    return texto + (t.porcentaje !== null ? " (" + t.porcentaje + "%)" : "");
+  }
+
+  // Trabajos en segundo plano (core/trabajos.py): <a|button data-trabajo href|data-url>
+  // hace POST, sondea el estado y al terminar descarga el archivo (o recarga con
+  // data-trabajo="recargar")
+  function sondearTrabajo(estadoUrl, recargar) {
+    $.ajax({ url: estadoUrl, cache: false })
+      .done(function (t) {
+        if (!t.terminado) {
+          Swal.update({ text: trabajoTexto(t) });
+          setTimeout(function () { sondearTrabajo(estadoUrl, recargar); }, 1000);
+          return;
+        }
+        if (t.estado === "fallido") {
+          Swal.fire({ icon: "error", title: t.etiqueta, text: t.error || "El trabajo falló." });
+          return;
+        }
+        if (t.descarga_url) window.location.href = t.descarga_url;
+        Swal.fire({ icon: "success", title: t.etiqueta, text: "Listo.", timer: 1500, showConfirmButton: false })
+          .then(function () { if (recargar) window.location.reload(); });
+      })
+      .fail(function () { setTimeout(function () { sondearTrabajo(estadoUrl, recargar); }, 3000); });
+  }
+
+  function initTrabajos() {
+    $(document).on("click", "[data-trabajo]", function (e) {
+      if (typeof Swal === "undefined") return; // sin JS completo: el enlace sigue funcionando
+      e.preventDefault();
+      const $el = $(this);
+      $.ajax({
+        url: $el.data("url") || $el.attr("href"),
+        method: "POST",
+        headers: { "X-CSRFToken": getCookie("csrftoken") },
+      })
+        .done(function (r) {
+          Swal.fire({
+            title: $el.data("titulo") || "Procesando",
+            text: "En cola…",
+            allowOutsideClick: false,
+            didOpen: function () { Swal.showLoading(); },
+          });
+          sondearTrabajo(r.estado_url, $el.data("trabajo") === "recargar");
+        })
+        .fail(function () {
+          Swal.fire({ icon: "error", title: "No se pudo iniciar", text: "Intenta de nuevo." });
+        });
+    });
+  }
+
   $(function () {
     initDataTables();
     initTooltips();
     persistSidebarState();
+    initTrabajos();
   });
 
   // Expose for manual re-init after dynamic DOM updates